@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Banco SQLite do catálogo: o registro central da biblioteca.
+
+Cada escaneamento grava o seu Catalogo (catalogo.py) aqui, e os scripts
+podem depois trabalhar só com consultas ao banco, sem reler o
+compartilhamento de rede (opção --do-catalogo dos três scripts).
+
+Tabelas:
+    pastas:   id, tipo ('filmes'/'series'), nome, caminho, geracao
+    arquivos: id, pasta_id, nome, nome_normalizado (minúsculas e sem a
+              subpasta, usado nos duplicados por nome), tamanho, mtime_ns, hash_completo,
+              ordem (posição no escaneamento), geracao
+
+Índices em arquivos(nome_normalizado), arquivos(tamanho) e
+arquivos(hash_completo) deixam as consultas de duplicados na casa dos
+milissegundos mesmo com centenas de milhares de arquivos.
+
+A gravação é incremental: pastas e arquivos são atualizados por UPSERT e o
+que não apareceu no escaneamento (geração antiga) é removido no fim. O hash
+de um arquivo só é descartado se o tamanho ou o mtime mudarem. Escaneamentos
+sem tamanho (os dos listadores, que usam o cache de nomes) não apagam os
+tamanhos e hashes já conhecidos.
+
+As leituras usam cursores com fetchmany em lotes de TAMANHO_LOTE linhas.
+"""
+
+import os
+import sqlite3
+
+from catalogo import Catalogo, DESCONHECIDO
+
+ARQUIVO_CATALOGO = '.catalogo.sqlite3'
+
+# Linhas lidas por fetchmany nas consultas
+TAMANHO_LOTE = 1000
+
+TIPOS = ('filmes', 'series')
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS pastas (
+    id INTEGER PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    nome TEXT NOT NULL,
+    caminho TEXT NOT NULL,
+    geracao INTEGER NOT NULL,
+    UNIQUE (tipo, nome)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_pastas_caminho ON pastas (caminho);
+
+CREATE TABLE IF NOT EXISTS arquivos (
+    id INTEGER PRIMARY KEY,
+    pasta_id INTEGER NOT NULL REFERENCES pastas (id) ON DELETE CASCADE,
+    nome TEXT NOT NULL,
+    nome_normalizado TEXT NOT NULL,
+    tamanho INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash_completo TEXT,
+    ordem INTEGER NOT NULL,
+    geracao INTEGER NOT NULL,
+    UNIQUE (pasta_id, nome)
+);
+CREATE INDEX IF NOT EXISTS idx_arquivos_nome ON arquivos (nome_normalizado);
+CREATE INDEX IF NOT EXISTS idx_arquivos_tamanho ON arquivos (tamanho);
+CREATE INDEX IF NOT EXISTS idx_arquivos_hash ON arquivos (hash_completo);
+
+CREATE TABLE IF NOT EXISTS escaneamentos (
+    tipo TEXT PRIMARY KEY,
+    raiz TEXT NOT NULL,
+    geracao INTEGER NOT NULL
+);
+"""
+
+
+def _lotes(cursor, tamanho_lote=TAMANHO_LOTE):
+    """Percorre as linhas de um cursor buscando-as em lotes com fetchmany."""
+    while True:
+        linhas = cursor.fetchmany(tamanho_lote)
+        if not linhas:
+            return
+        yield from linhas
+
+
+def _normalizar(nome):
+    """Nome usado nos duplicados por nome: minúsculas e sem a subpasta (`Temporada 1/S01E01.mkv`)."""
+    return nome.rpartition(os.sep)[2].lower()
+
+
+class PastasDoBanco:
+    """
+    Pastas de um tipo lidas do banco, usáveis pelos exportadores dos
+    listadores como o dict {nome_pasta: [arquivos]}: len() faz um COUNT e
+    items() percorre as pastas em ordem de nome com leituras em lotes.
+    """
+
+    def __init__(self, banco, tipo):
+        self.banco = banco
+        self.tipo = tipo
+
+    def __len__(self):
+        return self.banco.conexao.execute(
+            "SELECT COUNT(*) FROM pastas p WHERE p.tipo = ? "
+            "AND EXISTS (SELECT 1 FROM arquivos a WHERE a.pasta_id = p.id)",
+            (self.tipo,)
+        ).fetchone()[0]
+
+    def items(self):
+        cursor = self.banco.conexao.execute(
+            "SELECT p.nome, a.nome FROM pastas p JOIN arquivos a ON a.pasta_id = p.id "
+            "WHERE p.tipo = ? ORDER BY p.nome, a.nome",
+            (self.tipo,)
+        )
+        nome_atual, arquivos = None, []
+        for nome_pasta, nome_arquivo in _lotes(cursor):
+            if nome_pasta != nome_atual:
+                if arquivos:
+                    yield nome_atual, arquivos
+                nome_atual, arquivos = nome_pasta, []
+            arquivos.append(nome_arquivo)
+        if arquivos:
+            yield nome_atual, arquivos
+
+
+class BancoCatalogo:
+    """Banco SQLite do catálogo (ver o docstring do módulo)."""
+
+    def __init__(self, arquivo_banco=ARQUIVO_CATALOGO):
+        self.arquivo_banco = arquivo_banco
+        self.conexao = sqlite3.connect(arquivo_banco)
+        self.conexao.execute("PRAGMA foreign_keys = ON")
+        self.conexao.execute("PRAGMA journal_mode = WAL")
+        self.conexao.execute("PRAGMA synchronous = NORMAL")
+        self.conexao.executescript(_ESQUEMA)
+        self.conexao.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+    def fechar(self):
+        if self.conexao is not None:
+            self.conexao.commit()
+            self.conexao.close()
+            self.conexao = None
+
+    # Gravação
+
+    def gravar_catalogo(self, tipo, catalogo):
+        """
+        Grava o resultado de um escaneamento, substituindo o anterior do mesmo tipo.
+
+        Args:
+            tipo: 'filmes' ou 'series'
+            catalogo: Catalogo com as pastas e arquivos escaneados
+        """
+        conexao = self.conexao
+        with conexao:
+            linha = conexao.execute("SELECT geracao FROM escaneamentos WHERE tipo = ?", (tipo,)).fetchone()
+            geracao = (linha[0] if linha else 0) + 1
+            conexao.execute(
+                "INSERT INTO escaneamentos (tipo, raiz, geracao) VALUES (?, ?, ?) "
+                "ON CONFLICT (tipo) DO UPDATE SET raiz = excluded.raiz, geracao = excluded.geracao",
+                (tipo, catalogo.raiz, geracao)
+            )
+
+            ids_pastas = []
+            for pasta in catalogo.pastas:
+                conexao.execute(
+                    "INSERT INTO pastas (tipo, nome, caminho, geracao) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (tipo, nome) DO UPDATE SET caminho = excluded.caminho, geracao = excluded.geracao",
+                    (tipo, pasta.nome, pasta.caminho, geracao)
+                )
+                ids_pastas.append(conexao.execute(
+                    "SELECT id FROM pastas WHERE tipo = ? AND nome = ?", (tipo, pasta.nome)
+                ).fetchone()[0])
+
+            nomes, tamanhos, mtimes = catalogo.nomes, catalogo.tamanhos, catalogo.mtimes
+            indices_pasta = catalogo.indices_pasta
+            conexao.executemany(
+                "INSERT INTO arquivos "
+                "(pasta_id, nome, nome_normalizado, tamanho, mtime_ns, ordem, geracao) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (pasta_id, nome) DO UPDATE SET "
+                "  hash_completo = CASE WHEN excluded.tamanho = ? "
+                "      OR (excluded.tamanho = arquivos.tamanho AND excluded.mtime_ns = arquivos.mtime_ns) "
+                "    THEN arquivos.hash_completo END, "
+                "  tamanho = CASE WHEN excluded.tamanho = ? THEN arquivos.tamanho ELSE excluded.tamanho END, "
+                "  mtime_ns = CASE WHEN excluded.tamanho = ? THEN arquivos.mtime_ns ELSE excluded.mtime_ns END, "
+                "  ordem = excluded.ordem, geracao = excluded.geracao",
+                (
+                    (ids_pastas[indices_pasta[i]], nomes[i], _normalizar(nomes[i]), tamanhos[i], mtimes[i], i, geracao,
+                     DESCONHECIDO, DESCONHECIDO, DESCONHECIDO)
+                    for i in range(len(nomes))
+                )
+            )
+
+            # O que não apareceu neste escaneamento não existe mais
+            conexao.execute(
+                "DELETE FROM arquivos WHERE geracao < ? AND pasta_id IN (SELECT id FROM pastas WHERE tipo = ?)",
+                (geracao, tipo)
+            )
+            conexao.execute("DELETE FROM pastas WHERE tipo = ? AND geracao < ?", (tipo, geracao))
+
+    def atualizar_pastas(self, tipo, alteracoes):
+        """
+        Atualiza só algumas pastas de um tipo já gravado, sem passar pelas
+        demais (modo --observar dos listadores).
+
+        Os arquivos das pastas alteradas vão para o fim da ordem do
+        escaneamento; tamanhos e hashes já conhecidos dos arquivos que
+        continuam na pasta são mantidos.
+
+        Args:
+            tipo: 'filmes' ou 'series'
+            alteracoes: dict {nome_pasta: [arquivos]}, com None para as
+                        pastas removidas
+        """
+        conexao = self.conexao
+        with conexao:
+            linha = conexao.execute(
+                "SELECT e.raiz, e.geracao, (SELECT MAX(a.ordem) FROM arquivos a "
+                "JOIN pastas p ON p.id = a.pasta_id WHERE p.tipo = e.tipo) "
+                "FROM escaneamentos e WHERE e.tipo = ?",
+                (tipo,)
+            ).fetchone()
+            if linha is None:
+                return
+            raiz, geracao, ordem = linha[0], linha[1], (linha[2] if linha[2] is not None else -1) + 1
+
+            for nome, arquivos in alteracoes.items():
+                if arquivos is None:
+                    conexao.execute("DELETE FROM pastas WHERE tipo = ? AND nome = ?", (tipo, nome))
+                    continue
+                conexao.execute(
+                    "INSERT INTO pastas (tipo, nome, caminho, geracao) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (tipo, nome) DO UPDATE SET caminho = excluded.caminho",
+                    (tipo, nome, os.path.join(raiz, nome), geracao)
+                )
+                pasta_id = conexao.execute(
+                    "SELECT id FROM pastas WHERE tipo = ? AND nome = ?", (tipo, nome)
+                ).fetchone()[0]
+                existentes = {nome_arquivo for nome_arquivo, in conexao.execute(
+                    "SELECT nome FROM arquivos WHERE pasta_id = ?", (pasta_id,)
+                )}
+                conexao.executemany(
+                    "DELETE FROM arquivos WHERE pasta_id = ? AND nome = ?",
+                    ((pasta_id, nome_arquivo) for nome_arquivo in existentes.difference(arquivos))
+                )
+                conexao.executemany(
+                    "INSERT INTO arquivos "
+                    "(pasta_id, nome, nome_normalizado, tamanho, mtime_ns, ordem, geracao) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (pasta_id, nome) DO UPDATE SET ordem = excluded.ordem",
+                    (
+                        (pasta_id, arquivo, _normalizar(arquivo), DESCONHECIDO, DESCONHECIDO, ordem + i, geracao)
+                        for i, arquivo in enumerate(arquivos)
+                    )
+                )
+                ordem += len(arquivos)
+
+    def _localizar_arquivo(self, caminho, ids_pastas):
+        """
+        (pasta_id, nome) de um caminho completo: a pasta de título é a mais
+        próxima acima dele que está no banco, e o nome é relativo a ela
+        (`Temporada 1/S01E01.mkv` no escaneamento com subpastas). None se o
+        caminho não pertence a nenhuma pasta gravada.
+        """
+        pasta = os.path.dirname(caminho)
+        while pasta not in ids_pastas:
+            acima = os.path.dirname(pasta)
+            if acima == pasta:
+                return None
+            pasta = acima
+        return ids_pastas[pasta], caminho[len(pasta):].lstrip(os.sep)
+
+    def gravar_hashes(self, duplicados_por_conteudo):
+        """Guarda o hash completo dos arquivos confirmados como duplicados por conteúdo."""
+        ids_pastas = dict(self.conexao.execute("SELECT caminho, id FROM pastas"))
+        linhas = []
+        for hash_hex, caminhos in duplicados_por_conteudo.items():
+            for caminho, _, _ in caminhos:
+                arquivo = self._localizar_arquivo(caminho, ids_pastas)
+                if arquivo is not None:
+                    linhas.append((hash_hex,) + arquivo)
+        with self.conexao:
+            self.conexao.executemany(
+                "UPDATE arquivos SET hash_completo = ? WHERE pasta_id = ? AND nome = ?", linhas
+            )
+
+    # Leitura
+
+    def tipos_escaneados(self):
+        return {tipo: raiz for tipo, raiz in self.conexao.execute("SELECT tipo, raiz FROM escaneamentos")}
+
+    def pastas(self, tipo):
+        """Pastas de um tipo, no formato aceito pelos exportadores dos listadores."""
+        return PastasDoBanco(self, tipo)
+
+    def carregar_catalogo(self, tipo):
+        """
+        Reconstrói o Catalogo de um tipo a partir do banco, na ordem do escaneamento.
+
+        Returns:
+            Catalogo (vazio se o tipo nunca foi escaneado)
+        """
+        raiz = self.tipos_escaneados().get(tipo, '')
+        catalogo = Catalogo(raiz)
+        cursor = self.conexao.execute(
+            "SELECT p.nome, a.nome, a.tamanho, a.mtime_ns FROM arquivos a JOIN pastas p ON p.id = a.pasta_id "
+            "WHERE p.tipo = ? ORDER BY a.ordem",
+            (tipo,)
+        )
+        pasta_atual, nomes, tamanhos, mtimes = None, [], [], []
+        for nome_pasta, nome, tamanho, mtime_ns in _lotes(cursor):
+            if nome_pasta != pasta_atual:
+                if nomes:
+                    catalogo.adicionar_pasta(pasta_atual, nomes, tamanhos, mtimes)
+                pasta_atual, nomes, tamanhos, mtimes = nome_pasta, [], [], []
+            nomes.append(nome)
+            tamanhos.append(tamanho)
+            mtimes.append(mtime_ns)
+        if nomes:
+            catalogo.adicionar_pasta(pasta_atual, nomes, tamanhos, mtimes)
+        return catalogo
+
+    def _agrupar(self, cursor):
+        """Agrupa linhas (chave, caminho, pasta, tamanho) ordenadas pela chave."""
+        grupos = {}
+        for chave, caminho, pasta, tamanho in _lotes(cursor):
+            grupos.setdefault(chave, []).append((caminho, pasta, tamanho))
+        return grupos
+
+    def duplicados_por_nome(self):
+        """
+        Arquivos com o mesmo nome (sem diferenciar maiúsculas), pelo índice de nome.
+
+        Returns:
+            dict {nome_arquivo: [(caminho, pasta, tamanho)]}, no mesmo formato de
+            find_duplicados.encontrar_duplicados_por_nome
+        """
+        cursor = self.conexao.execute(
+            "SELECT a.nome_normalizado, p.caminho || ? || a.nome, p.nome, a.tamanho "
+            "FROM arquivos a JOIN pastas p ON p.id = a.pasta_id "
+            "WHERE a.nome_normalizado IN ("
+            "  SELECT nome_normalizado FROM arquivos GROUP BY nome_normalizado HAVING COUNT(*) > 1"
+            ") ORDER BY a.nome_normalizado, p.tipo, a.ordem",
+            (os.sep,)
+        )
+        return self._agrupar(cursor)
+
+    def duplicados_por_conteudo(self):
+        """
+        Arquivos com o mesmo hash completo já gravado (gravar_hashes).
+
+        Returns:
+            dict {hash: [(caminho, pasta, tamanho)]}
+        """
+        cursor = self.conexao.execute(
+            "SELECT a.hash_completo, p.caminho || ? || a.nome, p.nome, a.tamanho "
+            "FROM arquivos a JOIN pastas p ON p.id = a.pasta_id "
+            "WHERE a.hash_completo IN ("
+            "  SELECT hash_completo FROM arquivos WHERE hash_completo IS NOT NULL "
+            "  GROUP BY hash_completo HAVING COUNT(*) > 1"
+            ") ORDER BY a.hash_completo, p.tipo, a.ordem",
+            (os.sep,)
+        )
+        return self._agrupar(cursor)
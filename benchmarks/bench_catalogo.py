@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de memória do catálogo (catalogo.py) contra as estruturas antigas.
+
+Monta, para o mesmo conjunto sintético de arquivos (1M por padrão, em pastas
+de 4 arquivos), cada uma das representações e mede com tracemalloc a
+memória que fica alocada:
+
+- tuplas de find_duplicados: [(caminho_completo, nome, pasta, tamanho)]
+- dict dos listadores: {nome_pasta: [nomes]}
+- Catalogo (nomes + colunas array de pasta, tamanho e mtime)
+
+Os nomes são gerados de novo para cada estrutura, como aconteceria num
+escaneamento real, para que nenhuma string seja compartilhada entre elas.
+
+Uso:
+    python benchmarks/bench_catalogo.py [--arquivos 1000000] [--por-pasta 4]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalogo import Catalogo  # noqa: E402
+
+RAIZ = os.path.join('Y:', 'Mídia', 'Filmes')
+
+
+def gerar_pastas(total_arquivos, por_pasta):
+    """Gera (nome_pasta, [(nome_arquivo, tamanho, mtime_ns)]) com nomes realistas."""
+    for p in range(0, total_arquivos, por_pasta):
+        nome_pasta = f"Titulo Do Filme Numero {p} ({1950 + p % 70})"
+        arquivos = [
+            (f"Titulo.Do.Filme.Numero.{p}.{1950 + p % 70}.1080p.BluRay.x264-GRUPO.parte{k}.mkv",
+             1_500_000_000 + p * 7 + k, 1_600_000_000_000_000_000 + p)
+            for k in range(min(por_pasta, total_arquivos - p))
+        ]
+        yield nome_pasta, arquivos
+
+
+def construir_tuplas(total_arquivos, por_pasta):
+    arquivos = []
+    for nome_pasta, itens in gerar_pastas(total_arquivos, por_pasta):
+        caminho_pasta = os.path.join(RAIZ, nome_pasta)
+        for nome, tamanho, _ in itens:
+            arquivos.append((os.path.join(caminho_pasta, nome), nome, nome_pasta, tamanho))
+    return arquivos
+
+
+def construir_dict(total_arquivos, por_pasta):
+    return {nome_pasta: [nome for nome, _, _ in itens] for nome_pasta, itens in gerar_pastas(total_arquivos, por_pasta)}
+
+
+def construir_catalogo(total_arquivos, por_pasta):
+    catalogo = Catalogo(RAIZ)
+    for nome_pasta, itens in gerar_pastas(total_arquivos, por_pasta):
+        catalogo.adicionar_pasta(
+            nome_pasta,
+            [nome for nome, _, _ in itens],
+            [tamanho for _, tamanho, _ in itens],
+            [mtime for _, _, mtime in itens],
+        )
+    return catalogo
+
+
+def medir(construtor, total_arquivos, por_pasta):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    estrutura = construtor(total_arquivos, por_pasta)
+    tempo = time.perf_counter() - inicio
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del estrutura
+    return memoria, tempo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memória do catálogo")
+    parser.add_argument('--arquivos', type=int, default=1_000_000, help="Total de arquivos sintéticos")
+    parser.add_argument('--por-pasta', type=int, default=4, help="Arquivos por pasta")
+    args = parser.parse_args()
+
+    print(f"Catálogo sintético: {args.arquivos} arquivos, {args.por_pasta} por pasta\n")
+    print(f"{'Estrutura':<36}{'Memória (MB)':>14}{'Bytes/arquivo':>15}{'Tempo (s)':>11}")
+    for rotulo, construtor in (
+        ("find_duplicados: tuplas com caminho", construir_tuplas),
+        ("listadores: dict pasta -> nomes", construir_dict),
+        ("Catalogo (nomes + colunas array)", construir_catalogo),
+    ):
+        memoria, tempo = medir(construtor, args.arquivos, args.por_pasta)
+        print(f"{rotulo:<36}{memoria / 1024 / 1024:>14.1f}{memoria / args.arquivos:>15.0f}{tempo:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
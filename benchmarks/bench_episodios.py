@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do parser de episódios e do índice de temporadas (episodios.py)
+sobre os nomes de um lista_series.txt real (por padrão o da raiz do
+repositório, ~2.500 episódios).
+
+Mede:
+
+- analisar_episodio com as expressões pré-compiladas do módulo;
+- a mesma função usando re.search/re.sub com o texto das expressões a cada
+  chamada (o cache interno do módulo re evita recompilar, mas a busca no
+  cache e a checagem dos argumentos são pagas por chamada);
+- a montagem do IndiceTemporadas de cada série com faltando() e repetidos();
+
+e mostra quantos nomes foram reconhecidos em cada formato.
+
+Uso:
+    python benchmarks/bench_episodios.py [--lista lista_series.txt] [--repeticoes 50]
+"""
+
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+from collections import Counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import episodios  # noqa: E402
+from episodios import analisar_episodio, IndiceTemporadas  # noqa: E402
+
+RAIZ_REPOSITORIO = Path(__file__).resolve().parent.parent
+_RE_CABECALHO_SERIE = re.compile(r'^\d+\. (.*) \(\d+ episódio\(s\)\)$')
+
+
+def ler_lista(arquivo):
+    """Lê um lista_series.txt: [(nome_serie, [episodios])]."""
+    series = []
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        for linha in f:
+            linha = linha.rstrip('\n')
+            cabecalho = _RE_CABECALHO_SERIE.match(linha)
+            if cabecalho:
+                series.append((cabecalho.group(1), []))
+            elif linha.startswith('   • ') and series:
+                series[-1][1].append(linha[5:])
+    return series
+
+
+class _SemCompilar:
+    """Expressão usada como texto a cada chamada (re.search/re.sub), no lugar da compilada."""
+
+    def __init__(self, padrao):
+        self.pattern = padrao.pattern
+        self.flags = padrao.flags
+
+    def search(self, texto):
+        return re.search(self.pattern, texto, self.flags)
+
+    def sub(self, substituto, texto):
+        return re.sub(self.pattern, substituto, texto, flags=self.flags)
+
+    def findall(self, texto):
+        return re.findall(self.pattern, texto, self.flags)
+
+
+def medir(funcao, repeticoes):
+    """Melhor tempo de `repeticoes` execuções."""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do parser de episódios")
+    parser.add_argument('--lista', default=str(RAIZ_REPOSITORIO / 'lista_series.txt'),
+                        help="lista_series.txt com os nomes dos episódios")
+    parser.add_argument('--repeticoes', type=int, default=50, help="Execuções de cada medição (vale a melhor)")
+    args = parser.parse_args()
+
+    series = ler_lista(args.lista)
+    nomes = [nome for _, episodios_serie in series for nome in episodios_serie]
+    print(f"Lista: {args.lista} ({len(series)} séries, {len(nomes)} episódios)\n")
+
+    def analisar_todos():
+        for nome in nomes:
+            analisar_episodio(nome)
+
+    def indexar_todas():
+        for _, episodios_serie in series:
+            indice = IndiceTemporadas(episodios_serie)
+            indice.faltando()
+            indice.repetidos()
+
+    compiladas = {nome: valor for nome, valor in vars(episodios).items() if isinstance(valor, re.Pattern)}
+    tempo_compilado = medir(analisar_todos, args.repeticoes)
+    try:
+        for nome, padrao in compiladas.items():
+            setattr(episodios, nome, _SemCompilar(padrao))
+        tempo_texto = medir(analisar_todos, args.repeticoes)
+    finally:
+        for nome, padrao in compiladas.items():
+            setattr(episodios, nome, padrao)
+    tempo_indice = medir(indexar_todas, args.repeticoes)
+
+    print(f"{'Etapa':<44}{'Tempo (ms)':>12}{'µs/nome':>10}")
+    for rotulo, tempo in (
+        ("analisar_episodio (pré-compiladas)", tempo_compilado),
+        ("analisar_episodio (re.search com texto)", tempo_texto),
+        ("IndiceTemporadas + faltando + repetidos", tempo_indice),
+    ):
+        print(f"{rotulo:<44}{tempo * 1000:>12.2f}{tempo / len(nomes) * 1e6:>10.2f}")
+    print(f"\nPré-compiladas: {tempo_texto / tempo_compilado:.2f}x mais rápido")
+
+    formatos = Counter()
+    faltando = repetidos = 0
+    for _, episodios_serie in series:
+        for nome in episodios_serie:
+            episodio = analisar_episodio(nome)
+            if episodio is None:
+                formatos['não reconhecido'] += 1
+            else:
+                formatos['com temporada' if episodio.temporada is not None else 'sem temporada'] += 1
+                if len(episodio.episodios) > 1:
+                    formatos['vários episódios no arquivo'] += 1
+        indice = IndiceTemporadas(episodios_serie)
+        faltando += len(indice.faltando())
+        repetidos += len(indice.repetidos())
+
+    print("\nReconhecimento:")
+    for rotulo in ('com temporada', 'sem temporada', 'vários episódios no arquivo', 'não reconhecido'):
+        print(f"  {rotulo:<30}{formatos[rotulo]:>7}{formatos[rotulo] / len(nomes) * 100:>7.1f}%")
+    print(f"  {'episódios faltando':<30}{faltando:>7}")
+    print(f"  {'episódios repetidos':<30}{repetidos:>7}")
+
+
+if __name__ == "__main__":
+    main()
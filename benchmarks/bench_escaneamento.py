@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do motor de escaneamento (escaneamento.py) contra o escaneamento
+antigo baseado em Path.iterdir() + is_dir()/is_file()/stat().
+
+Gera uma árvore sintética local (por padrão 100 mil arquivos) e conta as
+operações de sistema de arquivos feitas por cada abordagem: listagens de
+diretório e stats. Em um compartilhamento SMB cada uma delas é uma ida e volta
+pela rede, então o número por arquivo é o que importa.
+
+Uso:
+    python benchmarks/bench_escaneamento.py [--arquivos 100000] [--por-pasta 4]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from escaneamento import listar_pastas, escanear_pasta  # noqa: E402
+from extensoes import is_arquivo_video  # noqa: E402
+
+
+def gerar_arvore(destino, total_arquivos, por_pasta):
+    """Cria pastas de título com arquivos vazios (vídeos e alguns não-vídeos)."""
+    extensoes = ['.mkv', '.mp4', '.avi', '.srt']
+    total_pastas = max(1, total_arquivos // por_pasta)
+    criados = 0
+    for i in range(total_pastas):
+        pasta = os.path.join(destino, f"Titulo {i:06d} ({1950 + i % 75})")
+        os.mkdir(pasta)
+        for j in range(por_pasta):
+            if criados >= total_arquivos:
+                break
+            ext = extensoes[(i + j) % len(extensoes)]
+            open(os.path.join(pasta, f"Titulo.{i:06d}.Parte{j}{ext}"), 'wb').close()
+            criados += 1
+    return criados
+
+
+def escanear_legado(diretorio_base):
+    """Reprodução do escaneamento antigo de find_duplicados.escanear_arquivos."""
+    encontrados = []
+    diretorio = Path(diretorio_base)
+    pastas = [item for item in diretorio.iterdir() if item.is_dir()]
+    for item in diretorio.iterdir():
+        if item.is_dir():
+            for arquivo in item.iterdir():
+                if arquivo.is_file() and is_arquivo_video(arquivo.name):
+                    encontrados.append((str(arquivo), arquivo.name, item.name, arquivo.stat().st_size))
+    return encontrados, len(pastas)
+
+
+def escanear_novo(diretorio_base):
+    """Escaneamento pelo motor compartilhado (mesmo resultado do legado)."""
+    encontrados = []
+    for item in listar_pastas(diretorio_base):
+        arquivos, _ = escanear_pasta(item, filtro=is_arquivo_video, com_tamanho=True)
+        for caminho, nome, tamanho, _ in arquivos:
+            encontrados.append((caminho, nome, item.name, tamanho))
+    return encontrados
+
+
+class _EntradaContada:
+    """Envolve um os.DirEntry contando os stats que chegam ao sistema (um por entrada)."""
+
+    __slots__ = ('_entrada', '_contador', '_stat_feito')
+
+    def __init__(self, entrada, contador):
+        self._entrada = entrada
+        self._contador = contador
+        self._stat_feito = False
+
+    def __getattr__(self, nome):
+        return getattr(self._entrada, nome)
+
+    def __fspath__(self):
+        return self._entrada.path
+
+    def stat(self, **kwargs):
+        # No Windows o stat já vem da listagem; no POSIX o primeiro acesso faz
+        # um lstat/stat e os seguintes usam o cache do DirEntry.
+        if not self._stat_feito and os.name != 'nt':
+            self._contador['stat'] += 1
+        self._stat_feito = True
+        return self._entrada.stat(**kwargs)
+
+    def is_dir(self, **kwargs):
+        return self._entrada.is_dir(**kwargs)
+
+    def is_file(self, **kwargs):
+        return self._entrada.is_file(**kwargs)
+
+
+class _IteradorContado:
+    def __init__(self, iterador, contador):
+        self._iterador = iterador
+        self._contador = contador
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self._iterador.close()
+
+    def __iter__(self):
+        for entrada in self._iterador:
+            yield _EntradaContada(entrada, self._contador)
+
+
+def medir(funcao, diretorio):
+    """Executa a função contando listagens de diretório e stats."""
+    contador = {'listagem': 0, 'stat': 0}
+    originais = (os.stat, os.lstat, os.listdir, os.scandir)
+
+    def stat_contado(*args, **kwargs):
+        contador['stat'] += 1
+        return originais[0](*args, **kwargs)
+
+    def lstat_contado(*args, **kwargs):
+        contador['stat'] += 1
+        return originais[1](*args, **kwargs)
+
+    def listdir_contado(*args, **kwargs):
+        contador['listagem'] += 1
+        return originais[2](*args, **kwargs)
+
+    def scandir_contado(*args, **kwargs):
+        contador['listagem'] += 1
+        return _IteradorContado(originais[3](*args, **kwargs), contador)
+
+    os.stat, os.lstat, os.listdir, os.scandir = stat_contado, lstat_contado, listdir_contado, scandir_contado
+    try:
+        inicio = time.perf_counter()
+        resultado = funcao(diretorio)
+        tempo = time.perf_counter() - inicio
+    finally:
+        os.stat, os.lstat, os.listdir, os.scandir = originais
+    return resultado, contador, tempo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do escaneamento com os.scandir")
+    parser.add_argument('--arquivos', type=int, default=100000, help="Total de arquivos na árvore sintética")
+    parser.add_argument('--por-pasta', type=int, default=4, help="Arquivos por pasta de título")
+    args = parser.parse_args()
+
+    destino = tempfile.mkdtemp(prefix='bench_escaneamento_')
+    try:
+        print(f"Gerando árvore sintética em {destino}...")
+        total = gerar_arvore(destino, args.arquivos, args.por_pasta)
+        print(f"  {total} arquivo(s) criado(s)\n")
+
+        (legado, _), cont_legado, t_legado = medir(escanear_legado, destino)
+        novo, cont_novo, t_novo = medir(escanear_novo, destino)
+
+        if sorted(legado) != sorted(novo):
+            print("[ERRO] Os resultados das duas abordagens diferem!")
+            sys.exit(1)
+
+        print(f"{'Abordagem':<12}{'Listagens':>12}{'Stats':>12}{'Ops/arquivo':>14}{'Tempo (s)':>12}")
+        for nome, cont, tempo in (('legado', cont_legado, t_legado), ('scandir', cont_novo, t_novo)):
+            ops = cont['listagem'] + cont['stat']
+            print(f"{nome:<12}{cont['listagem']:>12}{cont['stat']:>12}{ops / total:>14.2f}{tempo:>12.2f}")
+    finally:
+        shutil.rmtree(destino, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
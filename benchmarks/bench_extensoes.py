@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark da classificação por extensão (extensoes.py) contra a função
+antiga dos três scripts (`Path(arquivo).suffix.lower() in FORMATOS_VIDEO`).
+
+Gera uma amostra de nomes (1M por padrão) parecida com a de uma biblioteca
+real: vídeos com vários pontos no nome e extensão em maiúsculas ou minúsculas,
+`.dvr-ms`, legendas (inclusive `Filme.pt-BR.srt`), `.nfo`, capas e alguns
+nomes sem extensão, e mede:
+
+- a função antiga, com um Path por nome;
+- extensoes.is_arquivo_video (rfind + casefold + conjunto);
+- extensoes.classificar (a mesma busca num dict de classes);
+- extensoes.separar_por_classe sobre a amostra inteira.
+
+Antes de medir confere que as duas versões aceitam exatamente os mesmos vídeos.
+
+Uso:
+    python benchmarks/bench_extensoes.py [--nomes 1000000] [--repeticoes 5]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from collections import Counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from extensoes import FORMATOS_VIDEO, is_arquivo_video, classificar, separar_por_classe  # noqa: E402
+
+# Sufixos da amostra e o peso de cada um (os vídeos são a maioria)
+SUFIXOS = [
+    ('.mkv', 30), ('.MKV', 4), ('.mp4', 20), ('.avi', 10), ('.Avi', 2), ('.m2ts', 2), ('.dvr-ms', 1),
+    ('.srt', 12), ('.pt-BR.srt', 4), ('.ass', 2), ('.idx', 1), ('.sub', 1),
+    ('.nfo', 6), ('.jpg', 4), ('.txt', 2), ('', 1),
+]
+
+
+def is_arquivo_video_path(arquivo):
+    """A função antiga de list_filmes.py, list_series.py e find_duplicados.py."""
+    return Path(arquivo).suffix.lower() in FORMATOS_VIDEO
+
+
+def gerar_nomes(quantidade, semente=42):
+    """Nomes de arquivo com a distribuição de SUFIXOS."""
+    aleatorio = random.Random(semente)
+    sufixos = aleatorio.choices([s for s, _ in SUFIXOS], weights=[p for _, p in SUFIXOS], k=quantidade)
+    return [
+        f"Titulo.Do.Filme.{i}.{1950 + i % 75}.1080p.BluRay.x264-GRUPO{sufixo}"
+        for i, sufixo in enumerate(sufixos)
+    ]
+
+
+def medir(funcao, repeticoes):
+    """Melhor tempo de `repeticoes` execuções."""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark da classificação por extensão")
+    parser.add_argument('--nomes', type=int, default=1_000_000, help="Tamanho da amostra (padrão: 1000000)")
+    parser.add_argument('--repeticoes', type=int, default=5, help="Execuções de cada medição (vale a melhor)")
+    args = parser.parse_args()
+
+    nomes = gerar_nomes(args.nomes)
+    print(f"Amostra: {len(nomes)} nomes\n")
+
+    divergentes = [nome for nome in nomes if is_arquivo_video(nome) != is_arquivo_video_path(nome)]
+    if divergentes:
+        print(f"[ERRO] {len(divergentes)} nome(s) classificados de forma diferente, ex.: {divergentes[:3]}")
+        return 1
+
+    medicoes = [
+        ("Path(nome).suffix.lower() in FORMATOS_VIDEO", lambda: [n for n in nomes if is_arquivo_video_path(n)]),
+        ("extensoes.is_arquivo_video", lambda: [n for n in nomes if is_arquivo_video(n)]),
+        ("extensoes.classificar", lambda: [classificar(n) for n in nomes]),
+        ("extensoes.separar_por_classe", lambda: separar_por_classe(nomes)),
+    ]
+    tempos = [(rotulo, medir(funcao, args.repeticoes)) for rotulo, funcao in medicoes]
+
+    print(f"{'Função':<48}{'Tempo (ms)':>12}{'ns/nome':>10}")
+    for rotulo, tempo in tempos:
+        print(f"{rotulo:<48}{tempo * 1000:>12.1f}{tempo / len(nomes) * 1e9:>10.0f}")
+    print(f"\nis_arquivo_video: {tempos[0][1] / tempos[1][1]:.1f}x mais rápido que a versão com Path")
+
+    classes = Counter(classificar(nome) or 'outros' for nome in nomes)
+    print("\nClasses: " + ", ".join(f"{classe} {quantidade}" for classe, quantidade in classes.most_common()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de vazão do hash de conteúdo (hash_arquivos.py).
+
+Gera arquivos de teste locais e mede MB/s para cada algoritmo disponível,
+tamanho de buffer e modo de leitura (readinto com buffer reaproveitado ou
+mmap). No final mede também o ganho de calcular vários arquivos em threads,
+o que só funciona porque a leitura e o update() do hash liberam o GIL.
+
+Os arquivos são lidos uma vez antes das medições, então os números refletem
+o custo de CPU com os dados no cache de páginas do sistema (o limite superior
+do que o disco ou a rede conseguem entregar).
+
+Uso:
+    python benchmarks/bench_hash.py [--tamanho-mb 256] [--arquivos 4]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hash_arquivos import ALGORITMOS, hash_completo  # noqa: E402
+
+TAMANHOS_BUFFER = [64 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024]
+
+
+def gerar_arquivo(caminho, tamanho_mb):
+    """Cria um arquivo com conteúdo pseudoaleatório (sem compressão possível)."""
+    bloco = os.urandom(1024 * 1024)
+    with open(caminho, 'wb') as f:
+        for i in range(tamanho_mb):
+            # Varia o bloco para que o conteúdo não seja periódico
+            f.write(bloco[i % 251:] + bloco[:i % 251])
+
+
+def medir_mb_s(funcao, tamanho_bytes):
+    inicio = time.perf_counter()
+    funcao()
+    tempo = time.perf_counter() - inicio
+    return (tamanho_bytes / (1024 * 1024)) / tempo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de vazão do hash de arquivos")
+    parser.add_argument('--tamanho-mb', type=int, default=256, help="Tamanho de cada arquivo de teste em MB")
+    parser.add_argument('--arquivos', type=int, default=4, help="Arquivos usados no teste com threads")
+    parser.add_argument('--algoritmos', nargs='*', default=sorted(ALGORITMOS),
+                        help="Algoritmos a medir (padrão: todos os disponíveis)")
+    args = parser.parse_args()
+
+    destino = tempfile.mkdtemp(prefix='bench_hash_')
+    try:
+        print(f"Gerando {args.arquivos} arquivo(s) de {args.tamanho_mb} MB em {destino}...")
+        caminhos = []
+        for i in range(args.arquivos):
+            caminho = os.path.join(destino, f"teste_{i}.mkv")
+            gerar_arquivo(caminho, args.tamanho_mb)
+            caminhos.append(caminho)
+        tamanho = os.path.getsize(caminhos[0])
+
+        # Aquecer o cache de páginas
+        for caminho in caminhos:
+            hash_completo(caminho, 'md5')
+
+        print(f"\n{'Algoritmo':<12}{'Buffer':>10}{'readinto (MB/s)':>18}{'mmap (MB/s)':>14}")
+        for algoritmo in args.algoritmos:
+            for tamanho_buffer in TAMANHOS_BUFFER:
+                leitura = medir_mb_s(
+                    lambda: hash_completo(caminhos[0], algoritmo, tamanho_buffer), tamanho)
+                mapa = medir_mb_s(
+                    lambda: hash_completo(caminhos[0], algoritmo, tamanho_buffer, usar_mmap=True), tamanho)
+                print(f"{algoritmo:<12}{tamanho_buffer // 1024:>8}KB{leitura:>18.1f}{mapa:>14.1f}")
+
+        print(f"\nHash de {args.arquivos} arquivo(s) em paralelo (md5, buffer de 4 MB):")
+        total = tamanho * len(caminhos)
+        for workers in (1, 2, args.arquivos):
+            def executar():
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    list(executor.map(hash_completo, caminhos))
+            print(f"  {workers} thread(s): {medir_mb_s(executar, total):.1f} MB/s")
+    finally:
+        shutil.rmtree(destino, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
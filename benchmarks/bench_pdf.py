@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark dos dois motores de PDF da lista de filmes (list_filmes.exportar_pdf).
+
+Gera uma lista sintética com nomes no formato da biblioteca real e mede o
+tempo de exportação com o motor 'platypus' (um Paragraph por linha) e com o
+motor 'canvas' (pdf_rapido.py, linhas desenhadas direto no canvas), além do
+número de páginas de cada um como verificação de equivalência do layout.
+
+Uso:
+    python benchmarks/bench_pdf.py [--pastas 1160] [--arquivos-por-pasta 4] [--colunas 1]
+"""
+
+import io
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from list_filmes import exportar_pdf  # noqa: E402
+
+PALAVRAS = ['the', 'night', 'dark', 'corpse', 'city', 'love', 'dead', 'return', 'house',
+            'sangue', 'noite', 'cidade', 'amor', 'Ângelo', 'verão', 'último']
+
+
+def gerar_lista(pastas, arquivos_por_pasta, semente=42):
+    """Dict {nome_pasta: [arquivos]} com nomes parecidos com os da biblioteca."""
+    aleatorio = random.Random(semente)
+    filmes = {}
+    for i in range(pastas):
+        titulo = ' '.join(aleatorio.choice(PALAVRAS).title() for _ in range(aleatorio.randint(1, 5)))
+        ano = aleatorio.randint(1920, 2024)
+        nome = f"{titulo} ({ano}) {i}"
+        release = titulo.replace(' ', '.')
+        filmes[nome] = [
+            f"{release}.{ano}.1080p.BluRay.x264-GRUPO.parte{k}.mkv"
+            for k in range(aleatorio.randint(1, 2 * arquivos_por_pasta - 1))
+        ]
+    return dict(sorted(filmes.items()))
+
+
+def contar_paginas(caminho):
+    with open(caminho, 'rb') as f:
+        return f.read().count(b'/Type /Page\n')
+
+
+def medir(filmes, motor, colunas, destino):
+    arquivo = os.path.join(destino, f"lista_{motor}.pdf")
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        exportar_pdf(filmes, arquivo, motor=motor, colunas=colunas)
+    return time.perf_counter() - inicio, contar_paginas(arquivo), os.path.getsize(arquivo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos motores de PDF")
+    parser.add_argument('--pastas', type=int, default=1160, help="Quantidade de pastas (filmes)")
+    parser.add_argument('--arquivos-por-pasta', type=int, default=4, help="Média de arquivos por pasta")
+    parser.add_argument('--colunas', type=int, default=1, help="Colunas por página no motor canvas")
+    args = parser.parse_args()
+
+    filmes = gerar_lista(args.pastas, args.arquivos_por_pasta)
+    total_arquivos = sum(len(arquivos) for arquivos in filmes.values())
+    print(f"Lista sintética: {len(filmes)} pastas, {total_arquivos} arquivos")
+
+    with tempfile.TemporaryDirectory(prefix='bench_pdf_') as destino:
+        print(f"\n{'Motor':<12}{'Tempo (s)':>12}{'Páginas':>10}{'Tamanho (KB)':>15}")
+        resultados = {}
+        for motor in ('platypus', 'canvas'):
+            tempo, paginas, tamanho = medir(filmes, motor, args.colunas if motor == 'canvas' else 1, destino)
+            resultados[motor] = tempo
+            print(f"{motor:<12}{tempo:>12.2f}{paginas:>10}{tamanho // 1024:>15}")
+        print(f"\nGanho do motor canvas: {resultados['platypus'] / resultados['canvas']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
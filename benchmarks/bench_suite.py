@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Suíte de benchmarks dos scripts sobre bibliotecas sintéticas
+(benchmarks/biblioteca_sintetica.py), sem precisar do compartilhamento `Y:\\Mídia`.
+
+Para cada escala (número de filmes; as séries são 10% desse número) gera uma
+biblioteca com arquivos esparsos e duplicados injetados e mede, com a saída
+dos scripts silenciada:
+
+- escaneamento dos listadores (escanear_filmes/escanear_series) sem cache,
+  com o cache de escaneamento vazio e com o cache já preenchido;
+- escanear_arquivos de find_duplicados.py para filmes e séries;
+- encontrar_duplicados_por_nome e encontrar_duplicados_por_titulo;
+- gravação do catálogo SQLite;
+- cada exportador: TXT, JSON (manifesto e partes), índice de busca e PDF das
+  duas listas, e TXT, CSV e PDF dos duplicados.
+
+Cada etapa vale o melhor de --repeticoes execuções, sempre gravando numa pasta
+vazia (para que a gravação só-se-mudou não pule a escrita). Etapas que dependem
+de um pacote opcional ausente (reportlab) ficam como null.
+
+Os resultados vão para um JSON com a versão do código (commit), o Python e a
+plataforma, para comparar versões:
+
+    python benchmarks/bench_suite.py --escalas 1000 10000
+    python benchmarks/bench_suite.py --escalas 1000 10000 --comparar benchmarks/resultados/anterior.json
+
+Uso:
+    python benchmarks/bench_suite.py [--escalas 1000 10000 100000] [--repeticoes 3] [--saida ARQUIVO.json]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+import contextlib
+from pathlib import Path
+from datetime import datetime
+
+RAIZ_REPOSITORIO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ_REPOSITORIO))
+
+import list_filmes  # noqa: E402
+import list_series  # noqa: E402
+import find_duplicados  # noqa: E402
+from banco_catalogo import BancoCatalogo  # noqa: E402
+from indice_busca import exportar_indice_busca  # noqa: E402
+from biblioteca_sintetica import gerar_biblioteca  # noqa: E402
+
+VERSAO_SUITE = 1
+ESCALAS_PADRAO = [1000, 10000, 100000]
+DIRETORIO_RESULTADOS = RAIZ_REPOSITORIO / 'benchmarks' / 'resultados'
+
+
+def versao_codigo():
+    """Commit atual do repositório (None fora de um checkout git) e se há alterações não commitadas."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ_REPOSITORIO,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        alterado = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                       cwd=RAIZ_REPOSITORIO, capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return commit, alterado
+
+
+def medir(funcao, repeticoes, trabalho):
+    """
+    Melhor tempo de `repeticoes` execuções de funcao(pasta), cada uma com uma
+    pasta vazia nova dentro de `trabalho`, com a saída dos scripts descartada.
+
+    Returns:
+        (segundos, resultado da última execução), ou (None, None) se faltar
+        um pacote opcional
+    """
+    melhor = float('inf')
+    resultado = None
+    with open(os.devnull, 'w', encoding='utf-8') as nulo:
+        for _ in range(repeticoes):
+            pasta = tempfile.mkdtemp(dir=trabalho)
+            try:
+                with contextlib.redirect_stdout(nulo):
+                    inicio = time.perf_counter()
+                    resultado = funcao(pasta)
+                    melhor = min(melhor, time.perf_counter() - inicio)
+            except ImportError:
+                return None, None
+            finally:
+                shutil.rmtree(pasta, ignore_errors=True)
+    return melhor, resultado
+
+
+def executar_escala(titulos, args, trabalho):
+    """Gera a biblioteca de uma escala e mede todas as etapas."""
+    biblioteca = os.path.join(trabalho, 'biblioteca')
+    inicio = time.perf_counter()
+    resumo = gerar_biblioteca(biblioteca, titulos, args.semente, args.duplicados, not args.sem_esparsos)
+    geracao = time.perf_counter() - inicio
+    filmes, series = resumo.pop('filmes'), resumo.pop('series')
+    print(f"  Biblioteca: {resumo['pastas']} pasta(s), {resumo['arquivos']} arquivo(s), "
+          f"{resumo['videos']} vídeo(s) ({geracao:.1f}s para gerar)")
+
+    tempos = {}
+
+    def etapa(nome, funcao):
+        tempo, resultado = medir(funcao, args.repeticoes, trabalho)
+        tempos[nome] = tempo
+        print(f"    {nome:<42}" + (f"{tempo:>10.3f}s" if tempo is not None else "  indisponível"))
+        return resultado
+
+    # Escaneamento dos listadores: sem cache, com o cache vazio e com o cache preenchido
+    cache_filmes = os.path.join(trabalho, 'cache_filmes.json')
+    cache_series = os.path.join(trabalho, 'cache_series.json')
+    catalogo_filmes = etapa('escanear_filmes', lambda _: list_filmes.escanear_filmes(filmes, None))
+    etapa('escanear_filmes (cache vazio)',
+          lambda pasta: list_filmes.escanear_filmes(filmes, os.path.join(pasta, 'cache.json')))
+    medir(lambda _: list_filmes.escanear_filmes(filmes, cache_filmes), 1, trabalho)
+    etapa('escanear_filmes (cache preenchido)', lambda _: list_filmes.escanear_filmes(filmes, cache_filmes))
+    catalogo_series = etapa('escanear_series', lambda _: list_series.escanear_series(series, None))
+    etapa('escanear_series (cache vazio)',
+          lambda pasta: list_series.escanear_series(series, os.path.join(pasta, 'cache.json')))
+    medir(lambda _: list_series.escanear_series(series, cache_series), 1, trabalho)
+    etapa('escanear_series (cache preenchido)', lambda _: list_series.escanear_series(series, cache_series))
+
+    # Duplicados
+    arquivos_filmes = etapa('escanear_arquivos (filmes)',
+                            lambda _: find_duplicados.escanear_arquivos(filmes, 'filmes', workers=args.workers))
+    arquivos_series = etapa('escanear_arquivos (series)',
+                            lambda _: find_duplicados.escanear_arquivos(series, 'series', workers=args.workers))
+    por_nome = etapa('encontrar_duplicados_por_nome',
+                     lambda _: find_duplicados.encontrar_duplicados_por_nome(arquivos_filmes, arquivos_series))
+    por_titulo = etapa('encontrar_duplicados_por_titulo',
+                       lambda _: find_duplicados.encontrar_duplicados_por_titulo(arquivos_filmes))
+
+    def gravar_catalogo(pasta):
+        banco = BancoCatalogo(os.path.join(pasta, 'catalogo.sqlite3'))
+        try:
+            banco.gravar_catalogo('filmes', arquivos_filmes)
+            banco.gravar_catalogo('series', arquivos_series)
+        finally:
+            banco.fechar()
+    etapa('gravar_catalogo', gravar_catalogo)
+
+    # Exportadores
+    for modulo, tipo, catalogo in ((list_filmes, 'filmes', catalogo_filmes), (list_series, 'series', catalogo_series)):
+        etapa(f"exportar_txt ({tipo})", lambda pasta: modulo.exportar_txt(catalogo, os.path.join(pasta, 'lista.txt')))
+        etapa(f"exportar_json ({tipo})",
+              lambda pasta: modulo.exportar_json(catalogo, os.path.join(pasta, 'lista.json')))
+        etapa(f"exportar_indice_busca ({tipo})",
+              lambda pasta: exportar_indice_busca(catalogo.items(), os.path.join(pasta, 'busca.json')))
+        etapa(f"exportar_pdf ({tipo})", lambda pasta: modulo.exportar_pdf(catalogo, os.path.join(pasta, 'lista.pdf')))
+
+    etapa('exportar_txt (duplicados)', lambda pasta: find_duplicados.exportar_txt(
+        por_nome, os.path.join(pasta, 'duplicados.txt'), duplicados_por_titulo=por_titulo))
+    etapa('exportar_csv (duplicados)', lambda pasta: find_duplicados.exportar_csv(
+        por_nome, os.path.join(pasta, 'duplicados.csv'), duplicados_por_titulo=por_titulo))
+    etapa('exportar_pdf (duplicados)', lambda pasta: find_duplicados.exportar_pdf(
+        por_nome, os.path.join(pasta, 'duplicados.pdf'), duplicados_por_titulo=por_titulo))
+
+    # Os duplicados injetados por nome têm de aparecer (os nomes sorteados também podem se repetir sozinhos)
+    encontrados = len(por_nome)
+    if encontrados < resumo['duplicados_nome']:
+        print(f"  [ERRO] {encontrados} grupo(s) por nome encontrados, {resumo['duplicados_nome']} injetados")
+
+    return {
+        'biblioteca': dict(resumo, titulos=titulos, geracao=geracao),
+        'grupos_encontrados': {'por_nome': encontrados, 'por_titulo': len(por_titulo)},
+        'tempos': tempos,
+    }
+
+
+def comparar(anterior, atual):
+    """Imprime a variação de cada etapa em relação a um resultado anterior."""
+    print(f"\nComparação com {anterior.get('commit') or '?'} ({anterior.get('data', '?')}):")
+    if anterior.get('parametros') != atual['parametros']:
+        print(f"  [AVISO] Parâmetros diferentes: {anterior.get('parametros')} -> {atual['parametros']}")
+    for escala, dados in atual['escalas'].items():
+        dados_anteriores = anterior.get('escalas', {}).get(escala)
+        if dados_anteriores is None:
+            print(f"  {escala} títulos: sem resultado anterior")
+            continue
+        print(f"\n  {escala} títulos")
+        print(f"    {'Etapa':<42}{'Antes (s)':>11}{'Agora (s)':>11}{'Variação':>10}")
+        for nome, tempo in dados['tempos'].items():
+            tempo_anterior = dados_anteriores['tempos'].get(nome)
+            if tempo is None or tempo_anterior is None:
+                continue
+            variacao = (tempo / tempo_anterior - 1) * 100 if tempo_anterior else 0.0
+            print(f"    {nome:<42}{tempo_anterior:>11.3f}{tempo:>11.3f}{variacao:>+9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks sobre bibliotecas sintéticas")
+    parser.add_argument('--escalas', type=int, nargs='+', default=ESCALAS_PADRAO,
+                        help="Números de filmes de cada biblioteca (padrão: 1000 10000 100000)")
+    parser.add_argument('--repeticoes', type=int, default=3, help="Execuções de cada etapa (vale a melhor; padrão: 3)")
+    parser.add_argument('--semente', type=int, default=42, help="Semente do gerador (padrão: 42)")
+    parser.add_argument('--duplicados', type=float, default=0.02,
+                        help="Duplicados injetados, como fração dos vídeos de filmes (padrão: 0.02)")
+    parser.add_argument('--workers', type=int, default=1, help="Threads do escanear_arquivos (padrão: 1)")
+    parser.add_argument('--sem-esparsos', action='store_true',
+                        help="Arquivos de poucos KB em vez de esparsos com tamanho realista (NTFS)")
+    parser.add_argument('--trabalho', default=None,
+                        help="Pasta onde as bibliotecas são geradas, criada se não existir "
+                             "(padrão: pasta temporária do sistema)")
+    parser.add_argument('--saida', default=None,
+                        help=f"JSON com os resultados (padrão: {DIRETORIO_RESULTADOS.name}/suite_<data>_<commit>.json)")
+    parser.add_argument('--comparar', default=None, help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args()
+    if args.trabalho:
+        os.makedirs(args.trabalho, exist_ok=True)
+
+    commit, alterado = versao_codigo()
+    resultado = {
+        'versao_suite': VERSAO_SUITE,
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'alteracoes_nao_commitadas': alterado,
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'parametros': {'repeticoes': args.repeticoes, 'semente': args.semente, 'duplicados': args.duplicados,
+                       'workers': args.workers, 'esparsos': not args.sem_esparsos},
+        'escalas': {},
+    }
+
+    for titulos in args.escalas:
+        print(f"\nEscala: {titulos} títulos")
+        trabalho = tempfile.mkdtemp(prefix=f'bench_suite_{titulos}_', dir=args.trabalho)
+        try:
+            resultado['escalas'][str(titulos)] = executar_escala(titulos, args, trabalho)
+        finally:
+            shutil.rmtree(trabalho, ignore_errors=True)
+
+    saida = args.saida
+    if saida is None:
+        DIRETORIO_RESULTADOS.mkdir(exist_ok=True)
+        saida = DIRETORIO_RESULTADOS / f"suite_{datetime.now():%Y%m%d_%H%M%S}_{commit or 'sem-git'}.json"
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    print(f"\nResultados gravados em {saida}")
+
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            comparar(json.load(f), resultado)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gerador de bibliotecas sintéticas para os benchmarks, reprodutível pela
+semente: a mesma semente e o mesmo número de títulos geram sempre os mesmos
+nomes e tamanhos.
+
+A árvore imita a do compartilhamento `Y:\\Mídia`:
+
+    destino/Filmes/Titulo Do Filme (1987)/Titulo.Do.Filme.1987.1080p.BluRay.x264-GRUPO.mkv
+                                          Titulo.Do.Filme.1987.1080p.BluRay.x264-GRUPO.pt-BR.srt
+                                          movie.nfo
+    destino/TV/Nome Da Serie (2009)/Nome.Da.Serie.S01E01.720p.WEB-DL.x264-GRUPO.mkv
+
+com filmes às vezes divididos em CD1/CD2, capas e legendas junto, e séries
+com várias temporadas, alguns episódios faltando e alguns em dois formatos.
+
+Os arquivos são esparsos: só um truncate até o tamanho realista (700 MB a
+15 GB nos filmes, 150 MB a 3 GB nos episódios), sem ocupar blocos no Linux e
+no macOS; como os tamanhos são sorteados byte a byte, dois arquivos só têm o
+mesmo conteúdo quando o duplicado é injetado. No NTFS o truncate reserva o
+espaço de verdade; use tamanhos_realistas=False (--sem-esparsos) para gerar
+arquivos de poucos KB, que levam um cabeçalho de 16 bytes para que o conteúdo
+de cada um seja diferente.
+
+Duplicados injetados (uma fração dos filmes, --duplicados):
+
+- por nome: o vídeo de um filme copiado, com o mesmo nome e outro tamanho,
+  para a pasta de outro filme;
+- por conteúdo: uma cópia com outro nome e o mesmo cabeçalho e tamanho;
+- por título: o mesmo filme numa pasta com outra convenção (`1987 - Titulo Do Filme`).
+
+Uso direto (para rodar os scripts sobre a biblioteca gerada):
+    python benchmarks/biblioteca_sintetica.py DESTINO [--titulos 1000] [--semente 42]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+# Proporção de séries em relação ao número de títulos
+SERIES_POR_TITULO = 0.1
+
+PALAVRAS = (
+    'A', 'O', 'Da', 'Do', 'De', 'The', 'Of', 'Night', 'Day', 'Last', 'First', 'Dark', 'Light', 'Blood', 'Love',
+    'War', 'Time', 'City', 'River', 'Road', 'House', 'King', 'Queen', 'Man', 'Woman', 'Girl', 'Boy', 'Dead',
+    'Life', 'World', 'Star', 'Moon', 'Sun', 'Fire', 'Ice', 'Stone', 'Iron', 'Gold', 'Silver', 'Black', 'White',
+    'Red', 'Blue', 'Green', 'Lost', 'Hidden', 'Secret', 'Silent', 'Broken', 'Wild', 'Cidade', 'Noite', 'Sol',
+    'Amor', 'Guerra', 'Vida', 'Morte', 'Mar', 'Terra', 'Sangue', 'Fogo', 'Sombra', 'Caminho', 'Rio', 'Casa',
+    'Homem', 'Mulher', 'Menino', 'Menina', 'Rei', 'Rainha', 'Lobo', 'Tigre', 'Dragon', 'Ghost', 'Angel',
+    'Devil', 'Hunter', 'Killer', 'Soldier', 'Doctor', 'Captain', 'Agent', 'Mission', 'Project', 'Protocol',
+    'Empire', 'Kingdom', 'Legend', 'Story', 'Journey', 'Return', 'Rise', 'Fall', 'Dawn', 'Storm', 'Winter',
+    'Summer', 'Spring', 'Autumn', 'Midnight', 'Paradise', 'Inferno', 'Island', 'Mountain', 'Desert', 'Ocean',
+)
+QUALIDADES = ('1080p', '720p', '2160p', '480p')
+ORIGENS = ('BluRay', 'WEB-DL', 'WEBRip', 'HDTV', 'DVDRip', 'BDRip')
+CODECS = ('x264', 'x265', 'HEVC', 'XviD', 'H264')
+GRUPOS = ('GRUPO', 'RARBG', 'YTS', 'SPARKS', 'FGT', 'NTb', 'playWEB', 'AMIABLE')
+EXTENSOES_FILME = ('.mkv',) * 6 + ('.mp4',) * 3 + ('.avi',) * 2 + ('.m2ts', '.MKV')
+EXTENSOES_EPISODIO = ('.mkv',) * 5 + ('.mp4',) * 3 + ('.avi', '.ts')
+
+MB = 1024 * 1024
+GB = 1024 * MB
+
+
+def _titulo(aleatorio):
+    return ' '.join(aleatorio.choice(PALAVRAS) for _ in range(aleatorio.randint(1, 4)))
+
+
+def _release(aleatorio):
+    return (f"{aleatorio.choice(QUALIDADES)}.{aleatorio.choice(ORIGENS)}."
+            f"{aleatorio.choice(CODECS)}-{aleatorio.choice(GRUPOS)}")
+
+
+class _Gerador:
+    """Cria os arquivos e acumula as contagens da biblioteca."""
+
+    def __init__(self, tamanhos_realistas):
+        self.tamanhos_realistas = tamanhos_realistas
+        self.resumo = {'pastas': 0, 'arquivos': 0, 'videos': 0, 'bytes': 0,
+                       'duplicados_nome': 0, 'duplicados_conteudo': 0, 'duplicados_titulo': 0}
+        self._sequencia = 0
+
+    def pasta(self, caminho):
+        os.makedirs(caminho, exist_ok=True)
+        self.resumo['pastas'] += 1
+
+    def arquivo(self, caminho, tamanho, cabecalho=None, video=True):
+        """Cria um arquivo; devolve (cabecalho, tamanho) para copiar o conteúdo num duplicado."""
+        if cabecalho is None:
+            self._sequencia += 1
+            cabecalho = self._sequencia.to_bytes(16, 'little')
+        with open(caminho, 'wb') as f:
+            if not self.tamanhos_realistas:
+                f.write(cabecalho)
+                if tamanho > MB:
+                    tamanho = len(cabecalho) + tamanho % (64 * 1024)
+            f.truncate(tamanho)
+        self.resumo['arquivos'] += 1
+        self.resumo['videos'] += video
+        self.resumo['bytes'] += tamanho
+        return cabecalho, tamanho
+
+
+def _gerar_filmes(gerador, diretorio, quantidade, fracao_duplicados, aleatorio):
+    videos = []
+    titulos = []
+    while len(titulos) < quantidade:
+        titulo, ano = _titulo(aleatorio), aleatorio.randint(1930, 2024)
+        nome_pasta = f"{titulo} ({ano})"
+        pasta = os.path.join(diretorio, nome_pasta)
+        if os.path.exists(pasta):
+            continue
+        gerador.pasta(pasta)
+        base = f"{titulo.replace(' ', '.')}.{ano}.{_release(aleatorio)}"
+        extensao = aleatorio.choice(EXTENSOES_FILME)
+        partes = [f"{base}.CD{n}{extensao}" for n in (1, 2)] if aleatorio.random() < 0.05 else [base + extensao]
+        for nome in partes:
+            tamanho = aleatorio.randint(700 * MB, 15 * GB) // len(partes)
+            videos.append((pasta, nome) + gerador.arquivo(os.path.join(pasta, nome), tamanho))
+        if aleatorio.random() < 0.6:
+            gerador.arquivo(os.path.join(pasta, f"{base}.pt-BR.srt"), aleatorio.randint(30_000, 120_000), video=False)
+        if aleatorio.random() < 0.3:
+            gerador.arquivo(os.path.join(pasta, 'movie.nfo'), aleatorio.randint(1_000, 8_000), video=False)
+        if aleatorio.random() < 0.3:
+            gerador.arquivo(os.path.join(pasta, 'poster.jpg'), aleatorio.randint(50_000, 900_000), video=False)
+        titulos.append((titulo, ano))
+
+    # Duplicados injetados: cada um numa pasta de filme sorteada
+    for _ in range(int(len(videos) * fracao_duplicados)):
+        pasta, nome, cabecalho, tamanho = aleatorio.choice(videos)
+        destino, _, _, _ = aleatorio.choice(videos)
+        tipo = aleatorio.randrange(3)
+        if tipo == 0 and destino != pasta and not os.path.exists(os.path.join(destino, nome)):
+            gerador.arquivo(os.path.join(destino, nome), aleatorio.randint(700 * MB, 15 * GB))
+            gerador.resumo['duplicados_nome'] += 1
+        elif tipo == 1:
+            base, extensao = os.path.splitext(nome)
+            copia = f"{base}.copia{gerador.resumo['duplicados_conteudo']}{extensao}"
+            gerador.arquivo(os.path.join(destino, copia), tamanho, cabecalho)
+            gerador.resumo['duplicados_conteudo'] += 1
+        elif tipo == 2:
+            titulo, ano = aleatorio.choice(titulos)
+            outra = os.path.join(diretorio, f"{ano} - {titulo}")
+            if os.path.exists(outra):
+                continue
+            gerador.pasta(outra)
+            gerador.arquivo(os.path.join(outra, f"{titulo.replace(' ', '.')}.{ano}.{_release(aleatorio)}.mkv"),
+                            aleatorio.randint(700 * MB, 15 * GB))
+            gerador.resumo['duplicados_titulo'] += 1
+
+
+def _gerar_series(gerador, diretorio, quantidade, aleatorio):
+    criadas = 0
+    while criadas < quantidade:
+        titulo, ano = _titulo(aleatorio), aleatorio.randint(1960, 2024)
+        pasta = os.path.join(diretorio, f"{titulo} ({ano})")
+        if os.path.exists(pasta):
+            continue
+        gerador.pasta(pasta)
+        criadas += 1
+        base = titulo.replace(' ', '.')
+        release = _release(aleatorio)
+        extensao = aleatorio.choice(EXTENSOES_EPISODIO)
+        for temporada in range(1, aleatorio.choice((1, 1, 2, 3, 4, 6)) + 1):
+            for episodio in range(1, aleatorio.choice((6, 8, 10, 13, 22)) + 1):
+                if aleatorio.random() < 0.03:
+                    continue  # Episódio faltando
+                nome = f"{base}.S{temporada:02d}E{episodio:02d}.{release}"
+                gerador.arquivo(os.path.join(pasta, nome + extensao), aleatorio.randint(150 * MB, 3 * GB))
+                if aleatorio.random() < 0.02:
+                    gerador.arquivo(os.path.join(pasta, nome + '.avi'), aleatorio.randint(150 * MB, 3 * GB))
+                if aleatorio.random() < 0.3:
+                    gerador.arquivo(os.path.join(pasta, nome + '.srt'), aleatorio.randint(20_000, 80_000), video=False)
+        if aleatorio.random() < 0.5:
+            gerador.arquivo(os.path.join(pasta, 'tvshow.nfo'), aleatorio.randint(1_000, 8_000), video=False)
+
+
+def gerar_biblioteca(destino, titulos, semente=42, fracao_duplicados=0.02, tamanhos_realistas=True):
+    """
+    Gera uma biblioteca sintética em destino/Filmes e destino/TV.
+
+    Args:
+        destino: Pasta onde a biblioteca é criada (precisa estar vazia ou não existir)
+        titulos: Número de pastas de filmes (sem contar as dos duplicados por
+                 título); as séries são SERIES_POR_TITULO desse número
+        semente: Semente do gerador de números aleatórios
+        fracao_duplicados: Duplicados injetados, como fração dos vídeos de filmes
+        tamanhos_realistas: False gera arquivos de poucos KB em vez dos esparsos
+
+    Returns:
+        dict com os diretórios e as contagens (pastas, arquivos, vídeos,
+        bytes aparentes e duplicados injetados de cada tipo)
+    """
+    aleatorio = random.Random(semente)
+    gerador = _Gerador(tamanhos_realistas)
+    diretorio_filmes = os.path.join(destino, 'Filmes')
+    diretorio_series = os.path.join(destino, 'TV')
+    os.makedirs(diretorio_filmes)
+    os.makedirs(diretorio_series)
+
+    _gerar_filmes(gerador, diretorio_filmes, titulos, fracao_duplicados, aleatorio)
+    _gerar_series(gerador, diretorio_series, max(1, int(titulos * SERIES_POR_TITULO)), aleatorio)
+    return dict(gerador.resumo, filmes=diretorio_filmes, series=diretorio_series)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera uma biblioteca sintética de filmes e séries")
+    parser.add_argument('destino', help="Pasta onde a biblioteca é criada (Filmes/ e TV/)")
+    parser.add_argument('--titulos', type=int, default=1000, help="Número de filmes (padrão: 1000)")
+    parser.add_argument('--semente', type=int, default=42, help="Semente do gerador (padrão: 42)")
+    parser.add_argument('--duplicados', type=float, default=0.02,
+                        help="Duplicados injetados, como fração dos vídeos de filmes (padrão: 0.02)")
+    parser.add_argument('--sem-esparsos', action='store_true',
+                        help="Arquivos de poucos KB em vez de esparsos com tamanho realista (NTFS)")
+    args = parser.parse_args()
+
+    if os.path.exists(args.destino) and os.listdir(args.destino):
+        parser.error(f"o destino precisa estar vazio: {args.destino}")
+
+    inicio = time.perf_counter()
+    resumo = gerar_biblioteca(args.destino, args.titulos, args.semente, args.duplicados, not args.sem_esparsos)
+    print(f"Biblioteca gerada em {time.perf_counter() - inicio:.1f}s: {resumo['pastas']} pasta(s), "
+          f"{resumo['arquivos']} arquivo(s) ({resumo['videos']} vídeos, {resumo['bytes'] / GB:,.0f} GB aparentes)")
+    print(f"  Filmes: {resumo['filmes']}")
+    print(f"  Séries: {resumo['series']}")
+    print(f"  Duplicados injetados: {resumo['duplicados_nome']} por nome, {resumo['duplicados_conteudo']} por "
+          f"conteúdo, {resumo['duplicados_titulo']} por título")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
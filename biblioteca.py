@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ponto de entrada único: escaneia cada biblioteca uma vez e gera todas as saídas.
+
+Rodar list_filmes.py, list_series.py e depois find_duplicados.py percorre a
+árvore de filmes e a de séries duas vezes cada. Aqui cada diretório base é
+escaneado uma única vez (o escaneamento com tamanhos de find_duplicados) e o
+mesmo Catalogo alimenta:
+
+- a lista de filmes (lista_filmes.txt/.json/.pdf) e a de séries
+  (lista_series.txt/.json/.pdf), a partir do catálogo em ordem de nome
+  (Catalogo.ordenado), com o mesmo conteúdo gerado pelos listadores;
+- o relatório de duplicados (lista_duplicados.txt/.csv/.pdf).
+
+Os diretórios são passados como argumentos, e as saídas e formatos gerados
+são escolhidos com --saidas e --formatos.
+
+Uso:
+    python biblioteca.py --filmes "Y:\\Mídia\\Filmes" --series "Y:\\Mídia\\TV"
+    python biblioteca.py --filmes "Y:\\Mídia\\Filmes" --saidas filmes --formatos txt
+    python biblioteca.py --filmes ... --series ... --conteudo --titulos --pdf-completo
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import list_filmes
+import list_series
+from catalogo import Catalogo
+from escaneamento import EXCLUSOES_PADRAO
+from banco_catalogo import BancoCatalogo, ARQUIVO_CATALOGO, TIPOS
+from cache_hashes import ARQUIVO_CACHE_HASHES
+from exportacao_json import COMPRESSOES
+from indice_busca import exportar_indice_busca
+from metadados_video import ARQUIVO_CACHE_METADADOS
+from find_duplicados import (escanear_arquivos, completar_tamanhos, procurar_duplicados, ler_metadados_duplicados,
+                             exportar_relatorios)
+
+SAIDAS = ('filmes', 'series', 'duplicados')
+FORMATOS = ('txt', 'json', 'pdf', 'csv')
+
+
+def exportar_lista(modulo, catalogo, tipo, formatos, diretorio_saida, motor_pdf, colunas_pdf,
+                   compressoes_json=()):
+    """
+    Gera a lista de filmes ou de séries (TXT, JSON com o índice de busca e PDF)
+    com os exportadores do listador.
+    """
+    base = os.path.join(diretorio_saida, f"lista_{tipo}")
+    if 'txt' in formatos:
+        modulo.exportar_txt(catalogo, base + '.txt')
+    if 'json' in formatos:
+        modulo.exportar_json(catalogo, base + '.json', compressoes_json)
+        exportar_indice_busca(catalogo.items(), os.path.join(diretorio_saida, f"busca_{tipo}.json"), compressoes_json)
+    if 'pdf' in formatos:
+        try:
+            modulo.exportar_pdf(catalogo, base + '.pdf', motor=motor_pdf, colunas=colunas_pdf)
+        except ImportError:
+            print("\n[AVISO] PDF não foi gerado. Instale reportlab para gerar PDFs.")
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(
+        description="Escaneia as bibliotecas uma vez e gera as listas de filmes e séries e o relatório de duplicados"
+    )
+    parser.add_argument('--filmes', help="Diretório base dos filmes (ex.: Y:\\Mídia\\Filmes)")
+    parser.add_argument('--series', help="Diretório base das séries (ex.: Y:\\Mídia\\TV)")
+    parser.add_argument('--saidas', nargs='+', choices=SAIDAS, default=list(SAIDAS),
+                        help="Saídas a gerar (padrão: todas)")
+    parser.add_argument('--formatos', nargs='+', choices=FORMATOS, default=list(FORMATOS),
+                        help="Formatos a gerar (padrão: todos; o JSON existe só para as listas e o CSV só para os duplicados)")
+    parser.add_argument('--destino', default='.', help="Pasta onde os arquivos são gravados (padrão: atual)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Threads para escanear as pastas em paralelo (padrão: 1, serial)")
+    parser.add_argument('--profundidade', type=int, default=0,
+                        help="Níveis de subpastas lidos dentro de cada pasta (padrão: 0; ex.: 1 para Série/Temporada 1/)")
+    parser.add_argument('--excluir', nargs='*', default=list(EXCLUSOES_PADRAO), metavar='GLOB',
+                        help="Subpastas ignoradas com --profundidade (globs, sem diferenciar maiúsculas; "
+                             "padrão: Extras, Sample, Featurettes, ...)")
+    parser.add_argument('--catalogo', default=ARQUIVO_CATALOGO,
+                        help=f"Banco SQLite do catálogo, atualizado a cada escaneamento (padrão: {ARQUIVO_CATALOGO})")
+    parser.add_argument('--do-catalogo', action='store_true',
+                        help="Não escanear: usar os arquivos já gravados no catálogo")
+    # Listas
+    parser.add_argument('--motor-pdf', choices=['canvas', 'platypus'], default=list_filmes.MOTOR_PDF_PADRAO,
+                        help="Gerador do PDF das listas (padrão: canvas)")
+    parser.add_argument('--colunas-pdf', type=int, default=1, help="Colunas por página no PDF das listas (motor canvas)")
+    parser.add_argument('--compressao-json', nargs='+', choices=COMPRESSOES, default=[],
+                        help="Também gravar o JSON das listas pré-comprimido (gzip: .json.gz, brotli: .json.br)")
+    # Duplicados
+    parser.add_argument('--conteudo', action='store_true',
+                        help="Também procurar duplicados por conteúdo (tamanho -> hash parcial -> hash completo)")
+    parser.add_argument('--titulos', action='store_true',
+                        help="Também procurar filmes duplicados pelo título/ano extraído do nome das pastas")
+    parser.add_argument('--cache-hashes', default=ARQUIVO_CACHE_HASHES,
+                        help=f"Banco SQLite com os hashes já calculados (padrão: {ARQUIVO_CACHE_HASHES})")
+    parser.add_argument('--sem-cache', action='store_true', help="Não usar o cache de hashes (recalcula tudo)")
+    parser.add_argument('--podar-cache', action='store_true',
+                        help="Remover do cache de hashes os arquivos que não existem mais")
+    parser.add_argument('--leitores-por-volume', type=int, default=1,
+                        help="Threads lendo ao mesmo tempo de cada diretório base no cálculo de hashes (padrão: 1)")
+    parser.add_argument('--metadados', action='store_true',
+                        help="Ler duração, resolução e codecs das cópias duplicadas (só o cabeçalho de MKV, MP4/MOV e AVI)")
+    parser.add_argument('--cache-metadados', default=ARQUIVO_CACHE_METADADOS,
+                        help=f"Banco SQLite com os metadados já lidos (padrão: {ARQUIVO_CACHE_METADADOS})")
+    parser.add_argument('--leitores-metadados', type=int, default=4,
+                        help="Arquivos lidos ao mesmo tempo no --metadados (padrão: 4)")
+    parser.add_argument('--pdf-completo', action='store_true',
+                        help="PDF de duplicados com todos os grupos e cópias (páginas geradas em paralelo)")
+    parser.add_argument('--processos-pdf', type=int, default=None,
+                        help="Processos usados pelo --pdf-completo (padrão: número de CPUs)")
+    parser.add_argument('--sem-indice', action='store_true',
+                        help="Não incluir o índice na primeira página do --pdf-completo")
+    args = parser.parse_args()
+
+    if args.profundidade < 0:
+        parser.error("--profundidade deve ser 0 ou mais")
+
+    raizes = {'filmes': args.filmes, 'series': args.series}
+    if not args.do_catalogo and not any(raizes.values()):
+        parser.error("informe --filmes e/ou --series (ou use --do-catalogo)")
+
+    print("=" * 80)
+    print("BIBLIOTECA: LISTAS E DUPLICADOS")
+    print("=" * 80)
+
+    if not args.do_catalogo:
+        for tipo, raiz in raizes.items():
+            if raiz is not None and not Path(raiz).exists():
+                print(f"\n[ERRO] Diretório de {tipo} não encontrado: {raiz}")
+                print("       Verifique se o caminho está correto e acessível.")
+                return
+    os.makedirs(args.destino, exist_ok=True)
+
+    banco = BancoCatalogo(args.catalogo)
+    try:
+        tempos = {}
+
+        # Escanear cada biblioteca uma única vez
+        inicio_etapa = time.time()
+        catalogos = {}
+        if args.do_catalogo:
+            print(f"\nLendo arquivos do catálogo: {args.catalogo}")
+            for tipo in TIPOS:
+                catalogos[tipo] = banco.carregar_catalogo(tipo)
+            tempos['Leitura do catálogo'] = time.time() - inicio_etapa
+        else:
+            print("\nEscaneando bibliotecas...")
+            for tipo, raiz in raizes.items():
+                if raiz is not None:
+                    catalogos[tipo] = escanear_arquivos(raiz, tipo, workers=args.workers,
+                                                        profundidade=args.profundidade, excluir=args.excluir)
+                    sys.stdout.flush()
+            tempos['Escaneamento'] = time.time() - inicio_etapa
+
+            inicio_etapa = time.time()
+            for tipo, catalogo in catalogos.items():
+                banco.gravar_catalogo(tipo, catalogo)
+            tempos['Gravação do catálogo'] = time.time() - inicio_etapa
+            print(f"  [OK] Catálogo atualizado: {args.catalogo}")
+
+        for tipo, catalogo in catalogos.items():
+            print(f"[OK] {tipo}: {len(catalogo)} pasta(s), {catalogo.total_arquivos} arquivo(s)")
+
+        # Listas de filmes e séries, a partir do mesmo escaneamento
+        for tipo, modulo in (('filmes', list_filmes), ('series', list_series)):
+            if tipo not in args.saidas:
+                continue
+            if tipo not in catalogos:
+                print(f"\n[AVISO] Lista de {tipo} ignorada: informe --{tipo}")
+                continue
+            inicio_etapa = time.time()
+            exportar_lista(modulo, catalogos[tipo].ordenado(), tipo, args.formatos,
+                           args.destino, args.motor_pdf, args.colunas_pdf, args.compressao_json)
+            tempos[f'Lista de {tipo}'] = time.time() - inicio_etapa
+
+        # Relatório de duplicados
+        if 'duplicados' in args.saidas:
+            # Listas gravadas por list_filmes.py/list_series.py não trazem tamanhos
+            if args.do_catalogo and completar_tamanhos(banco, catalogos) and args.conteudo:
+                print("\n[ERRO] --conteudo precisa do tamanho de todos os arquivos. Verifique se o "
+                      "compartilhamento está acessível ou rode sem --do-catalogo.")
+                return
+            # O índice de nomes do banco só vale se os dois tipos estão atualizados nele
+            banco_duplicados = banco if len(catalogos) == len(TIPOS) else None
+            duplicados_por_nome, duplicados_por_conteudo, duplicados_por_titulo = procurar_duplicados(
+                catalogos.get('filmes', Catalogo('')), catalogos.get('series', Catalogo('')),
+                banco=banco_duplicados, titulos=args.titulos, conteudo=args.conteudo,
+                arquivo_cache_hashes=None if args.sem_cache else args.cache_hashes, podar_cache=args.podar_cache,
+                leitores_por_volume=args.leitores_por_volume, tempos=tempos
+            )
+
+            metadados = None
+            if args.metadados:
+                print("\nLendo metadados das cópias...")
+                inicio_etapa = time.time()
+                metadados = ler_metadados_duplicados(duplicados_por_nome, duplicados_por_conteudo, duplicados_por_titulo,
+                                                     arquivo_cache=args.cache_metadados, workers=args.leitores_metadados,
+                                                     catalogos=tuple(catalogos.values()))
+                tempos['Metadados'] = time.time() - inicio_etapa
+
+            print("\n[4/4] Exportando relatório de duplicados...")
+            inicio_etapa = time.time()
+            exportar_relatorios(duplicados_por_nome, duplicados_por_conteudo, duplicados_por_titulo,
+                                formatos=args.formatos, diretorio_saida=args.destino,
+                                pdf_completo=args.pdf_completo, processos_pdf=args.processos_pdf,
+                                com_indice=not args.sem_indice, metadados=metadados)
+            tempos['Relatório de duplicados'] = time.time() - inicio_etapa
+
+        print("\n" + "=" * 80)
+        print("Tempo por etapa:")
+        for etapa, segundos in tempos.items():
+            print(f"  {etapa:<60}{segundos:>8.1f}s")
+        print("=" * 80)
+        print("Processo concluído!")
+        print("=" * 80)
+
+    except KeyboardInterrupt:
+        print("\n\n[AVISO] Processo interrompido pelo usuário.")
+    except Exception as e:
+        print(f"\n[ERRO] Erro inesperado: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        banco.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache persistente do escaneamento, usado por list_filmes.py e list_series.py.
+
+Guarda, para cada pasta de título, o mtime da pasta e a lista de arquivos que
+ela continha. Como o mtime de um diretório muda sempre que uma entrada é
+criada, removida ou renomeada dentro dele, uma pasta só precisa ser relida
+quando o seu mtime mudou. Pastas novas e removidas aparecem na listagem única
+do diretório base, então uma nova varredura custa uma leitura do diretório
+base mais a releitura apenas das pastas alteradas.
+
+O cache é um JSON compacto salvo ao lado das saídas:
+    {"versao": 1, "diretorio": "...", "pastas": {"nome": [mtime_ns, [arquivos]]}}
+
+No escaneamento recursivo (profundidade > 0) um arquivo novo em
+`Série/Temporada 1/` não muda o mtime da pasta da série, então a entrada
+guarda também o mtime de cada subpasta lida e só é reaproveitada se todos
+continuarem iguais (um stat por subpasta, no lugar de uma listagem):
+    {"nome": [mtime_ns, [arquivos], [["Temporada 1", mtime_ns], ...]]}
+A profundidade e os globs de exclusão ficam em "opcoes"; um cache gravado com
+outras opções é descartado.
+
+Os nomes são guardados sem filtro de extensão, para que uma mudança na lista
+de formatos suportados não exija invalidar o cache.
+"""
+
+import os
+import json
+
+from escaneamento import escanear_pastas
+
+VERSAO_CACHE = 1
+
+
+def _opcoes(profundidade, excluir):
+    return {'profundidade': profundidade, 'excluir': list(excluir)} if profundidade > 0 else None
+
+
+def carregar_cache(arquivo_cache, diretorio_base, profundidade=0, excluir=()):
+    """
+    Carrega o cache de um diretório base (vazio se foi gravado com outra
+    profundidade ou outros globs de exclusão).
+
+    Returns:
+        dict {nome_pasta: [mtime_ns, [arquivos]]} (vazio se não houver cache válido)
+    """
+    if not arquivo_cache:
+        return {}
+    try:
+        with open(arquivo_cache, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"  [AVISO] Cache ignorado ({arquivo_cache}): {e}")
+        return {}
+
+    if dados.get('versao') != VERSAO_CACHE or dados.get('diretorio') != str(diretorio_base):
+        return {}
+    if dados.get('opcoes') != _opcoes(profundidade, excluir):
+        return {}
+    return dados.get('pastas', {})
+
+
+def salvar_cache(arquivo_cache, diretorio_base, pastas, profundidade=0, excluir=()):
+    """Grava o cache de forma atômica (arquivo temporário + os.replace)."""
+    if not arquivo_cache:
+        return
+    dados = {'versao': VERSAO_CACHE, 'diretorio': str(diretorio_base), 'pastas': pastas}
+    opcoes = _opcoes(profundidade, excluir)
+    if opcoes is not None:
+        dados['opcoes'] = opcoes
+    temporario = f"{arquivo_cache}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(
+            dados,
+            f,
+            ensure_ascii=False,
+            separators=(',', ':')
+        )
+    os.replace(temporario, arquivo_cache)
+
+
+def _subpastas_iguais(pasta, subpastas):
+    """True se todas as subpastas gravadas no cache ainda têm o mesmo mtime."""
+    for relativo, mtime in subpastas:
+        try:
+            if os.stat(os.path.join(pasta.path, relativo)).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def escanear_pastas_com_cache(pastas, cache, novo_cache, workers=1, profundidade=0, excluir=()):
+    """
+    Escaneia as pastas reaproveitando o cache das que não mudaram.
+
+    Args:
+        pastas: Lista de os.DirEntry (vinda de listar_pastas)
+        cache: Cache carregado por carregar_cache
+        novo_cache: dict preenchido com as entradas atuais (pastas removidas
+                    simplesmente não aparecem nele)
+        workers: Threads usadas para reler as pastas alteradas
+        profundidade, excluir: Escaneamento recursivo (ver escaneamento.escanear_pasta)
+
+    Yields:
+        Tuplas (pasta, nomes_arquivos, excecao, reaproveitada), na ordem de `pastas`
+    """
+    mtimes = {}
+    relidas = []
+    for pasta in pastas:
+        try:
+            mtime = pasta.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        mtimes[pasta.name] = mtime
+        entrada = cache.get(pasta.name)
+        if mtime is None or entrada is None or entrada[0] != mtime or \
+                (len(entrada) > 2 and not _subpastas_iguais(pasta, entrada[2])):
+            relidas.append(pasta)
+
+    subpastas = {}
+    resultados_relidos = escanear_pastas(relidas, workers=workers, profundidade=profundidade, excluir=excluir,
+                                         subpastas=subpastas)
+    relidas = set(id(pasta) for pasta in relidas)
+
+    for pasta in pastas:
+        nome = pasta.name
+        if id(pasta) not in relidas:
+            nomes = cache[nome][1]
+            novo_cache[nome] = cache[nome]
+            yield pasta, nomes, None, True
+            continue
+
+        _, arquivos, erros, excecao = next(resultados_relidos)
+        nomes = [nome_arquivo for _, nome_arquivo, _, _ in arquivos]
+        # Uma subpasta que não pôde ser lida deixa a pasta fora do cache (é relida na próxima vez)
+        if excecao is None and mtimes[nome] is not None and not (profundidade > 0 and erros):
+            novo_cache[nome] = [mtimes[nome], nomes] + ([subpastas[nome]] if subpastas.get(nome) else [])
+        yield pasta, nomes, excecao, False
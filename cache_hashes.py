@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache persistente de hashes de conteúdo, usado por find_duplicados.py.
+
+Calcular o hash de um MKV de 1.5 GB pela rede leva minutos, então cada hash
+calculado é guardado num banco SQLite local junto com o tamanho e o mtime do
+arquivo. Numa nova execução o hash só é recalculado se o arquivo for novo ou
+se o tamanho ou o mtime tiverem mudado. Tamanho e mtime vêm do escaneamento,
+então consultar o cache não custa um os.stat por arquivo.
+
+Tabela hashes:
+    caminho (chave), tamanho, mtime_ns, bloco_parcial, hash_parcial,
+    parcial_completo (1 se o hash parcial leu o arquivo inteiro), hash_completo
+"""
+
+import os
+import sqlite3
+import threading
+
+from hash_arquivos import hash_parcial, hash_completo, TAMANHO_BLOCO_PARCIAL
+
+ARQUIVO_CACHE_HASHES = '.cache_hashes.sqlite3'
+
+# Quantidade de gravações acumuladas antes de um commit (preserva o progresso
+# se a execução for interrompida no meio)
+GRAVACOES_POR_COMMIT = 50
+
+
+class CacheHashes:
+    """
+    Cache de hashes em SQLite, indexado pelo caminho do arquivo.
+
+    Pode ser usado por várias threads ao mesmo tempo: o acesso ao banco é
+    serializado por um lock, mas o cálculo dos hashes acontece fora dele.
+    """
+
+    def __init__(self, arquivo_cache=ARQUIVO_CACHE_HASHES):
+        self.arquivo_cache = arquivo_cache
+        self.conexao = sqlite3.connect(arquivo_cache, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conexao.execute("""
+            CREATE TABLE IF NOT EXISTS hashes (
+                caminho TEXT PRIMARY KEY,
+                tamanho INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                bloco_parcial INTEGER,
+                hash_parcial TEXT,
+                parcial_completo INTEGER,
+                hash_completo TEXT
+            )
+        """)
+        self.conexao.commit()
+        self.gravacoes_pendentes = 0
+        self.reaproveitados = 0
+        self.calculados = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+    def fechar(self):
+        """Grava as alterações pendentes e fecha o banco."""
+        with self.lock:
+            if self.conexao is None:
+                return
+            self.conexao.commit()
+            self.conexao.close()
+            self.conexao = None
+
+    def _buscar(self, caminho, tamanho, mtime_ns):
+        """Retorna a linha do cache se o arquivo não mudou desde o último hash."""
+        with self.lock:
+            return self.conexao.execute(
+                "SELECT bloco_parcial, hash_parcial, parcial_completo, hash_completo "
+                "FROM hashes WHERE caminho = ? AND tamanho = ? AND mtime_ns = ?",
+                (caminho, tamanho, mtime_ns)
+            ).fetchone()
+
+    def _gravar(self, sql, parametros):
+        with self.lock:
+            self.conexao.execute(sql, parametros)
+            self.calculados += 1
+            self.gravacoes_pendentes += 1
+            if self.gravacoes_pendentes >= GRAVACOES_POR_COMMIT:
+                self.conexao.commit()
+                self.gravacoes_pendentes = 0
+
+    def _reaproveitar(self):
+        with self.lock:
+            self.reaproveitados += 1
+
+    @staticmethod
+    def _mtime(caminho, mtime_ns):
+        """mtime do escaneamento ou, se não foi lido (None ou -1), o do disco."""
+        if mtime_ns is None or mtime_ns < 0:
+            return os.stat(caminho).st_mtime_ns
+        return mtime_ns
+
+    def hash_parcial(self, caminho, tamanho, mtime_ns=None, bloco=TAMANHO_BLOCO_PARCIAL):
+        """
+        Igual a hash_arquivos.hash_parcial, reaproveitando o cache quando possível.
+        mtime_ns é o do escaneamento (sem ele o arquivo é consultado).
+        """
+        mtime_ns = self._mtime(caminho, mtime_ns)
+        linha = self._buscar(caminho, tamanho, mtime_ns)
+        if linha is not None and linha[0] == bloco and linha[1] is not None:
+            self._reaproveitar()
+            return linha[1], bool(linha[2])
+
+        hash_md5, completo = hash_parcial(caminho, tamanho, bloco)
+        self._gravar(
+            "INSERT OR REPLACE INTO hashes "
+            "(caminho, tamanho, mtime_ns, bloco_parcial, hash_parcial, parcial_completo, hash_completo) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (caminho, tamanho, mtime_ns, bloco, hash_md5, int(completo), hash_md5 if completo else None)
+        )
+        return hash_md5, completo
+
+    def hash_completo(self, caminho, tamanho, mtime_ns=None):
+        """
+        Igual a hash_arquivos.hash_completo, reaproveitando o cache quando possível.
+        mtime_ns é o do escaneamento (sem ele o arquivo é consultado).
+        """
+        mtime_ns = self._mtime(caminho, mtime_ns)
+        linha = self._buscar(caminho, tamanho, mtime_ns)
+        if linha is not None and linha[3] is not None:
+            self._reaproveitar()
+            return linha[3]
+
+        hash_md5 = hash_completo(caminho)
+        if linha is not None:
+            self._gravar(
+                "UPDATE hashes SET hash_completo = ? WHERE caminho = ?",
+                (hash_md5, caminho)
+            )
+        else:
+            self._gravar(
+                "INSERT OR REPLACE INTO hashes (caminho, tamanho, mtime_ns, hash_completo) "
+                "VALUES (?, ?, ?, ?)",
+                (caminho, tamanho, mtime_ns, hash_md5)
+            )
+        return hash_md5
+
+    def podar(self, caminhos_escaneados):
+        """
+        Remove do cache os arquivos que não existem mais.
+
+        Um caminho só é removido se não apareceu no escaneamento atual e também
+        não existe mais no disco, de modo que entradas de diretórios que não
+        foram escaneados nesta execução são preservadas.
+
+        Returns:
+            Quantidade de entradas removidas
+        """
+        caminhos_escaneados = set(caminhos_escaneados)
+        with self.lock:
+            linhas = self.conexao.execute("SELECT caminho FROM hashes").fetchall()
+        removidos = [
+            (caminho,) for (caminho,) in linhas
+            if caminho not in caminhos_escaneados and not os.path.exists(caminho)
+        ]
+        with self.lock:
+            self.conexao.executemany("DELETE FROM hashes WHERE caminho = ?", removidos)
+            self.conexao.commit()
+        return len(removidos)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Catálogo compacto de arquivos, compartilhado por list_filmes.py,
+list_series.py e find_duplicados.py.
+
+Em vez de uma tupla com o caminho completo (`Y:\\Mídia\\Filmes\\Pasta\\arquivo.mkv`)
+e o nome da pasta repetidos para cada arquivo, o catálogo guarda os dados em
+colunas:
+
+- o diretório base uma única vez;
+- uma Pasta (com __slots__) por pasta, com o nome internado (sys.intern) e o
+  intervalo [inicio, fim) dos seus arquivos;
+- uma lista com o nome de cada arquivo;
+- arrays (módulo array) com o índice da pasta, o tamanho e o mtime de cada
+  arquivo, 4 + 8 + 8 bytes por arquivo em vez de um objeto int cada.
+
+O caminho completo é montado só quando alguém pede (Arquivo.caminho). Os
+registros Arquivo também têm __slots__ e são criados sob demanda na
+iteração, sem ficar guardados no catálogo.
+
+Para os listadores o catálogo se comporta como o antigo dict
+{nome_pasta: [arquivos]}: len() é o número de pastas e items() devolve
+(nome_pasta, [nomes_arquivos]) na ordem de inclusão.
+
+A medição de memória com 1M de arquivos está em benchmarks/bench_catalogo.py.
+"""
+
+import os
+import sys
+from array import array
+
+# Valor guardado nas colunas de tamanho e mtime quando o dado não foi lido
+DESCONHECIDO = -1
+
+
+class Pasta:
+    """Uma pasta do catálogo e o intervalo [inicio, fim) dos seus arquivos."""
+
+    __slots__ = ('nome', 'caminho', 'inicio', 'fim')
+
+    def __init__(self, nome, caminho, inicio, fim):
+        self.nome = nome
+        self.caminho = caminho
+        self.inicio = inicio
+        self.fim = fim
+
+    def __len__(self):
+        return self.fim - self.inicio
+
+    def __repr__(self):
+        return f"Pasta({self.nome!r}, {len(self)} arquivo(s))"
+
+
+class Arquivo:
+    """Registro de um arquivo, montado a partir das colunas do catálogo."""
+
+    __slots__ = ('nome', 'pasta', 'tamanho', 'mtime_ns')
+
+    def __init__(self, nome, pasta, tamanho, mtime_ns):
+        self.nome = nome
+        self.pasta = pasta
+        self.tamanho = tamanho
+        self.mtime_ns = mtime_ns
+
+    @property
+    def caminho(self):
+        return os.path.join(self.pasta.caminho, self.nome)
+
+    def __repr__(self):
+        return f"Arquivo({self.caminho!r}, tamanho={self.tamanho})"
+
+
+class Catalogo:
+    """
+    Arquivos de um diretório base, agrupados por pasta e guardados em colunas.
+
+    Os arquivos de uma pasta são sempre adicionados juntos
+    (adicionar_pasta), então ficam contíguos nas colunas.
+    """
+
+    def __init__(self, raiz):
+        self.raiz = str(raiz)
+        self.pastas = []
+        self.nomes = []
+        self.indices_pasta = array('I')
+        self.tamanhos = array('q')
+        self.mtimes = array('q')
+
+    def adicionar_pasta(self, nome, nomes_arquivos, tamanhos=None, mtimes=None):
+        """
+        Adiciona uma pasta com os seus arquivos.
+
+        Args:
+            nome: Nome da pasta (relativo ao diretório base)
+            nomes_arquivos: Nomes dos arquivos da pasta
+            tamanhos: Tamanhos em bytes, na mesma ordem (ou None)
+            mtimes: mtime em nanossegundos, na mesma ordem (ou None)
+
+        Returns:
+            A Pasta criada
+        """
+        nome = sys.intern(nome)
+        inicio = len(self.nomes)
+        self.nomes.extend(nomes_arquivos)
+        fim = len(self.nomes)
+        quantidade = fim - inicio
+
+        pasta = Pasta(nome, sys.intern(os.path.join(self.raiz, nome)), inicio, fim)
+        self.indices_pasta.extend([len(self.pastas)] * quantidade)
+        self.tamanhos.extend(tamanhos if tamanhos is not None else [DESCONHECIDO] * quantidade)
+        self.mtimes.extend(mtimes if mtimes is not None else [DESCONHECIDO] * quantidade)
+        self.pastas.append(pasta)
+        return pasta
+
+    def ordenado(self):
+        """
+        Novo catálogo com as pastas e os arquivos de cada pasta em ordem de nome,
+        a ordem das listas de filmes e séries. Tamanhos e mtimes acompanham os
+        arquivos.
+        """
+        nomes, tamanhos, mtimes = self.nomes, self.tamanhos, self.mtimes
+        catalogo = Catalogo(self.raiz)
+        for pasta in sorted(self.pastas, key=lambda pasta: pasta.nome):
+            indices = sorted(range(pasta.inicio, pasta.fim), key=nomes.__getitem__)
+            catalogo.adicionar_pasta(
+                pasta.nome,
+                [nomes[i] for i in indices],
+                [tamanhos[i] for i in indices],
+                [mtimes[i] for i in indices],
+            )
+        return catalogo
+
+    # Interface de dict {nome_pasta: [arquivos]}, usada pelos listadores
+
+    def __len__(self):
+        return len(self.pastas)
+
+    def __iter__(self):
+        return (pasta.nome for pasta in self.pastas)
+
+    def items(self):
+        nomes = self.nomes
+        return ((pasta.nome, nomes[pasta.inicio:pasta.fim]) for pasta in self.pastas)
+
+    def values(self):
+        nomes = self.nomes
+        return (nomes[pasta.inicio:pasta.fim] for pasta in self.pastas)
+
+    # Acesso por arquivo
+
+    @property
+    def total_arquivos(self):
+        return len(self.nomes)
+
+    def caminho(self, indice):
+        """Caminho completo do arquivo de índice `indice`."""
+        return os.path.join(self.pastas[self.indices_pasta[indice]].caminho, self.nomes[indice])
+
+    def arquivo(self, indice):
+        """Registro Arquivo do arquivo de índice `indice`."""
+        return Arquivo(self.nomes[indice], self.pastas[self.indices_pasta[indice]],
+                       self.tamanhos[indice], self.mtimes[indice])
+
+    def arquivos_da_pasta(self, pasta):
+        """Registros Arquivo dos arquivos de uma Pasta."""
+        nomes, tamanhos, mtimes = self.nomes, self.tamanhos, self.mtimes
+        for i in range(pasta.inicio, pasta.fim):
+            yield Arquivo(nomes[i], pasta, tamanhos[i], mtimes[i])
+
+    def arquivos(self):
+        """Registros Arquivo de todos os arquivos, pasta por pasta."""
+        for pasta in self.pastas:
+            yield from self.arquivos_da_pasta(pasta)
+
+    def caminhos(self):
+        """Caminhos completos de todos os arquivos."""
+        nomes = self.nomes
+        for pasta in self.pastas:
+            for i in range(pasta.inicio, pasta.fim):
+                yield os.path.join(pasta.caminho, nomes[i])
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Identificação de temporada e episódio nos nomes dos arquivos das séries,
+usada por list_series.py para mostrar as temporadas de cada série e apontar
+episódios faltando ou repetidos.
+
+analisar_episodio entende os formatos encontrados na biblioteca, tentados
+nesta ordem (o primeiro que casar vale):
+
+- `S01E02`, `s01.e02`, `S01x02`, com vários episódios no mesmo arquivo
+  (`S02E01-E02`, `S01E01E02`, `S01E01-02`);
+- `1x02` e `1x02-03`;
+- `01.02 Título` (temporada.episódio no começo do nome);
+- `EP01`, `Ep 6`, `Episódio 11`, `Capítulo 3` (sem temporada);
+- um número solto de até 3 dígitos entre separadores (`02 - Título`,
+  `Série - 04 [720p]`, `Files-01v2`), também sem temporada.
+
+Nos nomes com subpasta (escaneamento com --profundidade, `Temporada 3/01 -
+Título.mkv`) só o nome do arquivo é analisado; se ele não trouxer a
+temporada, ela vem da pasta (`Season 2`, `Temporada 3`, `S04`, `Specials`).
+
+As expressões são compiladas uma vez no carregamento do módulo; o benchmark
+benchmarks/bench_episodios.py mede o parser sobre o lista_series.txt.
+
+IndiceTemporadas indexa os episódios de uma série numa única passada
+({temporada: {episodio: [arquivos]}}); os episódios faltando (buracos entre 1
+e o maior episódio de cada temporada) e os repetidos (mais de um arquivo com o
+mesmo episódio, como `.avi` e `.mp4`) saem direto do índice.
+"""
+
+import os
+import re
+from collections import namedtuple
+
+# Itens listados em cada linha do resumo (faltando/repetidos); o resto vira "(+N)"
+MAX_ITENS_RESUMO = 20
+
+# Maior intervalo aceito num arquivo com vários episódios (S01E01-E03)
+MAX_EPISODIOS_POR_ARQUIVO = 10
+
+Episodio = namedtuple('Episodio', ['temporada', 'episodios'])
+
+_RE_EXTENSAO = re.compile(r'\.[A-Za-z0-9]{2,5}$')
+_RE_COLCHETES = re.compile(r'\[[^\]]*\]')
+_RE_NUMEROS = re.compile(r'\d+')
+_RE_SXXEYY = re.compile(
+    r'(?<![A-Za-z0-9])[Ss](\d{1,2})[ ._-]?[EeXx](\d{1,3})(?!\d)((?:(?:-[Ee]?|[Ee])\d{1,3}(?!\d))*)'
+)
+_RE_NXNN = re.compile(r'(?<![A-Za-z0-9])(\d{1,2})[xX](\d{2,3})(?!\d)((?:-\d{2,3}(?!\d))*)')
+_RE_TEMPORADA_PONTO = re.compile(r'^\s*(\d{1,2})\.(\d{2})(?=[\s_-])()')
+_RE_EP = re.compile(
+    r'(?<![A-Za-z])(?:ep(?:is[oó]dio|isode)?|cap(?:[ií]tulo)?)\.?[ _-]*(\d{1,4})(?!\d)((?:-\d{1,4}(?!\d))*)',
+    re.IGNORECASE
+)
+_RE_NUMERO_SOLTO = re.compile(r'(?:^|[\s._/-])(\d{1,3})(?:v\d)?(?=[\s._()-]|$)')
+_RE_PASTA_TEMPORADA = re.compile(r'^(?:season|temporada|s)[ ._-]*(\d{1,2})$', re.IGNORECASE)
+_RE_PASTA_ESPECIAIS = re.compile(r'^(?:specials|especiais)$', re.IGNORECASE)
+
+
+def _numeros_episodios(primeiro, continuacao):
+    """Episódios de um arquivo: o primeiro e, se houver, o intervalo até o último."""
+    primeiro = int(primeiro)
+    if not continuacao:
+        return (primeiro,)
+    ultimo = int(_RE_NUMEROS.findall(continuacao)[-1])
+    if primeiro < ultimo <= primeiro + MAX_EPISODIOS_POR_ARQUIVO:
+        return tuple(range(primeiro, ultimo + 1))
+    return (primeiro,)
+
+
+def _temporada_da_pasta(pasta):
+    """Temporada indicada pelo nome de uma pasta (`Season 2` -> 2, `Specials` -> 0) ou None."""
+    pasta = pasta.strip()
+    encontrado = _RE_PASTA_TEMPORADA.match(pasta)
+    if encontrado:
+        return int(encontrado.group(1))
+    return 0 if _RE_PASTA_ESPECIAIS.match(pasta) else None
+
+
+def analisar_episodio(nome):
+    """
+    Extrai temporada e episódio(s) do nome de um arquivo.
+
+    nome pode ter subpastas (`Temporada 1/S01E01.mkv`): a análise usa só o nome
+    do arquivo, e a pasta imediatamente acima dá a temporada quando o nome
+    não a tem.
+
+    Returns:
+        Episodio(temporada, episodios), onde temporada é int ou None (numeração
+        sem temporada) e episodios é uma tupla de ints; ou None se o nome não
+        tiver número de episódio reconhecível
+    """
+    pastas, _, arquivo = nome.replace(os.sep, '/').rpartition('/')
+    episodio = _analisar_arquivo(arquivo)
+    if episodio is not None and episodio.temporada is None and pastas:
+        temporada = _temporada_da_pasta(pastas.rpartition('/')[2])
+        if temporada is not None:
+            return Episodio(temporada, episodio.episodios)
+    return episodio
+
+
+def _analisar_arquivo(nome):
+    """analisar_episodio para um nome de arquivo sem subpasta."""
+    base = _RE_EXTENSAO.sub('', nome)
+
+    for padrao in (_RE_SXXEYY, _RE_NXNN, _RE_TEMPORADA_PONTO):
+        encontrado = padrao.search(base)
+        if encontrado:
+            temporada, primeiro, continuacao = encontrado.groups()
+            return Episodio(int(temporada), _numeros_episodios(primeiro, continuacao))
+
+    encontrado = _RE_EP.search(base)
+    if encontrado:
+        return Episodio(None, _numeros_episodios(*encontrado.groups()))
+
+    # Tags entre colchetes ([720p], [601905D1], [1]) não são número de episódio
+    encontrado = _RE_NUMERO_SOLTO.search(_RE_COLCHETES.sub(' ', base))
+    if encontrado:
+        return Episodio(None, (int(encontrado.group(1)),))
+    return None
+
+
+def _chave_temporada(temporada):
+    return -1 if temporada is None else temporada
+
+
+def rotulo_episodio(temporada, episodio):
+    """`T01E05`, ou `E05` para numeração sem temporada."""
+    return f"E{episodio:02d}" if temporada is None else f"T{temporada:02d}E{episodio:02d}"
+
+
+def _agrupar_intervalos(numeros):
+    """[1, 2, 3, 5] -> [(1, 3), (5, 5)] (números já ordenados)."""
+    intervalos = []
+    for numero in numeros:
+        if intervalos and numero == intervalos[-1][1] + 1:
+            intervalos[-1][1] = numero
+        else:
+            intervalos.append([numero, numero])
+    return [tuple(intervalo) for intervalo in intervalos]
+
+
+def _limitar(itens):
+    if len(itens) <= MAX_ITENS_RESUMO:
+        return ', '.join(itens)
+    return ', '.join(itens[:MAX_ITENS_RESUMO]) + f", ... (+{len(itens) - MAX_ITENS_RESUMO})"
+
+
+class IndiceTemporadas:
+    """
+    Índice de temporadas e episódios de uma série, montado numa passada pelos
+    nomes dos arquivos.
+
+    Atributos:
+        temporadas: {temporada: {episodio: [arquivos]}} (temporada None =
+                    numeração sem temporada)
+        nao_reconhecidos: Arquivos sem número de episódio reconhecível
+    """
+
+    def __init__(self, episodios):
+        self.temporadas = {}
+        self.nao_reconhecidos = []
+        for nome in episodios:
+            episodio = analisar_episodio(nome)
+            if episodio is None:
+                self.nao_reconhecidos.append(nome)
+                continue
+            numeros = self.temporadas.setdefault(episodio.temporada, {})
+            for numero in episodio.episodios:
+                numeros.setdefault(numero, []).append(nome)
+
+    def _ordenadas(self):
+        return sorted(self.temporadas.items(), key=lambda item: _chave_temporada(item[0]))
+
+    def faltando(self):
+        """
+        Episódios faltando: [(temporada, episodio)] entre 1 e o maior episódio
+        de cada temporada. Os especiais (temporada 0) não entram.
+        """
+        faltando = []
+        for temporada, numeros in self._ordenadas():
+            if temporada == 0:
+                continue
+            faltando.extend((temporada, numero) for numero in range(1, max(numeros) + 1) if numero not in numeros)
+        return faltando
+
+    def repetidos(self):
+        """Episódios com mais de um arquivo: [(temporada, episodio, [arquivos])]."""
+        return [
+            (temporada, numero, arquivos)
+            for temporada, numeros in self._ordenadas()
+            for numero, arquivos in sorted(numeros.items())
+            if len(arquivos) > 1
+        ]
+
+    def linhas_resumo(self, faltando=None, repetidos=None):
+        """
+        Linhas do resumo da série no TXT/PDF: temporadas, episódios faltando,
+        repetidos e arquivos não reconhecidos (só as que tiverem o que mostrar).
+        faltando/repetidos podem ser passados se já foram calculados.
+        """
+        if not self.temporadas:
+            return []
+        faltando = self.faltando() if faltando is None else faltando
+        repetidos = self.repetidos() if repetidos is None else repetidos
+        linhas = []
+
+        if any(temporada is not None for temporada in self.temporadas):
+            linhas.append("Temporadas: " + ', '.join(
+                f"T{temporada:02d} ({len(numeros)})" if temporada is not None else f"sem temporada ({len(numeros)})"
+                for temporada, numeros in self._ordenadas()
+            ))
+
+        if faltando:
+            rotulos = []
+            por_temporada = {}
+            for temporada, numero in faltando:
+                por_temporada.setdefault(temporada, []).append(numero)
+            for temporada, numeros in sorted(por_temporada.items(), key=lambda item: _chave_temporada(item[0])):
+                for inicio, fim in _agrupar_intervalos(numeros):
+                    rotulo = rotulo_episodio(temporada, inicio)
+                    rotulos.append(rotulo if inicio == fim else f"{rotulo}-E{fim:02d}")
+            linhas.append(f"Faltando ({len(faltando)}): {_limitar(rotulos)}")
+
+        if repetidos:
+            linhas.append(f"Repetidos ({len(repetidos)}): " + _limitar([
+                f"{rotulo_episodio(temporada, numero)} ({len(arquivos)} arquivos)"
+                for temporada, numero, arquivos in repetidos
+            ]))
+
+        if self.nao_reconhecidos:
+            linhas.append(f"Sem número de episódio: {len(self.nao_reconhecidos)} arquivo(s)")
+        return linhas
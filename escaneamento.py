@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor de escaneamento compartilhado por list_filmes.py, list_series.py e
+find_duplicados.py.
+
+Cada diretório é lido exatamente uma vez com os.scandir. O tipo da entrada
+(pasta/arquivo) e os dados de stat vêm do DirEntry, que já os traz em cache
+da própria listagem (no Windows o stat completo; no Linux o tipo via d_type),
+evitando uma chamada de sistema extra por arquivo em compartilhamentos de rede.
+
+Com profundidade > 0 as subpastas de cada pasta de título também são lidas
+(`Série/Temporada 1/S01E01.mkv`), uma pilha de diretórios de cada vez, também
+com um scandir por diretório. Os arquivos das subpastas vêm com o nome
+relativo à pasta de título (`Temporada 1/S01E01.mkv`). Subpastas cujo nome (ou
+caminho relativo) casa com um dos globs de exclusão (`Extras`, `Sample*`) são
+podadas antes de serem abertas, e links simbólicos/junções só são seguidos se
+apontarem para fora da pasta de título e para um destino ainda não visitado,
+o que impede laços.
+"""
+
+import os
+import re
+import fnmatch
+from functools import lru_cache
+
+# Subpastas ignoradas por padrão no escaneamento recursivo (globs, sem diferenciar maiúsculas).
+# Pastas de legendas (`Subs`, `Subtitles`) são lidas, para que as legendas entrem na contagem.
+EXCLUSOES_PADRAO = ('Extras', 'Featurettes', 'Behind The Scenes', 'Deleted Scenes', 'Sample', 'Samples',
+                    'Trailers', '.*', '@eaDir', '$RECYCLE.BIN', 'System Volume Information')
+
+
+def listar_pastas(diretorio_base):
+    """
+    Lista as subpastas de um diretório numa única leitura.
+
+    Returns:
+        Lista de os.DirEntry, na ordem devolvida pelo sistema de arquivos
+    """
+    pastas = []
+    with os.scandir(diretorio_base) as entradas:
+        for entrada in entradas:
+            try:
+                if entrada.is_dir():
+                    pastas.append(entrada)
+            except OSError:
+                continue
+    return pastas
+
+
+@lru_cache(maxsize=None)
+def _compilar_exclusoes(globs):
+    """Uma única expressão para todos os globs (casada com o nome e com o caminho relativo)."""
+    if not globs:
+        return None
+    return re.compile('|'.join(fnmatch.translate(glob) for glob in globs), re.IGNORECASE).match
+
+
+def _e_link(entrada):
+    """Link simbólico ou junção do Windows (is_junction só existe a partir do Python 3.12)."""
+    return entrada.is_symlink() or getattr(entrada, 'is_junction', bool)()
+
+
+def _seguir_link(entrada, raiz_real, links_visitados):
+    """
+    Decide se um link para pasta deve ser seguido: não se apontar para dentro
+    da pasta de título (ou para ela mesma, um laço) nem para um destino já visitado.
+    """
+    alvo = os.path.realpath(entrada.path)
+    if alvo == raiz_real or alvo.startswith(raiz_real + os.sep) or raiz_real.startswith(alvo + os.sep):
+        return False
+    if alvo in links_visitados:
+        return False
+    links_visitados.add(alvo)
+    return True
+
+
+def escanear_pasta(caminho_pasta, filtro=None, com_tamanho=False, profundidade=0, excluir=(), subpastas=None):
+    """
+    Lê uma pasta de título uma única vez e devolve os arquivos aceitos pelo filtro.
+
+    Args:
+        caminho_pasta: Caminho da pasta (str ou os.DirEntry)
+        filtro: Função que recebe o nome do arquivo e retorna True para mantê-lo
+        com_tamanho: Se True, lê o tamanho e o mtime de cada arquivo pelo stat em cache do DirEntry
+        profundidade: Níveis de subpastas lidos abaixo da pasta (0 = só a própria pasta)
+        excluir: Globs de subpastas que não são lidas (ex.: EXCLUSOES_PADRAO)
+        subpastas: Lista opcional que recebe (caminho_relativo, mtime_ns) de
+                   cada subpasta lida (usada pelo cache de escaneamento)
+
+    Returns:
+        Tupla (arquivos, erros):
+        - arquivos: [(caminho_completo, nome_arquivo, tamanho, mtime_ns)] (tamanho e
+          mtime_ns são None se com_tamanho=False); nas subpastas, nome_arquivo
+          é o caminho relativo à pasta (`Temporada 1/S01E01.mkv`)
+        - erros: [(nome_arquivo, excecao)] para arquivos cujo stat falhou ou
+          subpastas que não puderam ser lidas
+
+    Erros ao abrir a própria pasta (ex.: PermissionError) são propagados.
+    """
+    arquivos = []
+    erros = []
+    excluida = _compilar_exclusoes(tuple(excluir)) if profundidade > 0 else None
+    raiz_real = links_visitados = None
+    pendentes = [(caminho_pasta, '', 0)]
+    while pendentes:
+        caminho, relativo, nivel = pendentes.pop()
+        try:
+            listagem = os.scandir(caminho)
+        except OSError as e:
+            if not relativo:
+                raise
+            erros.append((relativo, e))
+            continue
+        with listagem as entradas:
+            for entrada in entradas:
+                nome = entrada.name
+                nome_relativo = os.path.join(relativo, nome) if relativo else nome
+                if nivel < profundidade:
+                    try:
+                        e_pasta = entrada.is_dir()
+                    except OSError:
+                        e_pasta = False
+                    if e_pasta:
+                        if excluida is not None and (excluida(nome) or excluida(nome_relativo.replace(os.sep, '/'))):
+                            continue
+                        if _e_link(entrada):
+                            if raiz_real is None:
+                                raiz_real, links_visitados = os.path.realpath(caminho_pasta), set()
+                            if not _seguir_link(entrada, raiz_real, links_visitados):
+                                continue
+                        if subpastas is not None:
+                            try:
+                                subpastas.append((nome_relativo, entrada.stat().st_mtime_ns))
+                            except OSError as e:
+                                erros.append((nome_relativo, e))
+                                continue
+                        pendentes.append((entrada.path, nome_relativo, nivel + 1))
+                        continue
+                if filtro is not None and not filtro(nome):
+                    continue
+                try:
+                    if not entrada.is_file():
+                        continue
+                    if com_tamanho:
+                        info = entrada.stat()
+                        tamanho, mtime_ns = info.st_size, info.st_mtime_ns
+                    else:
+                        tamanho = mtime_ns = None
+                except OSError as e:
+                    erros.append((nome_relativo, e))
+                    continue
+                arquivos.append((entrada.path, nome_relativo, tamanho, mtime_ns))
+    return arquivos, erros
+
+
+def _escanear_pasta_protegido(pasta, filtro, com_tamanho, profundidade=0, excluir=(), subpastas=None):
+    """Executa escanear_pasta capturando a exceção para devolvê-la ao chamador."""
+    lista_subpastas = None
+    if subpastas is not None and profundidade > 0:
+        lista_subpastas = subpastas[os.path.basename(os.fspath(pasta))] = []
+    try:
+        arquivos, erros = escanear_pasta(pasta, filtro=filtro, com_tamanho=com_tamanho, profundidade=profundidade,
+                                         excluir=excluir, subpastas=lista_subpastas)
+        return arquivos, erros, None
+    except Exception as e:
+        return [], [], e
+
+
+def escanear_pastas(pastas, filtro=None, com_tamanho=False, workers=1, profundidade=0, excluir=(), subpastas=None):
+    """
+    Escaneia várias pastas de título, em série ou com um pool limitado de threads.
+
+    Em compartilhamentos de rede quase todo o tempo é espera de I/O, então
+    listar várias pastas ao mesmo tempo esconde a latência. Os resultados são
+    sempre entregues na ordem de `pastas`, de modo que a saída é idêntica à de
+    uma execução serial independentemente de quantos workers forem usados.
+
+    Args:
+        pastas: Pastas (os.DirEntry ou caminhos), em qualquer iterável
+        filtro: Função que recebe o nome do arquivo e retorna True para mantê-lo
+        com_tamanho: Se True, inclui o tamanho e o mtime de cada arquivo
+        workers: Número máximo de threads (1 = serial)
+        profundidade, excluir: Escaneamento recursivo (ver escanear_pasta)
+        subpastas: dict opcional preenchido com {nome_pasta: [(caminho_relativo, mtime_ns)]}
+
+    Yields:
+        Tuplas (pasta, arquivos, erros, excecao), onde excecao é a exceção
+        levantada ao abrir a pasta (ou None) e arquivos/erros seguem escanear_pasta
+    """
+    if workers <= 1:
+        for pasta in pastas:
+            yield (pasta,) + _escanear_pasta_protegido(pasta, filtro, com_tamanho, profundidade, excluir, subpastas)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    # pastas é percorrida duas vezes (map e zip): um gerador chegaria vazio ao zip
+    pastas = list(pastas)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        resultados = executor.map(
+            lambda pasta: _escanear_pasta_protegido(pasta, filtro, com_tamanho, profundidade, excluir, subpastas),
+            pastas
+        )
+        for pasta, resultado in zip(pastas, resultados):
+            yield (pasta,) + resultado
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Exportação das listas de filmes e séries em JSON compacto para o site
+(script.js), lido com JSON.parse em vez do parser do TXT.
+
+Cada lista é gravada como um manifesto pequeno (lista_filmes.json /
+lista_series.json) mais partes em DIRETORIO_PARTES, com o nome formado pelo
+hash do conteúdo (`dados/filmes-a-3f2c9e0b1d4a5c6e.json`). Uma parte que não
+mudou mantém o nome e o navegador (ou o CDN) pode guardá-la para sempre; a
+cada exportação as partes que deixaram de ser usadas são removidas.
+
+- Filmes (gravar_lista_por_letra): uma parte por sequência de pastas com a
+  mesma letra inicial (sem acento), então incluir um filme só muda a parte da
+  sua letra. Manifesto:
+      {"total": N,
+       "partes": [{"letra": "a", "total": 120, "parte": "dados/filmes-a-<hash>"}, ...]}
+  e cada parte: [[nome_pasta, [arquivos]], ...]
+- Séries (gravar_lista_por_pasta): o manifesto traz nome e quantidade de
+  episódios de cada série, e os episódios ficam numa parte por série,
+  baixada só quando a série é aberta na página:
+      {"total": N, "total_episodios": M,
+       "series": [[nome_serie, 10, "dados/series-<hash>"], ...]}
+  e cada parte: [episodios]
+
+Os caminhos das partes no manifesto não têm a extensão .json. Tudo é
+gravado sem espaços e em UTF-8 sem escapes, e as entradas são processadas
+uma a uma, então a exportação funciona também com a OrdenacaoExterna do
+modo --streaming. O manifesto não tem data (ela fica em geracao.json, ver
+gravacao.py) e só é regravado, junto com as cópias comprimidas, quando o
+conteúdo muda.
+
+Opcionalmente são gravadas cópias pré-comprimidas ao lado de cada JSON:
+`.json.gz` (gzip, da biblioteca padrão, que o site descomprime com
+DecompressionStream) e `.json.br` (brotli, se o pacote opcional `brotli`
+estiver instalado, para servidores que entregam arquivos pré-comprimidos).
+"""
+
+import os
+import gzip
+import json
+import shutil
+import hashlib
+
+from titulos import normalizar_texto
+from gravacao import Gravacao
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tamanho dos blocos lidos na compressão
+TAMANHO_BLOCO_COMPRESSAO = 1024 * 1024
+
+# Pasta das partes, relativa ao manifesto
+DIRETORIO_PARTES = 'dados'
+
+# Caracteres do hash (sha256) no nome das partes
+TAMANHO_HASH_PARTE = 16
+
+# Extensões das cópias comprimidas
+EXTENSOES_COMPRESSAO = {'gzip': '.gz', 'brotli': '.br'}
+COMPRESSOES = tuple(EXTENSOES_COMPRESSAO)
+
+
+def _json(valor):
+    return json.dumps(valor, ensure_ascii=False, separators=(',', ':'))
+
+
+def comprimir_gzip(arquivo, arquivo_saida):
+    # mtime=0 e sem nome no cabeçalho: o .gz só muda se o conteúdo mudar
+    with open(arquivo, 'rb') as origem, open(arquivo_saida, 'wb') as destino:
+        with gzip.GzipFile(filename='', mode='wb', compresslevel=9, fileobj=destino, mtime=0) as comprimido:
+            shutil.copyfileobj(origem, comprimido, TAMANHO_BLOCO_COMPRESSAO)
+
+
+def comprimir_brotli(arquivo, arquivo_saida):
+    compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=11)
+    with open(arquivo, 'rb') as origem, open(arquivo_saida, 'wb') as destino:
+        for bloco in iter(lambda: origem.read(TAMANHO_BLOCO_COMPRESSAO), b''):
+            destino.write(compressor.process(bloco))
+        destino.write(compressor.finish())
+
+
+def gravar_copias_comprimidas(arquivo, compressoes, faltando=False):
+    """
+    Grava as cópias comprimidas de um arquivo ao lado dele.
+
+    Args:
+        arquivo: Arquivo a comprimir
+        compressoes: Entre 'gzip' (.gz) e 'brotli' (.br)
+        faltando: Grava só as cópias que ainda não existem (para arquivos
+                  que não mudaram, como as partes com o mesmo nome)
+
+    Returns:
+        Lista com os caminhos das cópias gravadas
+    """
+    gravados = []
+    for compressao in compressoes:
+        if faltando and os.path.exists(arquivo + EXTENSOES_COMPRESSAO[compressao]):
+            continue
+        if compressao == 'brotli' and brotli is None:
+            print("  [AVISO] Cópia .br não gerada. Instale brotli (pip install brotli) para gerá-la.")
+            continue
+        arquivo_comprimido = arquivo + EXTENSOES_COMPRESSAO[compressao]
+        (comprimir_brotli if compressao == 'brotli' else comprimir_gzip)(arquivo, arquivo_comprimido)
+        gravados.append(arquivo_comprimido)
+    return gravados
+
+
+def letra_inicial(nome):
+    """Letra inicial do nome sem acento ('a' a 'z'), ou '0' para números e símbolos."""
+    normalizado = normalizar_texto(nome)[:1]
+    return normalizado if 'a' <= normalizado <= 'z' else '0'
+
+
+class GravadorPartes:
+    """
+    Grava as partes de uma lista em DIRETORIO_PARTES com nomes pelo hash do
+    conteúdo e, em concluir(), remove as partes antigas do mesmo prefixo.
+    """
+
+    def __init__(self, diretorio_saida, prefixo, compressoes=()):
+        self.diretorio = os.path.join(diretorio_saida, DIRETORIO_PARTES)
+        self.prefixo = prefixo
+        # Sem o pacote brotli, o aviso sai uma vez só (na gravação do manifesto)
+        self.compressoes = [c for c in compressoes if c != 'brotli' or brotli is not None]
+        self.usadas = set()
+        self.novas = 0
+        os.makedirs(self.diretorio, exist_ok=True)
+
+    def gravar(self, dados, sufixo=''):
+        """
+        Grava uma parte (se ainda não existe) e retorna o seu caminho no
+        manifesto, relativo e sem extensão.
+        """
+        conteudo = _json(dados).encode('utf-8')
+        nome = '-'.join(filter(None, [self.prefixo, sufixo, hashlib.sha256(conteudo).hexdigest()[:TAMANHO_HASH_PARTE]]))
+        caminho = os.path.join(self.diretorio, nome + '.json')
+        if not os.path.exists(caminho):
+            with open(caminho, 'wb') as f:
+                f.write(conteudo)
+            self.novas += 1
+        gravar_copias_comprimidas(caminho, self.compressoes, faltando=True)
+        self.usadas.add(nome + '.json')
+        return f"{DIRETORIO_PARTES}/{nome}"
+
+    def concluir(self):
+        """Remove as partes (e cópias comprimidas) do prefixo que não foram usadas."""
+        removidas = 0
+        for arquivo in os.listdir(self.diretorio):
+            base = arquivo
+            for extensao in EXTENSOES_COMPRESSAO.values():
+                if base.endswith('.json' + extensao):
+                    base = base[:-len(extensao)]
+            if base.startswith(self.prefixo + '-') and base.endswith('.json') and base not in self.usadas:
+                os.remove(os.path.join(self.diretorio, arquivo))
+                if arquivo == base:
+                    removidas += 1
+        return removidas
+
+
+def gravar_json(arquivo_saida, valor, compressoes=()):
+    """
+    Grava um JSON compacto (só se o conteúdo mudou) e as cópias comprimidas,
+    refeitas só quando o JSON mudou ou ainda não existem.
+
+    Returns:
+        (lista com o JSON e as cópias, True se o JSON mudou)
+    """
+    with Gravacao(arquivo_saida) as gravacao, gravacao.abrir('w', encoding='utf-8') as f:
+        f.write(_json(valor))
+    copias = gravar_copias_comprimidas(arquivo_saida, compressoes, faltando=not gravacao.mudou)
+    return [arquivo_saida] + copias, gravacao.mudou
+
+
+def _resumo(gravados, mudou, partes, gravador, removidas):
+    return {'arquivos': gravados, 'mudou': mudou, 'partes': partes, 'novas': gravador.novas, 'removidas': removidas}
+
+
+def gravar_lista_por_letra(arquivo_saida, metadados, prefixo, entradas, compressoes=()):
+    """
+    Grava o manifesto e uma parte por sequência de pastas com a mesma letra inicial.
+
+    Args:
+        arquivo_saida: Caminho do manifesto (.json); as partes vão para
+                       DIRETORIO_PARTES ao lado dele
+        metadados: Dict com os campos do manifesto (total, data, ...)
+        prefixo: Prefixo do nome das partes ('filmes')
+        entradas: Iterável de (nome_pasta, [arquivos]) em ordem
+        compressoes: Cópias comprimidas a gravar, entre 'gzip' e 'brotli'
+
+    Returns:
+        Dict com 'arquivos' (manifesto e cópias), 'mudou' (se o manifesto
+        mudou), 'partes', 'novas' e 'removidas'
+    """
+    gravador = GravadorPartes(os.path.dirname(arquivo_saida) or '.', prefixo, compressoes)
+    partes = []
+    letra_atual, bloco = None, []
+
+    def fechar_bloco():
+        if bloco:
+            partes.append({'letra': letra_atual, 'total': len(bloco), 'parte': gravador.gravar(bloco, letra_atual)})
+
+    for nome, arquivos in entradas:
+        letra = letra_inicial(nome)
+        if letra != letra_atual:
+            fechar_bloco()
+            letra_atual, bloco = letra, []
+        bloco.append([nome, list(arquivos)])
+    fechar_bloco()
+
+    removidas = gravador.concluir()
+    gravados, mudou = gravar_json(arquivo_saida, dict(metadados, partes=partes), compressoes)
+    return _resumo(gravados, mudou, len(partes), gravador, removidas)
+
+
+def gravar_lista_por_pasta(arquivo_saida, metadados, chave, entradas, compressoes=()):
+    """
+    Grava o manifesto com nome e quantidade de arquivos de cada pasta e uma
+    parte com os arquivos de cada pasta.
+
+    Args:
+        arquivo_saida: Caminho do manifesto (.json); as partes vão para
+                       DIRETORIO_PARTES ao lado dele
+        metadados: Dict com os campos do manifesto (total, data, ...)
+        chave: Nome do campo da lista no manifesto, usado também como
+               prefixo das partes ('series')
+        entradas: Iterável de (nome_pasta, [arquivos]) em ordem
+        compressoes: Cópias comprimidas a gravar, entre 'gzip' e 'brotli'
+
+    Returns:
+        Dict com 'arquivos' (manifesto e cópias), 'mudou' (se o manifesto
+        mudou), 'partes', 'novas' e 'removidas'
+    """
+    gravador = GravadorPartes(os.path.dirname(arquivo_saida) or '.', chave, compressoes)
+    lista = [[nome, len(arquivos), gravador.gravar(list(arquivos))] for nome, arquivos in entradas]
+    removidas = gravador.concluir()
+    gravados, mudou = gravar_json(arquivo_saida, dict(metadados, **{chave: lista}), compressoes)
+    return _resumo(gravados, mudou, len(lista), gravador, removidas)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classificação dos arquivos pela extensão, compartilhada por list_filmes.py,
+list_series.py e find_duplicados.py.
+
+A extensão é o que vem depois do último ponto do nome, achada com um único
+rfind e comparada em casefold com as tabelas abaixo, sem criar um Path por
+entrada do diretório. Extensões com hífen como `.dvr-ms` ficam inteiras, e
+nomes com vários pontos (`Filme.2010.1080p.mkv`, `Filme.pt-BR.forced.srt`)
+valem pela última. Como em Path.suffix, um nome que começa com ponto
+(`.mkv`) ou termina nele não tem extensão.
+
+Além dos vídeos, legendas (`.srt`, `.ass`, ...) e arquivos acessórios
+(`.nfo`) são reconhecidos, para que os listadores possam contá-los por título
+em vez de descartá-los. As contagens saem só no console (linha de progresso
+de cada título e total do escaneamento); as listas TXT, PDF e JSON continuam
+trazendo apenas os vídeos.
+
+O ganho sobre a versão com Path está em benchmarks/bench_extensoes.py.
+"""
+
+import os
+
+# Classes devolvidas por classificar
+VIDEO = 'video'
+LEGENDA = 'legenda'
+ACESSORIO = 'acessorio'
+
+# Formatos de vídeo suportados (lista completa)
+FORMATOS_VIDEO = frozenset({
+    # Formatos MPEG
+    '.mp4', '.m4v', '.mpg', '.mpeg', '.m1v', '.m2v', '.mpv', '.mpv2', '.mp4v',
+    # Formatos AVI e DivX
+    '.avi', '.divx', '.xvid',
+    # Formatos Matroska
+    '.mkv', '.mk3d', '.mka',
+    # Formatos QuickTime/Apple
+    '.mov', '.qt',
+    # Formatos Windows Media
+    '.wmv', '.wmvhd', '.asf',
+    # Formatos Flash
+    '.flv', '.f4v', '.swf',
+    # Formatos Web
+    '.webm', '.ogv', '.ogm',
+    # Formatos RealMedia
+    '.rm', '.rmvb', '.ra', '.ram', '.rv',
+    # Formatos de transmissão/streaming
+    '.ts', '.m2ts', '.mts', '.trp', '.tp',
+    # Formatos de vídeo bruto
+    '.yuv', '.y4m', '.raw', '.ycbcr', '.rgb', '.rgba',
+    # Formatos de container
+    '.nut',
+    # Formatos de disco
+    '.vob', '.vro', '.dat', '.bik', '.smk',
+    # Formatos de gravação
+    '.dvr-ms', '.wtv', '.pvr',
+    # Formatos de celular
+    '.3gp', '.3g2', '.amv', '.dmv',
+    # Formatos de codec específicos
+    '.h264', '.h265', '.hevc', '.264', '.265', '.avc', '.vc1', '.vp8', '.vp9', '.av1',
+    # Formatos Microsoft
+    '.mxf', '.wv',
+    # Formatos diversos
+    '.nsv', '.roq', '.svi', '.uvu', '.viv', '.xesc', '.gifv'
+})
+
+# Legendas (texto e imagem)
+FORMATOS_LEGENDA = frozenset({'.srt', '.sub', '.idx', '.ass', '.ssa', '.vtt', '.smi', '.sup', '.usf'})
+
+# Arquivos acessórios guardados junto do vídeo
+FORMATOS_ACESSORIO = frozenset({'.nfo'})
+
+_CLASSES = dict.fromkeys(FORMATOS_VIDEO, VIDEO)
+_CLASSES.update(dict.fromkeys(FORMATOS_LEGENDA, LEGENDA))
+_CLASSES.update(dict.fromkeys(FORMATOS_ACESSORIO, ACESSORIO))
+
+# Caracteres que encerram o nome do arquivo num caminho relativo (`Temporada 1/.nfo`)
+_SEPARADORES = frozenset({'/', os.sep})
+
+
+def extensao(nome):
+    """Extensão do nome em casefold, com o ponto (`.mkv`), ou '' se não houver."""
+    ponto = nome.rfind('.')
+    if ponto <= 0 or nome[ponto - 1] in _SEPARADORES:
+        return ''
+    return nome[ponto:].casefold()
+
+
+def classificar(nome):
+    """Classe do arquivo pela extensão: VIDEO, LEGENDA, ACESSORIO ou None."""
+    ponto = nome.rfind('.')
+    if ponto <= 0 or nome[ponto - 1] in _SEPARADORES:
+        return None
+    return _CLASSES.get(nome[ponto:].casefold())
+
+
+def is_arquivo_video(nome):
+    """Verifica se o arquivo é um vídeo baseado na extensão (nome ou caminho em str)."""
+    ponto = nome.rfind('.')
+    return ponto > 0 and nome[ponto - 1] not in _SEPARADORES and nome[ponto:].casefold() in FORMATOS_VIDEO
+
+
+def separar_por_classe(nomes):
+    """
+    Separa os nomes de uma pasta numa única passada.
+
+    Returns:
+        dict {VIDEO: [...], LEGENDA: [...], ACESSORIO: [...]} na ordem de
+        `nomes` (os demais arquivos são ignorados)
+    """
+    por_classe = {VIDEO: [], LEGENDA: [], ACESSORIO: []}
+    for nome in nomes:
+        classe = classificar(nome)
+        if classe is not None:
+            por_classe[classe].append(nome)
+    return por_classe
+
+
+def descrever_extras(por_classe):
+    """`, 2 legenda(s), 1 acessório(s)` para a linha de progresso ('' se não houver)."""
+    partes = ''
+    if por_classe[LEGENDA]:
+        partes += f", {len(por_classe[LEGENDA])} legenda(s)"
+    if por_classe[ACESSORIO]:
+        partes += f", {len(por_classe[ACESSORIO])} acessório(s)"
+    return partes
@@ -8,179 +8,495 @@ Compara arquivos por nome e por hash MD5 para detectar duplicatas exatas.
 import os
 import sys
 import time
+import itertools
 from pathlib import Path
-from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, Counter
 
-# Configurar encoding UTF-8 para Windows
+from escaneamento import listar_pastas, escanear_pastas, EXCLUSOES_PADRAO
+from extensoes import is_arquivo_video
+from catalogo import Catalogo, DESCONHECIDO
+from gravacao import Gravacao, ARQUIVO_METADADOS_RELATORIOS
+from banco_catalogo import BancoCatalogo, ARQUIVO_CATALOGO
+from hash_arquivos import hash_parcial, hash_completo
+from cache_hashes import CacheHashes, ARQUIVO_CACHE_HASHES
+from titulos import extrair_titulo_ano, agrupar_titulos_semelhantes
+from metadados_video import (ler_metadados_arquivos, descrever_metadados, rotulo_resolucao, formatar_duracao,
+                             ARQUIVO_CACHE_METADADOS)
+
+# Configurar encoding UTF-8 para Windows (reconfigure no lugar de um novo
+# TextIOWrapper: os scripts são importados juntos por biblioteca.py)
 if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
-
-# Formatos de vídeo suportados (lista completa)
-FORMATOS_VIDEO = {
-    # Formatos MPEG
-    '.mp4', '.m4v', '.mpg', '.mpeg', '.m1v', '.m2v', '.mpv', '.mpv2', '.mp4v',
-    # Formatos AVI e DivX
-    '.avi', '.divx', '.xvid',
-    # Formatos Matroska
-    '.mkv', '.mk3d', '.mka',
-    # Formatos QuickTime/Apple
-    '.mov', '.qt',
-    # Formatos Windows Media
-    '.wmv', '.wmvhd', '.asf',
-    # Formatos Flash
-    '.flv', '.f4v', '.swf',
-    # Formatos Web
-    '.webm', '.ogv', '.ogm',
-    # Formatos RealMedia
-    '.rm', '.rmvb', '.ra', '.ram', '.rv',
-    # Formatos de transmissão/streaming
-    '.ts', '.m2ts', '.mts', '.trp', '.tp',
-    # Formatos de vídeo bruto
-    '.yuv', '.y4m', '.raw', '.ycbcr', '.rgb', '.rgba',
-    # Formatos de container
-    '.nut',
-    # Formatos de disco
-    '.vob', '.vro', '.dat', '.bik', '.smk',
-    # Formatos de gravação
-    '.dvr-ms', '.wtv', '.pvr',
-    # Formatos de celular
-    '.3gp', '.3g2', '.amv', '.dmv',
-    # Formatos de codec específicos
-    '.h264', '.h265', '.hevc', '.264', '.265', '.avc', '.vc1', '.vp8', '.vp9', '.av1',
-    # Formatos Microsoft
-    '.mxf', '.wv',
-    # Formatos diversos
-    '.nsv', '.roq', '.svi', '.uvu', '.viv', '.xesc', '.gifv'
-}
-
-
-def is_arquivo_video(arquivo):
-    """Verifica se o arquivo é um vídeo baseado na extensão."""
-    return Path(arquivo).suffix.lower() in FORMATOS_VIDEO
-
-
-def escanear_arquivos(diretorio_base, tipo='filmes'):
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+# Buffer de escrita dos relatórios TXT e CSV
+TAMANHO_BUFFER_ESCRITA = 1024 * 1024
+
+# Arquivos com hash concluído entre duas atualizações da linha de progresso
+INTERVALO_PROGRESSO_HASHES = 50
+
+
+def escanear_arquivos(diretorio_base, tipo='filmes', workers=1, profundidade=0, excluir=()):
     """
     Escaneia o diretório e retorna informações sobre todos os arquivos de vídeo.
     
     Args:
         diretorio_base: Caminho do diretório base
         tipo: Tipo de conteúdo ('filmes' ou 'series')
+        workers: Número de threads para listar as pastas em paralelo (1 = serial).
+                 A ordem do resultado é a mesma de uma execução serial.
+        profundidade: Níveis de subpastas lidos dentro de cada pasta (0 = só a pasta);
+                      os arquivos das subpastas vêm com o nome relativo à pasta
+        excluir: Globs de subpastas ignoradas com profundidade > 0
     
     Returns:
-        Lista de tuplas: [(caminho_completo, nome_arquivo, nome_pasta, tamanho)]
+        Catalogo com os arquivos de vídeo de cada pasta (tamanho e mtime incluídos)
     """
-    arquivos_encontrados = []
+    catalogo = Catalogo(diretorio_base)
     diretorio = Path(diretorio_base)
     
     if not diretorio.exists():
         print(f"  [AVISO] Diretório não encontrado: {diretorio_base}")
-        return arquivos_encontrados
+        return catalogo
     
-    print(f"Escaneando {tipo}: {diretorio_base}")
+    print(f"Escaneando {tipo}: {diretorio_base}" + (f" ({workers} workers)" if workers > 1 else ""))
     sys.stdout.flush()
     
-    # Contar total de pastas primeiro
+    # Listar as pastas uma única vez (a mesma listagem serve para contar e processar)
     try:
         print(f"  Listando pastas...", end='')
         sys.stdout.flush()
-        pastas = [item for item in diretorio.iterdir() if item.is_dir()]
+        pastas = listar_pastas(diretorio)
         total_pastas = len(pastas)
         print(f"  Total de pastas encontradas: {total_pastas}")
         sys.stdout.flush()
     except Exception as e:
         print(f"\n  [ERRO] Erro ao contar pastas: {e}")
         sys.stdout.flush()
-        return arquivos_encontrados
+        return catalogo
     
     # Percorre todas as pastas no diretório base
     pastas_processadas = 0
     inicio = time.time()
     
-    for item in diretorio.iterdir():
-        if item.is_dir():
-            nome_pasta = item.name
-            pastas_processadas += 1
-            
-            # Procura arquivos de vídeo na pasta
-            try:
-                for arquivo in item.iterdir():
-                    if arquivo.is_file() and is_arquivo_video(arquivo):
-                        try:
-                            tamanho = arquivo.stat().st_size
-                            arquivos_encontrados.append((
-                                str(arquivo),
-                                arquivo.name,
-                                nome_pasta,
-                                tamanho
-                            ))
-                        except (OSError, PermissionError) as e:
-                            print(f"\n  [AVISO] Erro ao acessar {arquivo.name}: {e}")
-                
-                # Mostrar progresso a cada 10 pastas ou na última
-                if pastas_processadas % 10 == 0 or pastas_processadas == total_pastas:
-                    porcentagem = (pastas_processadas / total_pastas) * 100
-                    print(f"  Progresso: {pastas_processadas}/{total_pastas} pastas ({porcentagem:.1f}%) - {len(arquivos_encontrados)} arquivos encontrados", end='\r')
-                    sys.stdout.flush()
+    resultados = escanear_pastas(pastas, filtro=is_arquivo_video, com_tamanho=True, workers=workers,
+                                 profundidade=profundidade, excluir=excluir)
+    for item, arquivos, erros, excecao in resultados:
+        nome_pasta = item.name
+        pastas_processadas += 1
+        
+        # Procura arquivos de vídeo na pasta
+        try:
+            if excecao is not None:
+                raise excecao
+            if arquivos:
+                catalogo.adicionar_pasta(
+                    nome_pasta,
+                    [nome_arquivo for _, nome_arquivo, _, _ in arquivos],
+                    [tamanho for _, _, tamanho, _ in arquivos],
+                    [mtime_ns for _, _, _, mtime_ns in arquivos],
+                )
+            for nome_arquivo, e in erros:
+                print(f"\n  [AVISO] Erro ao acessar {nome_arquivo}: {e}")
             
-            except PermissionError:
-                print(f"\n  [ERRO] Erro de permissão ao acessar: {nome_pasta}")
-            except Exception as e:
-                print(f"\n  [ERRO] Erro ao processar {nome_pasta}: {e}")
+            # Mostrar progresso a cada 10 pastas ou na última
+            if pastas_processadas % 10 == 0 or pastas_processadas == total_pastas:
+                porcentagem = (pastas_processadas / total_pastas) * 100
+                print(f"  Progresso: {pastas_processadas}/{total_pastas} pastas ({porcentagem:.1f}%) - {catalogo.total_arquivos} arquivos encontrados", end='\r')
+                sys.stdout.flush()
+        
+        except PermissionError:
+            print(f"\n  [ERRO] Erro de permissão ao acessar: {nome_pasta}")
+        except Exception as e:
+            print(f"\n  [ERRO] Erro ao processar {nome_pasta}: {e}")
     
     tempo_decorrido = time.time() - inicio
-    print(f"\n  [OK] {len(arquivos_encontrados)} arquivo(s) encontrado(s) em {tipo} ({tempo_decorrido:.1f}s)")
+    print(f"\n  [OK] {catalogo.total_arquivos} arquivo(s) encontrado(s) em {tipo} ({tempo_decorrido:.1f}s)")
     sys.stdout.flush()
-    return arquivos_encontrados
+    return catalogo
+
+
+def completar_tamanhos(banco, catalogos):
+    """
+    Lê do disco o tamanho e o mtime dos arquivos que o catálogo guarda sem
+    eles (DESCONHECIDO): list_filmes.py e list_series.py gravam só os nomes.
+    
+    Só esses arquivos custam um os.stat, e os tamanhos preenchidos voltam
+    para o banco, então a próxima execução com --do-catalogo não os lê de novo.
+    
+    Args:
+        banco: BancoCatalogo de onde os catálogos foram carregados
+        catalogos: dict {tipo: Catalogo}
+    
+    Returns:
+        Quantidade de arquivos que continuam sem tamanho (não puderam ser lidos)
+    """
+    sem_tamanho = 0
+    for tipo, catalogo in catalogos.items():
+        nomes, tamanhos, mtimes = catalogo.nomes, catalogo.tamanhos, catalogo.mtimes
+        preenchidos = 0
+        for pasta in catalogo.pastas:
+            for i in range(pasta.inicio, pasta.fim):
+                if tamanhos[i] != DESCONHECIDO:
+                    continue
+                try:
+                    info = os.stat(os.path.join(pasta.caminho, nomes[i]))
+                except OSError:
+                    sem_tamanho += 1
+                    continue
+                tamanhos[i], mtimes[i] = info.st_size, info.st_mtime_ns
+                preenchidos += 1
+        if preenchidos:
+            banco.gravar_catalogo(tipo, catalogo)
+            print(f"  [OK] {preenchidos} tamanho(s) de {tipo} lido(s) do disco (gravados por list_{tipo}.py sem tamanho)")
+    if sem_tamanho:
+        print(f"  [AVISO] {sem_tamanho} arquivo(s) sem tamanho no catálogo e inacessíveis no disco")
+    sys.stdout.flush()
+    return sem_tamanho
 
 
 def encontrar_duplicados_por_nome(arquivos_filmes, arquivos_series):
     """
     Encontra arquivos duplicados por nome (mesmo nome de arquivo).
     
+    Args:
+        arquivos_filmes, arquivos_series: Catalogo de cada diretório base
+    
     Returns:
-        Lista de duplicados: [(nome_arquivo, [lista_caminhos])]
+        dict {nome_arquivo: [(caminho, pasta, tamanho)]}
     """
     print("  Agrupando arquivos por nome...")
     sys.stdout.flush()
     
+    # Agrupar por nome de arquivo (índices no catálogo; os caminhos só são
+    # montados para os grupos que de fato se repetem)
     duplicados = defaultdict(list)
-    todos_arquivos = arquivos_filmes + arquivos_series
-    total_arquivos = len(todos_arquivos)
+    total_arquivos = arquivos_filmes.total_arquivos + arquivos_series.total_arquivos
     processados = 0
     inicio = time.time()
     ultimo_tempo = inicio
     
-    # Agrupar por nome de arquivo
-    for caminho, nome, pasta, tamanho in todos_arquivos:
-        processados += 1
-        duplicados[nome.lower()].append((caminho, pasta, tamanho))
-        
-        # Mostrar progresso a cada 100 arquivos ou a cada segundo
-        tempo_atual = time.time()
-        if processados % 100 == 0 or (tempo_atual - ultimo_tempo) >= 1.0:
-            porcentagem = (processados / total_arquivos) * 100
-            print(f"  Processando: {processados}/{total_arquivos} arquivos ({porcentagem:.1f}%)", end='\r')
-            sys.stdout.flush()
-            ultimo_tempo = tempo_atual
+    for catalogo in (arquivos_filmes, arquivos_series):
+        for indice, nome in enumerate(catalogo.nomes):
+            processados += 1
+            # Arquivos de subpastas (--profundidade) são comparados pelo nome, sem o caminho relativo
+            duplicados[nome.rpartition(os.sep)[2].lower()].append((catalogo, indice))
+            
+            # Mostrar progresso a cada 100 arquivos ou a cada segundo
+            tempo_atual = time.time()
+            if processados % 100 == 0 or (tempo_atual - ultimo_tempo) >= 1.0:
+                porcentagem = (processados / total_arquivos) * 100
+                print(f"  Processando: {processados}/{total_arquivos} arquivos ({porcentagem:.1f}%)", end='\r')
+                sys.stdout.flush()
+                ultimo_tempo = tempo_atual
     
     print(f"\n  Analisando grupos de duplicados...")
     sys.stdout.flush()
     
     # Filtrar apenas os que aparecem mais de uma vez
-    duplicados_por_nome = {
-        nome: caminhos for nome, caminhos in duplicados.items() 
-        if len(caminhos) > 1
-    }
+    duplicados_por_nome = {}
+    for nome, ocorrencias in duplicados.items():
+        if len(ocorrencias) > 1:
+            duplicados_por_nome[nome] = [
+                (catalogo.caminho(indice), catalogo.pastas[catalogo.indices_pasta[indice]].nome,
+                 catalogo.tamanhos[indice])
+                for catalogo, indice in ocorrencias
+            ]
     
     return duplicados_por_nome
 
 
+def _chave_volume(raiz):
+    """
+    Identifica o dispositivo físico de um diretório base, para que Filmes e TV
+    no mesmo disco ou compartilhamento dividam a mesma fila de leitura: a
+    unidade ou o compartilhamento UNC no Windows (`Y:`, `\\\\servidor\\midia`),
+    o st_dev nos demais sistemas (o próprio caminho se o stat falhar).
+    """
+    if os.name == 'nt':
+        return os.path.splitdrive(os.path.abspath(raiz))[0].lower()
+    try:
+        return os.stat(raiz).st_dev
+    except OSError:
+        return raiz
+
+
+def _pipeline_hashes(candidatos, funcao_parcial, funcao_completo, workers_por_volume=1):
+    """
+    Calcula os hashes dos candidatos num pool de threads com escalonamento por volume.
+    
+    Cada volume (dispositivo físico, ver _chave_volume) tem sua própria fila e
+    no máximo `workers_por_volume` threads lendo dele ao mesmo tempo: Filmes e
+    TV em discos diferentes são lidos em paralelo, e no mesmo disco ou
+    compartilhamento não disputam a leitura.
+    As filas são de prioridade por tamanho: arquivos menores saem primeiro, e
+    assim que todos os arquivos de um mesmo tamanho têm o hash parcial o grupo
+    é confirmado ou descartado e, se preciso, já entra na fila do hash completo.
+    
+    Args:
+        candidatos: Lista de (volume, caminho, pasta, tamanho, mtime_ns), todos com
+                    tamanho repetido; volume é a chave de _chave_volume e mtime_ns
+                    vem do escaneamento
+        funcao_parcial: Função (caminho, tamanho, mtime_ns) -> (hash, completo)
+        funcao_completo: Função (caminho, tamanho, mtime_ns) -> hash
+        workers_por_volume: Leitores simultâneos por volume
+    
+    Returns:
+        Tupla (duplicados_por_conteudo, estatisticas), onde estatisticas é
+        {etapa: [arquivos, segundos_somados_dos_workers]}
+    """
+    import queue
+    import threading
+    
+    grupos_tamanho = defaultdict(list)
+    for idx, (volume, caminho, pasta, tamanho, mtime_ns) in enumerate(candidatos):
+        grupos_tamanho[tamanho].append(idx)
+    
+    pendentes_tamanho = {tamanho: len(idxs) for tamanho, idxs in grupos_tamanho.items()}
+    parciais = {}
+    completos = {}
+    grupo_completo_de = {}
+    grupos_completo = {}
+    pendentes_completo = {}
+    confirmados = []
+    estatisticas = {'Hash parcial': [0, 0.0], 'Hash completo': [0, 0.0]}
+    
+    filas = {volume: queue.PriorityQueue() for volume, _, _, _, _ in candidatos}
+    resultados = queue.Queue()
+    sequencia = itertools.count()
+    
+    def enfileirar(estagio, idx):
+        volume, _, _, tamanho, _ = candidatos[idx]
+        filas[volume].put((tamanho, next(sequencia), estagio, idx))
+    
+    def trabalhar(fila):
+        while True:
+            tamanho, _, estagio, idx = fila.get()
+            if estagio is None:
+                return
+            _, caminho, _, _, mtime_ns = candidatos[idx]
+            inicio = time.perf_counter()
+            try:
+                if estagio == 'Hash parcial':
+                    valor = funcao_parcial(caminho, tamanho, mtime_ns)
+                else:
+                    valor = funcao_completo(caminho, tamanho, mtime_ns)
+                erro = None
+            except Exception as e:
+                # Qualquer erro (inclusive do cache SQLite) vira o resultado do
+                # arquivo: se a thread morresse, o laço principal esperaria para sempre
+                valor, erro = None, e
+            resultados.put((estagio, idx, valor, erro, time.perf_counter() - inicio))
+    
+    for idx in range(len(candidatos)):
+        enfileirar('Hash parcial', idx)
+    em_andamento = len(candidatos)
+    
+    threads = []
+    for fila in filas.values():
+        for _ in range(max(1, workers_por_volume)):
+            thread = threading.Thread(target=trabalhar, args=(fila,), daemon=True)
+            thread.start()
+            threads.append(thread)
+    
+    concluidos = 0
+    while em_andamento:
+        estagio, idx, valor, erro, duracao = resultados.get()
+        em_andamento -= 1
+        concluidos += 1
+        estatisticas[estagio][0] += 1
+        estatisticas[estagio][1] += duracao
+        volume, caminho, pasta, tamanho, _ = candidatos[idx]
+        if erro is not None:
+            print(f"\n  [AVISO] Erro ao ler {caminho}: {erro}")
+        
+        if estagio == 'Hash parcial':
+            if erro is None:
+                parciais[idx] = valor
+            pendentes_tamanho[tamanho] -= 1
+            if pendentes_tamanho[tamanho] == 0:
+                # Todos os arquivos deste tamanho prontos: separar pelo hash parcial
+                subgrupos = defaultdict(list)
+                for i in grupos_tamanho[tamanho]:
+                    if i in parciais:
+                        subgrupos[parciais[i]].append(i)
+                for (hash_hex, completo), idxs in subgrupos.items():
+                    if len(idxs) < 2:
+                        continue
+                    if completo:
+                        confirmados.append((hash_hex, idxs))
+                        continue
+                    chave = (tamanho, hash_hex)
+                    grupos_completo[chave] = idxs
+                    pendentes_completo[chave] = len(idxs)
+                    for i in idxs:
+                        grupo_completo_de[i] = chave
+                        enfileirar('Hash completo', i)
+                        em_andamento += 1
+        else:
+            if erro is None:
+                completos[idx] = valor
+            chave = grupo_completo_de[idx]
+            pendentes_completo[chave] -= 1
+            if pendentes_completo[chave] == 0:
+                subgrupos = defaultdict(list)
+                for i in grupos_completo[chave]:
+                    if i in completos:
+                        subgrupos[completos[i]].append(i)
+                for hash_hex, idxs in subgrupos.items():
+                    if len(idxs) > 1:
+                        confirmados.append((hash_hex, idxs))
+        
+        if concluidos % INTERVALO_PROGRESSO_HASHES == 0 or not em_andamento:
+            print(f"  Hash parcial: {estatisticas['Hash parcial'][0]}/{len(candidatos)} | "
+                  f"Hash completo: {estatisticas['Hash completo'][0]} | "
+                  f"Grupos confirmados: {len(confirmados)}", end='\r')
+            sys.stdout.flush()
+    
+    # Sinal de parada (fica depois de qualquer tarefa na fila de prioridade)
+    for fila in filas.values():
+        for _ in range(max(1, workers_por_volume)):
+            fila.put((float('inf'), next(sequencia), None, None))
+    for thread in threads:
+        thread.join()
+    
+    if candidatos:
+        print()
+    
+    # Montar o resultado na ordem do escaneamento, independente da ordem de conclusão
+    duplicados_por_conteudo = {}
+    for hash_hex, idxs in sorted(confirmados, key=lambda grupo: min(grupo[1])):
+        duplicados_por_conteudo[hash_hex] = [candidatos[i][1:4] for i in sorted(idxs)]
+    
+    return duplicados_por_conteudo, estatisticas
+
+
+def encontrar_duplicados_por_conteudo(arquivos_filmes, arquivos_series, cache=None, workers_por_volume=1, tempos=None):
+    """
+    Encontra arquivos duplicados por conteúdo (mesmo hash MD5).
+    
+    Funciona em cascata para nunca ler por inteiro um vídeo de vários GB que
+    dificilmente seja uma cópia:
+    1. Agrupa por tamanho (já coletado no escaneamento)
+    2. Calcula o hash parcial (início e fim do arquivo) apenas dos tamanhos repetidos
+    3. Calcula o hash completo apenas dos grupos que continuam colidindo
+    
+    Os hashes são calculados por _pipeline_hashes: cada dispositivo físico
+    (filmes e séries só contam como dois se estiverem em discos ou
+    compartilhamentos diferentes) tem `workers_por_volume` leitores, e os
+    arquivos menores são processados primeiro.
+    
+    Se cache (CacheHashes) for informado, os hashes de arquivos com tamanho e
+    mtime inalterados são reaproveitados em vez de recalculados. Se tempos
+    (dict) for informado, recebe o tempo de cada etapa.
+    
+    Returns:
+        dict {hash_md5: [(caminho, pasta, tamanho)]}
+    """
+    print("  Agrupando arquivos por tamanho...")
+    sys.stdout.flush()
+    inicio = time.time()
+    
+    # Contagem direto na coluna de tamanhos: só os arquivos com tamanho
+    # repetido viram tuplas com o caminho completo (e o mtime, para o cache)
+    volumes = [(_chave_volume(catalogo.raiz), catalogo) for catalogo in (arquivos_filmes, arquivos_series)]
+    contagem = Counter(arquivos_filmes.tamanhos)
+    contagem.update(arquivos_series.tamanhos)
+    
+    if contagem[DESCONHECIDO]:
+        print(f"  [AVISO] {contagem[DESCONHECIDO]} arquivo(s) sem tamanho conhecido ficam fora da comparação")
+    
+    por_tamanho = defaultdict(list)
+    for volume, catalogo in volumes:
+        mtimes = catalogo.mtimes
+        for indice, tamanho in enumerate(catalogo.tamanhos):
+            # Arquivos vazios são todos "iguais" e não interessam
+            if tamanho > 0 and contagem[tamanho] > 1:
+                pasta = catalogo.pastas[catalogo.indices_pasta[indice]]
+                por_tamanho[tamanho].append((volume, catalogo.caminho(indice), pasta.nome, tamanho, mtimes[indice]))
+    
+    candidatos = [arquivo for grupo in por_tamanho.values() if len(grupo) > 1 for arquivo in grupo]
+    print(f"  {len(candidatos)} arquivo(s) com tamanho repetido")
+    sys.stdout.flush()
+    if tempos is not None:
+        tempos['Agrupamento por tamanho'] = time.time() - inicio
+    
+    funcao_parcial = cache.hash_parcial if cache is not None else (
+        lambda caminho, tamanho, mtime_ns: hash_parcial(caminho, tamanho))
+    funcao_completo = cache.hash_completo if cache is not None else (
+        lambda caminho, tamanho, mtime_ns: hash_completo(caminho))
+    
+    inicio = time.time()
+    duplicados_por_conteudo, estatisticas = _pipeline_hashes(
+        candidatos, funcao_parcial, funcao_completo, workers_por_volume
+    )
+    if tempos is not None:
+        tempos['Pipeline de hashes'] = time.time() - inicio
+        for etapa, (arquivos, segundos) in estatisticas.items():
+            tempos[f"{etapa} ({arquivos} arquivo(s), soma dos workers)"] = segundos
+    
+    if cache is not None:
+        print(f"  [CACHE] {cache.reaproveitados} hash(es) reaproveitado(s), {cache.calculados} calculado(s)")
+    
+    return duplicados_por_conteudo
+
+
+def encontrar_duplicados_por_titulo(arquivos_filmes):
+    """
+    Encontra filmes duplicados pelo título extraído do nome da pasta.
+    
+    Pega casos como `Finis Hominis (1971)` e `1971 - Finis Hominis`: o mesmo
+    filme guardado em pastas com convenções de nome diferentes. Quando o nome
+    da pasta não tem ano, usa o ano encontrado no nome de algum arquivo de
+    vídeo da pasta (nomes no estilo de release costumam trazê-lo).
+    
+    Returns:
+        dict {"titulo (ano)": [(caminho, pasta, tamanho)]}, com os arquivos de
+        todas as pastas do grupo
+    """
+    print("  Extraindo títulos e anos dos nomes das pastas...")
+    sys.stdout.flush()
+    
+    arquivos_por_pasta = {}
+    for pasta in arquivos_filmes.pastas:
+        arquivos_por_pasta[pasta.nome] = [
+            (arquivo.caminho, pasta.nome, arquivo.tamanho) for arquivo in arquivos_filmes.arquivos_da_pasta(pasta)
+        ]
+    
+    nomes_pastas = list(arquivos_por_pasta)
+    itens = []
+    for pasta in nomes_pastas:
+        titulo, ano = extrair_titulo_ano(pasta)
+        if ano is None:
+            for caminho, _, _ in arquivos_por_pasta[pasta]:
+                _, ano = extrair_titulo_ano(Path(caminho).name, arquivo=True)
+                if ano is not None:
+                    break
+        itens.append((titulo, ano))
+    
+    print(f"  Comparando {len(itens)} título(s)...")
+    sys.stdout.flush()
+    
+    duplicados_por_titulo = {}
+    for grupo in agrupar_titulos_semelhantes(itens):
+        titulo, ano = itens[grupo[0]]
+        chave = f"{titulo} ({ano})" if ano is not None else titulo
+        duplicados_por_titulo[chave] = [
+            arquivo for i in grupo for arquivo in arquivos_por_pasta[nomes_pastas[i]]
+        ]
+    
+    return duplicados_por_titulo
+
+
+def ordenar_duplicados_por_conteudo(duplicados_por_conteudo):
+    """Ordena os grupos por conteúdo do maior arquivo para o menor (e pelo hash)."""
+    return sorted(duplicados_por_conteudo.items(), key=lambda item: (-item[1][0][2], item[0]))
+
+
 def formatar_tamanho(tamanho_bytes):
-    """Formata tamanho em bytes para formato legível."""
+    """Formata tamanho em bytes para formato legível ('desconhecido' se negativo)."""
+    if tamanho_bytes < 0:
+        return "desconhecido"
     for unidade in ['B', 'KB', 'MB', 'GB', 'TB']:
         if tamanho_bytes < 1024.0:
             return f"{tamanho_bytes:.2f} {unidade}"
@@ -188,20 +504,33 @@ def formatar_tamanho(tamanho_bytes):
     return f"{tamanho_bytes:.2f} PB"
 
 
-def exportar_txt(duplicados_por_nome, arquivo_saida='lista_duplicados.txt'):
-    """Exporta a lista de duplicados para um arquivo TXT."""
+def exportar_txt(duplicados_por_nome, arquivo_saida='lista_duplicados.txt', duplicados_por_conteudo=None,
+                 duplicados_por_titulo=None, metadados=None):
+    """
+    Exporta a lista de duplicados para um arquivo TXT.
+    
+    As seções de duplicados por conteúdo e por título só são escritas quando
+    duplicados_por_conteudo / duplicados_por_titulo são informados (modos
+    --conteudo e --titulos). Com metadados ({caminho: metadados}, modo
+    --metadados), cada cópia ganha uma linha com resolução, codecs e duração.
+    """
     print(f"  Gerando arquivo TXT: {arquivo_saida}...")
     sys.stdout.flush()
     
     total_duplicados_nome = len(duplicados_por_nome)
     inicio = time.time()
     
-    with open(arquivo_saida, 'w', encoding='utf-8') as f:
+    # Sem data de geração no conteúdo: ela fica em geracao_relatorios.json (ver gravacao.py)
+    with Gravacao(arquivo_saida, ARQUIVO_METADADOS_RELATORIOS) as gravacao, \
+            gravacao.abrir('w', encoding='utf-8', buffering=TAMANHO_BUFFER_ESCRITA) as f:
         f.write("=" * 80 + "\n")
         f.write("RELATÓRIO DE ARQUIVOS DUPLICADOS\n")
         f.write("=" * 80 + "\n")
-        f.write(f"Data de geração: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
         f.write(f"Duplicados por nome: {total_duplicados_nome}\n")
+        if duplicados_por_conteudo is not None:
+            f.write(f"Duplicados por conteúdo: {len(duplicados_por_conteudo)}\n")
+        if duplicados_por_titulo is not None:
+            f.write(f"Duplicados por título: {len(duplicados_por_titulo)}\n")
         f.write("=" * 80 + "\n\n")
         
         # Seção: Duplicados por nome
@@ -225,9 +554,15 @@ def exportar_txt(duplicados_por_nome, arquivo_saida='lista_duplicados.txt'):
                     f.write(f"   • {pasta} / {Path(caminho).name}\n")
                     f.write(f"     Caminho: {caminho}\n")
                     f.write(f"     Tamanho: {formatar_tamanho(tamanho)}\n")
+                    if metadados is not None:
+                        f.write(f"     Vídeo: {descrever_metadados(metadados.get(caminho))}\n")
                 
                 f.write(f"\n   Total de cópias: {len(caminhos)}\n")
-                f.write(f"   Espaço desperdiçado: {formatar_tamanho(tamanho_total - caminhos[0][2])}\n")
+                if any(tamanho < 0 for _, _, tamanho in caminhos):
+                    tamanho_total = DESCONHECIDO
+                else:
+                    tamanho_total -= caminhos[0][2]
+                f.write(f"   Espaço desperdiçado: {formatar_tamanho(tamanho_total)}\n")
                 f.write("\n")
         else:
             f.write("=" * 80 + "\n")
@@ -235,18 +570,75 @@ def exportar_txt(duplicados_por_nome, arquivo_saida='lista_duplicados.txt'):
             f.write("=" * 80 + "\n\n")
             f.write("Nenhum arquivo duplicado encontrado por nome.\n\n")
         
+        # Seção: Duplicados por conteúdo
+        if duplicados_por_conteudo is not None:
+            f.write("=" * 80 + "\n")
+            f.write("DUPLICADOS POR CONTEÚDO (HASH MD5)\n")
+            f.write("=" * 80 + "\n\n")
+            
+            if duplicados_por_conteudo:
+                total_conteudo = len(duplicados_por_conteudo)
+                grupos = ordenar_duplicados_por_conteudo(duplicados_por_conteudo)
+                for indice, (hash_md5, caminhos) in enumerate(grupos, 1):
+                    if indice % 10 == 0 or indice == total_conteudo:
+                        print(f"    Escrevendo duplicados por conteúdo: {indice}/{total_conteudo}", end='\r')
+                        sys.stdout.flush()
+                    
+                    f.write(f"{indice}. MD5 {hash_md5} ({formatar_tamanho(caminhos[0][2])})\n")
+                    f.write("-" * 80 + "\n")
+                    
+                    for caminho, pasta, tamanho in caminhos:
+                        f.write(f"   • {pasta} / {Path(caminho).name}\n")
+                        f.write(f"     Caminho: {caminho}\n")
+                        if metadados is not None:
+                            f.write(f"     Vídeo: {descrever_metadados(metadados.get(caminho))}\n")
+                    
+                    f.write(f"\n   Total de cópias: {len(caminhos)}\n")
+                    f.write(f"   Espaço desperdiçado: {formatar_tamanho(caminhos[0][2] * (len(caminhos) - 1))}\n")
+                    f.write("\n")
+            else:
+                f.write("Nenhum arquivo duplicado encontrado por conteúdo.\n\n")
+        
+        # Seção: Duplicados por título (nome da pasta)
+        if duplicados_por_titulo is not None:
+            f.write("=" * 80 + "\n")
+            f.write("DUPLICADOS POR TÍTULO (NOME DA PASTA)\n")
+            f.write("=" * 80 + "\n\n")
+            
+            if duplicados_por_titulo:
+                for indice, (titulo, caminhos) in enumerate(sorted(duplicados_por_titulo.items()), 1):
+                    f.write(f"{indice}. {titulo}\n")
+                    f.write("-" * 80 + "\n")
+                    
+                    for caminho, pasta, tamanho in caminhos:
+                        f.write(f"   • {pasta} / {Path(caminho).name}\n")
+                        f.write(f"     Caminho: {caminho}\n")
+                        f.write(f"     Tamanho: {formatar_tamanho(tamanho)}\n")
+                        if metadados is not None:
+                            f.write(f"     Vídeo: {descrever_metadados(metadados.get(caminho))}\n")
+                    
+                    total_pastas = len(set(pasta for _, pasta, _ in caminhos))
+                    f.write(f"\n   Total de pastas: {total_pastas}\n")
+                    f.write("\n")
+            else:
+                f.write("Nenhum filme duplicado encontrado por título.\n\n")
         
         f.write("=" * 80 + "\n")
         f.write("FIM DO RELATÓRIO\n")
         f.write("=" * 80 + "\n")
     
     tempo_total = time.time() - inicio
-    print(f"\n  [OK] Arquivo TXT criado com sucesso! ({tempo_total:.1f}s)")
+    print(f"\n  [OK] Arquivo TXT {gravacao.status()} ({tempo_total:.1f}s)")
     sys.stdout.flush()
 
 
-def exportar_pdf(duplicados_por_nome, arquivo_saida='lista_duplicados.pdf'):
-    """Exporta a lista de duplicados para um arquivo PDF compacto."""
+def exportar_pdf(duplicados_por_nome, arquivo_saida='lista_duplicados.pdf', duplicados_por_conteudo=None,
+                 duplicados_por_titulo=None):
+    """
+    Exporta um resumo dos duplicados para um arquivo PDF compacto (até 50
+    grupos por seção e 3 cópias por grupo). O relatório inteiro é gerado por
+    exportar_pdf_completo.
+    """
     try:
         from reportlab.lib.pagesizes import A4
         from reportlab.lib.units import cm
@@ -261,8 +653,12 @@ def exportar_pdf(duplicados_por_nome, arquivo_saida='lista_duplicados.pdf'):
         total_duplicados_nome = len(duplicados_por_nome)
         
         # Criar documento PDF com margens reduzidas
+        # invariant: sem data de criação nem ID aleatório, o mesmo conteúdo gera o mesmo PDF
+        # (o SimpleDocTemplate só abre o temporário no build, dentro do with abaixo)
+        gravacao = Gravacao(arquivo_saida, ARQUIVO_METADADOS_RELATORIOS)
         doc = SimpleDocTemplate(
-            arquivo_saida,
+            gravacao.temporario,
+            invariant=1,
             pagesize=A4,
             rightMargin=1*cm,
             leftMargin=1*cm,
@@ -317,7 +713,11 @@ def exportar_pdf(duplicados_por_nome, arquivo_saida='lista_duplicados.pdf'):
         story.append(Paragraph("RELATÓRIO DE ARQUIVOS DUPLICADOS", title_style))
         
         # Informações
-        info_text = f"{datetime.now().strftime('%d/%m/%Y %H:%M')} | Duplicados por nome: {total_duplicados_nome}"
+        info_text = f"Duplicados por nome: {total_duplicados_nome}"
+        if duplicados_por_conteudo is not None:
+            info_text += f" | Duplicados por conteúdo: {len(duplicados_por_conteudo)}"
+        if duplicados_por_titulo is not None:
+            info_text += f" | Duplicados por título: {len(duplicados_por_titulo)}"
         story.append(Paragraph(info_text, info_style))
         story.append(Spacer(1, 0.2*cm))
         
@@ -340,12 +740,117 @@ def exportar_pdf(duplicados_por_nome, arquivo_saida='lista_duplicados.pdf'):
         else:
             story.append(Paragraph("Nenhum arquivo duplicado encontrado por nome.", normal_style))
         
+        # Duplicados por conteúdo
+        if duplicados_por_conteudo is not None:
+            story.append(Paragraph("DUPLICADOS POR CONTEÚDO (HASH MD5)", heading_style))
+            if duplicados_por_conteudo:
+                grupos = ordenar_duplicados_por_conteudo(duplicados_por_conteudo)[:50]  # Limitar a 50 para não ficar muito grande
+                for indice, (hash_md5, caminhos) in enumerate(grupos, 1):
+                    texto = f"{indice}. MD5 {hash_md5} ({len(caminhos)} cópias de {formatar_tamanho(caminhos[0][2])})"
+                    story.append(Paragraph(texto, heading_style))
+                    for caminho, pasta, tamanho in caminhos[:3]:  # Mostrar apenas os 3 primeiros
+                        texto_arquivo = f"  • {pasta} / {Path(caminho).name}"
+                        story.append(Paragraph(texto_arquivo, normal_style))
+                    if len(caminhos) > 3:
+                        story.append(Paragraph(f"  ... e mais {len(caminhos) - 3} cópias", normal_style))
+            else:
+                story.append(Paragraph("Nenhum arquivo duplicado encontrado por conteúdo.", normal_style))
+        
+        # Duplicados por título
+        if duplicados_por_titulo is not None:
+            story.append(Paragraph("DUPLICADOS POR TÍTULO (NOME DA PASTA)", heading_style))
+            if duplicados_por_titulo:
+                grupos = sorted(duplicados_por_titulo.items())[:50]  # Limitar a 50 para não ficar muito grande
+                for indice, (titulo, caminhos) in enumerate(grupos, 1):
+                    story.append(Paragraph(f"{indice}. {titulo}", heading_style))
+                    for caminho, pasta, tamanho in caminhos[:3]:  # Mostrar apenas os 3 primeiros
+                        texto_arquivo = f"  • {pasta} / {Path(caminho).name} ({formatar_tamanho(tamanho)})"
+                        story.append(Paragraph(texto_arquivo, normal_style))
+                    if len(caminhos) > 3:
+                        story.append(Paragraph(f"  ... e mais {len(caminhos) - 3} arquivo(s)", normal_style))
+            else:
+                story.append(Paragraph("Nenhum filme duplicado encontrado por título.", normal_style))
+        
         # Gerar PDF
         print(f"    Gerando PDF final...", end='\r')
         sys.stdout.flush()
-        doc.build(story)
+        with gravacao:
+            doc.build(story)
+        tempo_total = time.time() - inicio
+        print(f"\n  [OK] Arquivo PDF {gravacao.status()} ({tempo_total:.1f}s)")
+        sys.stdout.flush()
+        
+    except ImportError:
+        print("  [ERRO] Erro: Biblioteca 'reportlab' não instalada.")
+        print("  Execute: pip install reportlab")
+        raise
+
+
+def _secoes_relatorio(duplicados_por_nome, duplicados_por_conteudo=None, duplicados_por_titulo=None):
+    """Seções completas do relatório, no formato de pdf_paralelo.gerar_pdf_paralelo."""
+    secoes = []
+    
+    blocos = []
+    for indice, (nome_arquivo, caminhos) in enumerate(sorted(duplicados_por_nome.items()), 1):
+        blocos.append((
+            f"{indice}. {nome_arquivo} ({len(caminhos)} cópias)",
+            [f"• {pasta} / {Path(caminho).name} ({formatar_tamanho(tamanho)})" for caminho, pasta, tamanho in caminhos]
+        ))
+    secoes.append(("DUPLICADOS POR NOME", blocos, "Nenhum arquivo duplicado encontrado por nome."))
+    
+    if duplicados_por_conteudo is not None:
+        blocos = []
+        for indice, (hash_md5, caminhos) in enumerate(ordenar_duplicados_por_conteudo(duplicados_por_conteudo), 1):
+            blocos.append((
+                f"{indice}. MD5 {hash_md5} ({len(caminhos)} cópias de {formatar_tamanho(caminhos[0][2])})",
+                [f"• {pasta} / {Path(caminho).name}" for caminho, pasta, tamanho in caminhos]
+            ))
+        secoes.append(("DUPLICADOS POR CONTEÚDO (HASH MD5)", blocos,
+                       "Nenhum arquivo duplicado encontrado por conteúdo."))
+    
+    if duplicados_por_titulo is not None:
+        blocos = []
+        for indice, (titulo, caminhos) in enumerate(sorted(duplicados_por_titulo.items()), 1):
+            blocos.append((
+                f"{indice}. {titulo}",
+                [f"• {pasta} / {Path(caminho).name} ({formatar_tamanho(tamanho)})" for caminho, pasta, tamanho in caminhos]
+            ))
+        secoes.append(("DUPLICADOS POR TÍTULO (NOME DA PASTA)", blocos,
+                       "Nenhum filme duplicado encontrado por título."))
+    
+    return secoes
+
+
+def exportar_pdf_completo(duplicados_por_nome, arquivo_saida='lista_duplicados.pdf', duplicados_por_conteudo=None,
+                          duplicados_por_titulo=None, processos=None, com_indice=True):
+    """
+    Exporta o relatório completo de duplicados para PDF, sem o limite de 50
+    grupos e 3 cópias de exportar_pdf.
+    
+    As páginas são desenhadas em partes, em processos paralelos (ver
+    pdf_paralelo.py), e o PDF inclui marcadores para cada seção e grupo e,
+    opcionalmente, um índice na primeira página.
+    """
+    try:
+        from pdf_paralelo import gerar_pdf_paralelo
+        
+        print(f"  Gerando arquivo PDF completo: {arquivo_saida}...")
+        sys.stdout.flush()
+        inicio = time.time()
+        
+        info_text = f"Duplicados por nome: {len(duplicados_por_nome)}"
+        if duplicados_por_conteudo is not None:
+            info_text += f" | Duplicados por conteúdo: {len(duplicados_por_conteudo)}"
+        if duplicados_por_titulo is not None:
+            info_text += f" | Duplicados por título: {len(duplicados_por_titulo)}"
+        
+        secoes = _secoes_relatorio(duplicados_por_nome, duplicados_por_conteudo, duplicados_por_titulo)
+        with Gravacao(arquivo_saida, ARQUIVO_METADADOS_RELATORIOS) as gravacao:
+            paginas = gerar_pdf_paralelo(gravacao.temporario, "RELATÓRIO DE ARQUIVOS DUPLICADOS", info_text, secoes,
+                                         processos=processos, com_indice=com_indice)
+        
         tempo_total = time.time() - inicio
-        print(f"\n  [OK] Arquivo PDF criado com sucesso! ({tempo_total:.1f}s)")
+        print(f"  [OK] Arquivo PDF {gravacao.status()} ({paginas} página(s), {tempo_total:.1f}s)")
         sys.stdout.flush()
         
     except ImportError:
@@ -354,19 +859,36 @@ def exportar_pdf(duplicados_por_nome, arquivo_saida='lista_duplicados.pdf'):
         raise
 
 
-def exportar_csv(duplicados_por_nome, arquivo_saida='lista_duplicados.csv'):
+def _colunas_metadados(metadados):
+    """Colunas Duração / Resolução / Codec de Vídeo / Codecs de Áudio do CSV."""
+    if not metadados:
+        return ['', '', '', '']
+    largura, altura = metadados.get('largura'), metadados.get('altura')
+    resolucao = f"{largura}x{altura} ({rotulo_resolucao(largura, altura)})" if largura and altura else ''
+    return [
+        formatar_duracao(metadados.get('duracao')) or '',
+        resolucao,
+        metadados.get('codec_video') or '',
+        ', '.join(metadados.get('codecs_audio') or []),
+    ]
+
+
+def exportar_csv(duplicados_por_nome, arquivo_saida='lista_duplicados.csv', duplicados_por_conteudo=None,
+                 duplicados_por_titulo=None, metadados=None):
     """
     Exporta a lista de duplicados para um arquivo CSV.
     
     Colunas:
-    - Tipo: 'Por Nome'
+    - Tipo: 'Por Nome', 'Por Conteúdo' ou 'Por Título'
     - Grupo: Identificador do grupo de duplicados
     - Nome do Arquivo: Nome do arquivo
     - Caminho Completo: Caminho absoluto do arquivo
     - Pasta: Nome da pasta onde está o arquivo
     - Tamanho (Bytes): Tamanho em bytes
     - Tamanho (Formatado): Tamanho formatado (KB, MB, GB, etc)
+    - Hash MD5: Hash do conteúdo (apenas com duplicados_por_conteudo; vazio nas linhas por nome)
     - Total de Cópias: Quantidade de cópias no grupo
+    - Duração, Resolução, Codec de Vídeo, Codecs de Áudio: apenas com metadados ({caminho: metadados})
     """
     import csv
     
@@ -374,9 +896,15 @@ def exportar_csv(duplicados_por_nome, arquivo_saida='lista_duplicados.csv'):
     sys.stdout.flush()
     inicio = time.time()
     
-    with open(arquivo_saida, 'w', newline='', encoding='utf-8-sig') as f:
+    with Gravacao(arquivo_saida, ARQUIVO_METADADOS_RELATORIOS) as gravacao, \
+            gravacao.abrir('w', newline='', encoding='utf-8-sig', buffering=TAMANHO_BUFFER_ESCRITA) as f:
         writer = csv.writer(f, delimiter=';', quoting=csv.QUOTE_ALL)
         
+        com_hash = duplicados_por_conteudo is not None
+        
+        def colunas_extras(caminho):
+            return _colunas_metadados(metadados.get(caminho)) if metadados is not None else []
+        
         # Cabeçalho
         writer.writerow([
             'Tipo',
@@ -385,9 +913,10 @@ def exportar_csv(duplicados_por_nome, arquivo_saida='lista_duplicados.csv'):
             'Caminho Completo',
             'Pasta',
             'Tamanho (Bytes)',
-            'Tamanho (Formatado)',
+            'Tamanho (Formatado)'
+        ] + (['Hash MD5'] if com_hash else []) + [
             'Total de Cópias'
-        ])
+        ] + (['Duração', 'Resolução', 'Codec de Vídeo', 'Codecs de Áudio'] if metadados is not None else []))
         
         # Duplicados por nome
         total_nome = len(duplicados_por_nome)
@@ -405,21 +934,238 @@ def exportar_csv(duplicados_por_nome, arquivo_saida='lista_duplicados.csv'):
                     caminho,
                     pasta,
                     tamanho,
-                    formatar_tamanho(tamanho),
+                    formatar_tamanho(tamanho)
+                ] + ([''] if com_hash else []) + [
                     total_copias
-                ])
+                ] + colunas_extras(caminho))
                 linhas_escritas += 1
                 if linhas_escritas % 100 == 0:
                     print(f"    Escrevendo CSV: {linhas_escritas} linhas...", end='\r')
                     sys.stdout.flush()
+        
+        # Duplicados por conteúdo
+        if com_hash:
+            grupos = ordenar_duplicados_por_conteudo(duplicados_por_conteudo)
+            for grupo_id, (hash_md5, caminhos) in enumerate(grupos, 1):
+                grupo = f"Conteudo-{grupo_id}"
+                total_copias = len(caminhos)
+                
+                for caminho, pasta, tamanho in caminhos:
+                    writer.writerow([
+                        'Por Conteúdo',
+                        grupo,
+                        Path(caminho).name,
+                        caminho,
+                        pasta,
+                        tamanho,
+                        formatar_tamanho(tamanho),
+                        hash_md5,
+                        total_copias
+                    ] + colunas_extras(caminho))
+                    linhas_escritas += 1
+                    if linhas_escritas % 100 == 0:
+                        print(f"    Escrevendo CSV: {linhas_escritas} linhas...", end='\r')
+                        sys.stdout.flush()
+        
+        # Duplicados por título
+        if duplicados_por_titulo is not None:
+            for grupo_id, (titulo, caminhos) in enumerate(sorted(duplicados_por_titulo.items()), 1):
+                grupo = f"Titulo-{grupo_id}"
+                total_copias = len(caminhos)
+                
+                for caminho, pasta, tamanho in caminhos:
+                    writer.writerow([
+                        'Por Título',
+                        grupo,
+                        Path(caminho).name,
+                        caminho,
+                        pasta,
+                        tamanho,
+                        formatar_tamanho(tamanho)
+                    ] + ([''] if com_hash else []) + [
+                        total_copias
+                    ] + colunas_extras(caminho))
+                    linhas_escritas += 1
+                    if linhas_escritas % 100 == 0:
+                        print(f"    Escrevendo CSV: {linhas_escritas} linhas...", end='\r')
+                        sys.stdout.flush()
     
     tempo_total = time.time() - inicio
-    print(f"\n  [OK] Arquivo CSV criado com sucesso! ({tempo_total:.1f}s)")
+    print(f"\n  [OK] Arquivo CSV {gravacao.status()} ({tempo_total:.1f}s)")
     sys.stdout.flush()
 
 
+def procurar_duplicados(arquivos_filmes, arquivos_series, banco=None, titulos=False, conteudo=False,
+                        arquivo_cache_hashes=ARQUIVO_CACHE_HASHES, podar_cache=False,
+                        leitores_por_volume=1, tempos=None):
+    """
+    Executa as buscas de duplicados pedidas sobre os catálogos já escaneados.
+    
+    Args:
+        arquivos_filmes: Catalogo dos filmes
+        arquivos_series: Catalogo das séries
+        banco: BancoCatalogo com os dois catálogos gravados. Se informado, os
+               duplicados por nome vêm do índice do banco e os hashes dos
+               duplicados por conteúdo são gravados nele; senão, a busca por
+               nome é feita em memória
+        titulos: Também procurar filmes duplicados por título/ano
+        conteudo: Também procurar duplicados por conteúdo
+        arquivo_cache_hashes: Banco do cache de hashes (None = sem cache)
+        podar_cache: Remover do cache os arquivos que não existem mais
+        leitores_por_volume: Threads lendo de cada diretório base nos hashes
+        tempos: Dict opcional que recebe o tempo de cada etapa
+    
+    Returns:
+        Tupla (duplicados_por_nome, duplicados_por_conteudo, duplicados_por_titulo);
+        os dois últimos são None quando a busca não foi pedida
+    """
+    if tempos is None:
+        tempos = {}
+    
+    # Encontrar duplicados por nome
+    print("\n[2/4] Procurando duplicados por nome...")
+    inicio_etapa = time.time()
+    if banco is not None:
+        print("  Consultando o índice de nomes do catálogo...")
+        duplicados_por_nome = banco.duplicados_por_nome()
+    else:
+        duplicados_por_nome = encontrar_duplicados_por_nome(arquivos_filmes, arquivos_series)
+    tempos['Duplicados por nome'] = time.time() - inicio_etapa
+    print(f"[OK] {len(duplicados_por_nome)} arquivo(s) duplicado(s) por nome encontrado(s)")
+    
+    # Encontrar duplicados por título (nome da pasta)
+    duplicados_por_titulo = None
+    if titulos:
+        print("\nProcurando filmes duplicados por título...")
+        inicio_etapa = time.time()
+        duplicados_por_titulo = encontrar_duplicados_por_titulo(arquivos_filmes)
+        tempos['Duplicados por título'] = time.time() - inicio_etapa
+        print(f"[OK] {len(duplicados_por_titulo)} título(s) duplicado(s) encontrado(s)")
+    
+    # Encontrar duplicados por conteúdo
+    duplicados_por_conteudo = None
+    if conteudo:
+        print("\n[3/4] Procurando duplicados por conteúdo...")
+        opcoes = {'workers_por_volume': leitores_por_volume, 'tempos': tempos}
+        if arquivo_cache_hashes is None:
+            duplicados_por_conteudo = encontrar_duplicados_por_conteudo(arquivos_filmes, arquivos_series, **opcoes)
+        else:
+            with CacheHashes(arquivo_cache_hashes) as cache:
+                duplicados_por_conteudo = encontrar_duplicados_por_conteudo(arquivos_filmes, arquivos_series, cache=cache, **opcoes)
+                if podar_cache:
+                    removidos = cache.podar(itertools.chain(arquivos_filmes.caminhos(), arquivos_series.caminhos()))
+                    print(f"  [CACHE] {removidos} entrada(s) removida(s) do cache de hashes")
+        if banco is not None:
+            banco.gravar_hashes(duplicados_por_conteudo)
+        print(f"[OK] {len(duplicados_por_conteudo)} grupo(s) de duplicados por conteúdo encontrado(s)")
+    else:
+        print("\n[3/4] Duplicados por conteúdo ignorados (use --conteudo para ativar)")
+    
+    return duplicados_por_nome, duplicados_por_conteudo, duplicados_por_titulo
+
+
+def ler_metadados_duplicados(duplicados_por_nome, duplicados_por_conteudo=None, duplicados_por_titulo=None,
+                             arquivo_cache=ARQUIVO_CACHE_METADADOS, workers=4, catalogos=()):
+    """
+    Lê duração, resolução e codecs (só o cabeçalho, ver metadados_video) de
+    todas as cópias dos grupos de duplicados.
+    
+    Args:
+        catalogos: Catálogos do escaneamento (filmes, séries); o tamanho e o
+            mtime de cada cópia saem deles, sem um os.stat por arquivo para
+            validar o cache
+    
+    Returns:
+        dict {caminho: metadados ou None}, para o parâmetro metadados dos exportadores
+    """
+    grupos = [duplicados_por_nome, duplicados_por_conteudo or {}, duplicados_por_titulo or {}]
+    caminhos = {caminho for duplicados in grupos for copias in duplicados.values() for caminho, _, _ in copias}
+    assinaturas = {}
+    for catalogo in catalogos:
+        nomes, tamanhos, mtimes = catalogo.nomes, catalogo.tamanhos, catalogo.mtimes
+        for pasta in catalogo.pastas:
+            for i in range(pasta.inicio, pasta.fim):
+                caminho = os.path.join(pasta.caminho, nomes[i])
+                if caminho in caminhos:
+                    assinaturas[caminho] = (tamanhos[i], mtimes[i])
+    return ler_metadados_arquivos(caminhos, arquivo_cache=arquivo_cache, workers=workers, assinaturas=assinaturas)
+
+
+def exportar_relatorios(duplicados_por_nome, duplicados_por_conteudo=None, duplicados_por_titulo=None,
+                        formatos=('txt', 'csv', 'pdf'), diretorio_saida='.', pdf_completo=False,
+                        processos_pdf=None, com_indice=True, metadados=None):
+    """
+    Gera os relatórios de duplicados nos formatos pedidos.
+    
+    Args:
+        formatos: Formatos a gerar, entre 'txt', 'csv' e 'pdf'
+        diretorio_saida: Pasta onde os arquivos lista_duplicados.* são gravados
+        pdf_completo: PDF com todos os grupos (exportar_pdf_completo) em vez do resumo
+        processos_pdf: Processos usados pelo PDF completo
+        com_indice: Índice na primeira página do PDF completo
+        metadados: {caminho: metadados} de ler_metadados_duplicados, para o TXT e o CSV
+    """
+    base = os.path.join(diretorio_saida, 'lista_duplicados')
+    duplicados = {'duplicados_por_conteudo': duplicados_por_conteudo, 'duplicados_por_titulo': duplicados_por_titulo}
+    if 'txt' in formatos:
+        exportar_txt(duplicados_por_nome, base + '.txt', metadados=metadados, **duplicados)
+    if 'csv' in formatos:
+        exportar_csv(duplicados_por_nome, base + '.csv', metadados=metadados, **duplicados)
+    if 'pdf' in formatos:
+        try:
+            if pdf_completo:
+                exportar_pdf_completo(duplicados_por_nome, base + '.pdf', processos=processos_pdf,
+                                      com_indice=com_indice, **duplicados)
+            else:
+                exportar_pdf(duplicados_por_nome, base + '.pdf', **duplicados)
+        except ImportError:
+            print("\n[AVISO] PDF não foi gerado. Instale reportlab para gerar PDFs.")
+
+
 def main():
     """Função principal."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Detector de arquivos duplicados")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Threads para escanear as pastas em paralelo (padrão: 1, serial)")
+    parser.add_argument('--profundidade', type=int, default=0,
+                        help="Níveis de subpastas lidos dentro de cada pasta (padrão: 0; ex.: 1 para Série/Temporada 1/)")
+    parser.add_argument('--excluir', nargs='*', default=list(EXCLUSOES_PADRAO), metavar='GLOB',
+                        help="Subpastas ignoradas com --profundidade (globs, sem diferenciar maiúsculas; "
+                             "padrão: Extras, Sample, Featurettes, ...)")
+    parser.add_argument('--conteudo', action='store_true',
+                        help="Também procurar duplicados por conteúdo (tamanho -> hash parcial -> hash completo)")
+    parser.add_argument('--titulos', action='store_true',
+                        help="Também procurar filmes duplicados pelo título/ano extraído do nome das pastas")
+    parser.add_argument('--cache-hashes', default=ARQUIVO_CACHE_HASHES,
+                        help=f"Banco SQLite com os hashes já calculados (padrão: {ARQUIVO_CACHE_HASHES})")
+    parser.add_argument('--sem-cache', action='store_true',
+                        help="Não usar o cache de hashes (recalcula tudo)")
+    parser.add_argument('--podar-cache', action='store_true',
+                        help="Remover do cache de hashes os arquivos que não existem mais")
+    parser.add_argument('--leitores-por-volume', type=int, default=1,
+                        help="Threads lendo ao mesmo tempo de cada diretório base no cálculo de hashes (padrão: 1)")
+    parser.add_argument('--pdf-completo', action='store_true',
+                        help="PDF com todos os grupos e cópias (páginas geradas em paralelo, com marcadores)")
+    parser.add_argument('--processos-pdf', type=int, default=None,
+                        help="Processos usados pelo --pdf-completo (padrão: número de CPUs)")
+    parser.add_argument('--sem-indice', action='store_true',
+                        help="Não incluir o índice na primeira página do --pdf-completo")
+    parser.add_argument('--metadados', action='store_true',
+                        help="Ler duração, resolução e codecs das cópias (só o cabeçalho de MKV, MP4/MOV e AVI)")
+    parser.add_argument('--cache-metadados', default=ARQUIVO_CACHE_METADADOS,
+                        help=f"Banco SQLite com os metadados já lidos (padrão: {ARQUIVO_CACHE_METADADOS})")
+    parser.add_argument('--leitores-metadados', type=int, default=4,
+                        help="Arquivos lidos ao mesmo tempo no --metadados (padrão: 4)")
+    parser.add_argument('--catalogo', default=ARQUIVO_CATALOGO,
+                        help=f"Banco SQLite do catálogo, atualizado a cada escaneamento (padrão: {ARQUIVO_CATALOGO})")
+    parser.add_argument('--do-catalogo', action='store_true',
+                        help="Não escanear: usar os arquivos já gravados no catálogo")
+    args = parser.parse_args()
+    if args.profundidade < 0:
+        parser.error("--profundidade deve ser 0 ou mais")
+    
     # Forçar flush do output para garantir que mensagens apareçam imediatamente
     sys.stdout.flush()
     
@@ -431,63 +1177,97 @@ def main():
     print("=" * 80)
     sys.stdout.flush()
     
-    # Verificar se os diretórios existem antes de começar
-    print("\nVerificando diretórios...")
-    print(f"  Filmes: {diretorio_filmes}")
-    print(f"  Séries: {diretorio_series}")
-    sys.stdout.flush()
-    
-    if not Path(diretorio_filmes).exists():
-        print(f"\n[ERRO] Diretório de filmes não encontrado: {diretorio_filmes}")
-        print("       Verifique se o caminho está correto e acessível.")
+    # Verificar se os diretórios existem antes de começar (não é preciso ao usar só o catálogo)
+    if not args.do_catalogo:
+        print("\nVerificando diretórios...")
+        print(f"  Filmes: {diretorio_filmes}")
+        print(f"  Séries: {diretorio_series}")
         sys.stdout.flush()
-        return
     
-    if not Path(diretorio_series).exists():
-        print(f"\n[ERRO] Diretório de séries não encontrado: {diretorio_series}")
-        print("       Verifique se o caminho está correto e acessível.")
-        sys.stdout.flush()
-        return
+        if not Path(diretorio_filmes).exists():
+            print(f"\n[ERRO] Diretório de filmes não encontrado: {diretorio_filmes}")
+            print("       Verifique se o caminho está correto e acessível.")
+            sys.stdout.flush()
+            return
     
-    print("  [OK] Diretórios encontrados!")
-    sys.stdout.flush()
+        if not Path(diretorio_series).exists():
+            print(f"\n[ERRO] Diretório de séries não encontrado: {diretorio_series}")
+            print("       Verifique se o caminho está correto e acessível.")
+            sys.stdout.flush()
+            return
     
-    try:
-        # Escanear arquivos
-        print("\n[1/4] Escaneando arquivos...")
-        sys.stdout.flush()
-        arquivos_filmes = escanear_arquivos(diretorio_filmes, 'filmes')
-        sys.stdout.flush()
-        arquivos_series = escanear_arquivos(diretorio_series, 'series')
+        print("  [OK] Diretórios encontrados!")
         sys.stdout.flush()
+    
+    banco = BancoCatalogo(args.catalogo)
+    try:
+        tempos = {}
+        inicio_etapa = time.time()
+        if args.do_catalogo:
+            # Ler o último escaneamento gravado, sem acessar o compartilhamento
+            print(f"\n[1/4] Lendo arquivos do catálogo: {args.catalogo}")
+            sys.stdout.flush()
+            arquivos_filmes = banco.carregar_catalogo('filmes')
+            arquivos_series = banco.carregar_catalogo('series')
+            sem_tamanho = completar_tamanhos(banco, {'filmes': arquivos_filmes, 'series': arquivos_series})
+            tempos['Leitura do catálogo'] = time.time() - inicio_etapa
+            if sem_tamanho and args.conteudo:
+                print("\n[ERRO] --conteudo precisa do tamanho de todos os arquivos. Verifique se o "
+                      "compartilhamento está acessível ou rode sem --do-catalogo.")
+                sys.stdout.flush()
+                return
+        else:
+            # Escanear arquivos
+            print("\n[1/4] Escaneando arquivos...")
+            sys.stdout.flush()
+            arquivos_filmes = escanear_arquivos(diretorio_filmes, 'filmes', workers=args.workers,
+                                                profundidade=args.profundidade, excluir=args.excluir)
+            sys.stdout.flush()
+            arquivos_series = escanear_arquivos(diretorio_series, 'series', workers=args.workers,
+                                                profundidade=args.profundidade, excluir=args.excluir)
+            sys.stdout.flush()
+            tempos['Escaneamento'] = time.time() - inicio_etapa
+            
+            inicio_etapa = time.time()
+            banco.gravar_catalogo('filmes', arquivos_filmes)
+            banco.gravar_catalogo('series', arquivos_series)
+            tempos['Gravação do catálogo'] = time.time() - inicio_etapa
+            print(f"  [OK] Catálogo atualizado: {args.catalogo}")
         
-        total_arquivos = len(arquivos_filmes) + len(arquivos_series)
+        total_arquivos = arquivos_filmes.total_arquivos + arquivos_series.total_arquivos
         if total_arquivos == 0:
             print("\n[AVISO] Nenhum arquivo encontrado nos diretórios especificados.")
             return
         
         print(f"\n[OK] Total de arquivos escaneados: {total_arquivos}")
-        print(f"     - Filmes: {len(arquivos_filmes)}")
-        print(f"     - Séries: {len(arquivos_series)}")
+        print(f"     - Filmes: {arquivos_filmes.total_arquivos}")
+        print(f"     - Séries: {arquivos_series.total_arquivos}")
         
-        # Encontrar duplicados por nome
-        print("\n[2/4] Procurando duplicados por nome...")
-        duplicados_por_nome = encontrar_duplicados_por_nome(arquivos_filmes, arquivos_series)
-        print(f"[OK] {len(duplicados_por_nome)} arquivo(s) duplicado(s) por nome encontrado(s)")
+        duplicados_por_nome, duplicados_por_conteudo, duplicados_por_titulo = procurar_duplicados(
+            arquivos_filmes, arquivos_series, banco=banco, titulos=args.titulos, conteudo=args.conteudo,
+            arquivo_cache_hashes=None if args.sem_cache else args.cache_hashes, podar_cache=args.podar_cache,
+            leitores_por_volume=args.leitores_por_volume, tempos=tempos
+        )
+        
+        metadados = None
+        if args.metadados:
+            print("\nLendo metadados das cópias...")
+            inicio_etapa = time.time()
+            metadados = ler_metadados_duplicados(duplicados_por_nome, duplicados_por_conteudo, duplicados_por_titulo,
+                                                 arquivo_cache=args.cache_metadados, workers=args.leitores_metadados,
+                                                 catalogos=(arquivos_filmes, arquivos_series))
+            tempos['Metadados'] = time.time() - inicio_etapa
         
         # Exportar resultados
-        print("\n[3/4] Exportando resultados...")
+        print("\n[4/4] Exportando resultados...")
         inicio_export = time.time()
-        exportar_txt(duplicados_por_nome)
-        exportar_csv(duplicados_por_nome)
-        
-        try:
-            exportar_pdf(duplicados_por_nome)
-        except ImportError:
-            print("\n[AVISO] PDF não foi gerado. Instale reportlab para gerar PDFs.")
+        exportar_relatorios(duplicados_por_nome, duplicados_por_conteudo, duplicados_por_titulo,
+                            pdf_completo=args.pdf_completo, processos_pdf=args.processos_pdf,
+                            com_indice=not args.sem_indice, metadados=metadados)
         
         tempo_export = time.time() - inicio_export
         print(f"  [OK] Exportação concluída em {tempo_export:.1f}s")
+        tempos['Exportação'] = tempo_export
         
         # Resumo final
         print("\n" + "=" * 80)
@@ -495,6 +1275,14 @@ def main():
         print("=" * 80)
         print(f"Total de arquivos analisados: {total_arquivos}")
         print(f"Duplicados por nome: {len(duplicados_por_nome)}")
+        if duplicados_por_conteudo is not None:
+            print(f"Duplicados por conteúdo: {len(duplicados_por_conteudo)}")
+        if duplicados_por_titulo is not None:
+            print(f"Duplicados por título: {len(duplicados_por_titulo)}")
+        print("=" * 80)
+        print("Tempo por etapa:")
+        for etapa, segundos in tempos.items():
+            print(f"  {etapa:<60}{segundos:>8.1f}s")
         print("=" * 80)
         print("Processo concluído!")
         print("=" * 80)
@@ -505,6 +1293,8 @@ def main():
         print(f"\n[ERRO] Erro inesperado: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        banco.fechar()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gravação das saídas (TXT, PDF e JSON das listas) só quando o conteúdo muda.
+
+Cada saída é gerada num arquivo temporário ao lado do definitivo
+(`lista_filmes.txt.tmp`) e comparada byte a byte com a versão anterior: se
+for igual, o temporário é descartado e o arquivo antigo fica intocado (nem
+o mtime muda); se for diferente, o temporário substitui o antigo com
+os.replace, então quem lê o arquivo nunca vê uma versão pela metade.
+
+As saídas não trazem mais a data de geração no conteúdo, para que duas
+execuções sobre a mesma biblioteca gerem exatamente os mesmos bytes (e o
+update_site não tenha o que publicar). A data e o hash de cada saída ficam em
+ARQUIVO_METADADOS, na mesma pasta, atualizado só para as saídas que mudaram:
+
+    {"lista_filmes.txt": {"atualizado_em": "16/10/2026 21:04:10", "sha256": "..."}, ...}
+
+Os relatórios que não são publicados (lista_duplicados.*) registram a data em
+ARQUIVO_METADADOS_RELATORIOS, para que uma execução só do find_duplicados
+não altere o geracao.json que o update_site envia.
+
+Uso:
+    with Gravacao('lista_filmes.txt') as gravacao, gravacao.abrir('w', encoding='utf-8') as f:
+        f.write(...)
+    gravacao.mudou  # True se o arquivo foi substituído
+
+    with Gravacao('lista_filmes.pdf') as gravacao:
+        gerar_pdf(gravacao.temporario)  # quem só aceita um caminho grava no temporário
+"""
+
+import os
+import json
+import filecmp
+import hashlib
+from datetime import datetime
+
+# Data e hash da última mudança de cada saída publicada no site
+ARQUIVO_METADADOS = 'geracao.json'
+
+# O mesmo para os relatórios locais (não publicados)
+ARQUIVO_METADADOS_RELATORIOS = 'geracao_relatorios.json'
+
+# Tamanho dos blocos lidos no cálculo do hash
+TAMANHO_BLOCO_HASH = 1024 * 1024
+
+
+def _sha256(arquivo):
+    resumo = hashlib.sha256()
+    with open(arquivo, 'rb') as f:
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO_HASH), b''):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+def registrar_geracao(arquivo, nome_metadados=ARQUIVO_METADADOS):
+    """Registra data e hash de uma saída que mudou em nome_metadados (na pasta da saída)."""
+    arquivo_metadados = os.path.join(os.path.dirname(arquivo) or '.', nome_metadados)
+    try:
+        with open(arquivo_metadados, 'r', encoding='utf-8') as f:
+            metadados = json.load(f)
+    except (OSError, ValueError):
+        metadados = {}
+    metadados[os.path.basename(arquivo)] = {
+        'atualizado_em': datetime.now().strftime('%d/%m/%Y %H:%M:%S'),
+        'sha256': _sha256(arquivo),
+    }
+    with open(arquivo_metadados, 'w', encoding='utf-8') as f:
+        json.dump(metadados, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def status_gravacao(mudou):
+    """Texto para as mensagens dos exportadores."""
+    return "atualizado" if mudou else "sem mudanças, mantido"
+
+
+def substituir_se_mudou(temporario, arquivo, nome_metadados=ARQUIVO_METADADOS):
+    """
+    Substitui arquivo pelo temporário se o conteúdo for diferente (ou se o
+    arquivo ainda não existe); senão apaga o temporário. A mudança é
+    registrada em nome_metadados.
+
+    Returns:
+        True se o arquivo foi substituído
+    """
+    if os.path.exists(arquivo) and filecmp.cmp(temporario, arquivo, shallow=False):
+        os.remove(temporario)
+        return False
+    os.replace(temporario, arquivo)
+    registrar_geracao(arquivo, nome_metadados)
+    return True
+
+
+class Gravacao:
+    """
+    Gera uma saída no arquivo temporário e, ao sair do bloco with sem erro,
+    substitui o arquivo definitivo só se o conteúdo mudou (ver
+    substituir_se_mudou). Com erro, o temporário é apagado e o arquivo
+    anterior continua valendo.
+    """
+
+    def __init__(self, arquivo, nome_metadados=ARQUIVO_METADADOS):
+        self.arquivo = arquivo
+        self.temporario = f"{arquivo}.tmp"
+        self.nome_metadados = nome_metadados
+        self.mudou = None
+
+    def abrir(self, modo='w', **kwargs):
+        """Abre o arquivo temporário (mesmos argumentos de open)."""
+        return open(self.temporario, modo, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, rastreamento):
+        if tipo is not None:
+            if os.path.exists(self.temporario):
+                os.remove(self.temporario)
+            return False
+        self.mudou = substituir_se_mudou(self.temporario, self.arquivo, self.nome_metadados)
+        return False
+
+    def status(self):
+        return status_gravacao(self.mudou)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Funções de hash de conteúdo usadas por find_duplicados.py.
+
+O hash parcial lê apenas o início e o fim do arquivo (alguns MiB de cada
+lado), o que basta para separar quase todos os arquivos de mesmo tamanho que
+não são cópias. O hash completo só é calculado para os grupos que continuam
+colidindo depois do hash parcial.
+
+A leitura é feita com readinto num bytearray pré-alocado e reaproveitado (um
+por thread), ou com mmap quando o sistema de arquivos permite, para que um
+vídeo de 5 GB seja processado na velocidade do disco sem criar um objeto
+bytes novo a cada bloco. Tanto a leitura quanto o update() do hashlib liberam
+o GIL, então vários arquivos podem ter o hash calculado em threads ao mesmo
+tempo.
+
+Algoritmos disponíveis: os do hashlib listados em ALGORITMOS (md5, sha1,
+sha256, blake2b, blake2s) e, se o pacote opcional `xxhash` estiver instalado,
+xxh64, xxh3_64 e xxh3_128 (não criptográficos e bem mais rápidos).
+"""
+
+import mmap
+import hashlib
+import threading
+
+# Quantidade lida do início e do fim do arquivo no hash parcial
+TAMANHO_BLOCO_PARCIAL = 4 * 1024 * 1024
+
+# Tamanho do buffer de leitura no hash completo
+TAMANHO_BUFFER = 4 * 1024 * 1024
+
+ALGORITMO_PADRAO = 'md5'
+
+ALGORITMOS = {
+    'md5': hashlib.md5,
+    'sha1': hashlib.sha1,
+    'sha256': hashlib.sha256,
+    'blake2b': hashlib.blake2b,
+    'blake2s': hashlib.blake2s,
+}
+
+try:
+    import xxhash
+    ALGORITMOS.update({
+        'xxh64': xxhash.xxh64,
+        'xxh3_64': xxhash.xxh3_64,
+        'xxh3_128': xxhash.xxh3_128,
+    })
+except ImportError:
+    pass
+
+# Buffers reaproveitados, um por thread e por tamanho
+_buffers = threading.local()
+
+
+def criar_hash(algoritmo=ALGORITMO_PADRAO):
+    """Cria um objeto de hash do algoritmo informado."""
+    try:
+        return ALGORITMOS[algoritmo]()
+    except KeyError:
+        disponiveis = ', '.join(sorted(ALGORITMOS))
+        raise ValueError(f"Algoritmo de hash desconhecido: {algoritmo} (disponíveis: {disponiveis})")
+
+
+def _obter_buffer(tamanho_buffer):
+    """Retorna o buffer pré-alocado desta thread, criando-o na primeira vez."""
+    buffers = getattr(_buffers, 'por_tamanho', None)
+    if buffers is None:
+        buffers = _buffers.por_tamanho = {}
+    buffer = buffers.get(tamanho_buffer)
+    if buffer is None:
+        buffer = buffers[tamanho_buffer] = bytearray(tamanho_buffer)
+    return buffer
+
+
+def _atualizar_com_leitura(hash_obj, f, limite, tamanho_buffer):
+    """Lê até `limite` bytes de f (None = até o fim) com readinto e atualiza o hash."""
+    buffer = _obter_buffer(tamanho_buffer)
+    visao = memoryview(buffer)
+    restante = limite
+    while restante is None or restante > 0:
+        if restante is not None and restante < tamanho_buffer:
+            lidos = f.readinto(visao[:restante])
+        else:
+            lidos = f.readinto(visao)
+        if not lidos:
+            break
+        hash_obj.update(visao[:lidos])
+        if restante is not None:
+            restante -= lidos
+
+
+def _hash_mmap(caminho, algoritmo, tamanho_buffer):
+    """Calcula o hash mapeando o arquivo em memória; levanta OSError/ValueError se não suportado."""
+    hash_obj = criar_hash(algoritmo)
+    with open(caminho, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            visao = memoryview(mapa)
+            try:
+                # Atualiza em fatias para não segurar um único update gigante
+                for inicio in range(0, len(mapa), tamanho_buffer):
+                    hash_obj.update(visao[inicio:inicio + tamanho_buffer])
+            finally:
+                visao.release()
+    return hash_obj.hexdigest()
+
+
+def hash_completo(caminho, algoritmo=ALGORITMO_PADRAO, tamanho_buffer=TAMANHO_BUFFER, usar_mmap=False):
+    """
+    Calcula o hash do arquivo inteiro.
+
+    Args:
+        caminho: Caminho do arquivo
+        algoritmo: Nome do algoritmo (ver ALGORITMOS)
+        tamanho_buffer: Tamanho do buffer de leitura reaproveitado
+        usar_mmap: Tenta mapear o arquivo em memória; se o sistema de arquivos
+                   não suportar (ou o arquivo estiver vazio), usa readinto
+
+    Returns:
+        Hash em hexadecimal
+    """
+    if usar_mmap:
+        try:
+            return _hash_mmap(caminho, algoritmo, tamanho_buffer)
+        except (OSError, ValueError):
+            pass
+
+    hash_obj = criar_hash(algoritmo)
+    with open(caminho, 'rb', buffering=0) as f:
+        _atualizar_com_leitura(hash_obj, f, None, tamanho_buffer)
+    return hash_obj.hexdigest()
+
+
+def hash_parcial(caminho, tamanho, bloco=TAMANHO_BLOCO_PARCIAL, algoritmo=ALGORITMO_PADRAO):
+    """
+    Calcula o hash do primeiro e do último bloco do arquivo.
+
+    Arquivos com até 2 * bloco bytes são lidos por inteiro, e nesse caso o
+    resultado é igual ao de hash_completo.
+
+    Returns:
+        Tupla (hash_hex, completo), onde completo indica que o arquivo inteiro foi lido
+    """
+    if tamanho <= 2 * bloco:
+        return hash_completo(caminho, algoritmo), True
+
+    hash_obj = criar_hash(algoritmo)
+    tamanho_buffer = min(bloco, TAMANHO_BUFFER)
+    with open(caminho, 'rb', buffering=0) as f:
+        _atualizar_com_leitura(hash_obj, f, bloco, tamanho_buffer)
+        f.seek(tamanho - bloco)
+        _atualizar_com_leitura(hash_obj, f, bloco, tamanho_buffer)
+    return hash_obj.hexdigest(), False
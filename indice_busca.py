@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice invertido de busca das listas de filmes e séries, gravado junto com o
+JSON do site (busca_filmes.json / busca_series.json) e consultado pelo
+script.js enquanto o usuário digita, sem percorrer todas as entradas.
+
+Cada entrada da lista (uma pasta com seus arquivos) é um documento,
+identificado pela sua posição na lista. O texto indexado é o nome da pasta
+mais os nomes dos arquivos, normalizado com titulos.normalizar_texto (sem
+acentos, minúsculas, pontuação trocada por espaços), então
+`À Meia Noite Levarei Sua Alma` é encontrado digitando "a meia noite".
+
+O índice tem duas partes:
+
+- palavras: as palavras em ordem alfabética, com os documentos de cada uma.
+  Termos de 1 ou 2 caracteres são buscados como prefixo: uma busca binária
+  acha o intervalo das palavras que começam com o termo;
+- trigramas: os documentos de cada sequência de 3 caracteres de cada
+  palavra. Termos maiores são buscados como substring: a interseção dos
+  documentos dos seus trigramas dá os candidatos, que o script.js confirma
+  no texto normalizado da entrada.
+
+As listas de documentos são crescentes e gravadas como diferenças
+([3, 7, 8] vira [3, 4, 1]), o que deixa os números (e o arquivo) menores.
+
+Formato:
+    {"versao": 1, "documentos": N,
+     "palavras": ["alma", "meia", ...], "documentos_palavras": [[0, 4], ...],
+     "trigramas": {"alm": [0, 12], ...}}
+"""
+
+from collections import defaultdict
+
+from titulos import normalizar_texto
+from exportacao_json import gravar_json
+from gravacao import status_gravacao
+
+VERSAO_INDICE = 1
+
+
+def texto_documento(nome, arquivos):
+    """Texto normalizado de uma entrada: nome da pasta e nomes dos arquivos."""
+    return normalizar_texto(' '.join([nome, *arquivos]))
+
+
+def _diferencas(documentos):
+    anterior = 0
+    diferencas = []
+    for documento in documentos:
+        diferencas.append(documento - anterior)
+        anterior = documento
+    return diferencas
+
+
+def construir_indice(entradas):
+    """
+    Monta o índice de busca.
+
+    Args:
+        entradas: Iterável de (nome_pasta, [arquivos]), na ordem da lista do site
+
+    Returns:
+        Dict no formato descrito no docstring do módulo
+    """
+    documentos_palavra = defaultdict(list)
+    documentos_trigrama = defaultdict(list)
+    total = 0
+    for documento, (nome, arquivos) in enumerate(entradas):
+        total += 1
+        palavras = set(texto_documento(nome, arquivos).split())
+        for palavra in palavras:
+            documentos_palavra[palavra].append(documento)
+        for trigrama in {palavra[i:i + 3] for palavra in palavras for i in range(len(palavra) - 2)}:
+            documentos_trigrama[trigrama].append(documento)
+
+    palavras = sorted(documentos_palavra)
+    return {
+        'versao': VERSAO_INDICE,
+        'documentos': total,
+        'palavras': palavras,
+        'documentos_palavras': [_diferencas(documentos_palavra[palavra]) for palavra in palavras],
+        'trigramas': {trigrama: _diferencas(documentos_trigrama[trigrama]) for trigrama in sorted(documentos_trigrama)},
+    }
+
+
+def exportar_indice_busca(entradas, arquivo_saida, compressoes=()):
+    """
+    Grava o índice de busca de uma lista (e as cópias comprimidas pedidas),
+    só se ele mudou.
+
+    Args:
+        entradas: Iterável de (nome_pasta, [arquivos]), na mesma ordem do JSON da lista
+        arquivo_saida: Caminho do .json do índice
+        compressoes: Entre 'gzip' e 'brotli' (ver exportacao_json.py)
+    """
+    print(f"\nGerando índice de busca: {arquivo_saida}")
+    indice = construir_indice(entradas)
+    gravados, mudou = gravar_json(arquivo_saida, indice, compressoes)
+    print(f"  [OK] {len(indice['palavras'])} palavra(s) e {len(indice['trigramas'])} trigrama(s) "
+          f"indexados, índice {status_gravacao(mudou)} ({', '.join(gravados)})")
@@ -6,67 +6,53 @@ Script para listar todos os filmes de um diretório e exportar para PDF e TXT.
 
 import os
 import sys
+import argparse
+from operator import itemgetter
 from pathlib import Path
-from datetime import datetime
-from collections import defaultdict
 
-# Configurar encoding UTF-8 para Windows
+from escaneamento import listar_pastas, escanear_pasta, EXCLUSOES_PADRAO
+from extensoes import VIDEO, LEGENDA, ACESSORIO, is_arquivo_video, separar_por_classe, descrever_extras
+from catalogo import Catalogo
+from ordenacao_externa import OrdenacaoExterna
+from banco_catalogo import BancoCatalogo, ARQUIVO_CATALOGO
+from exportacao_json import gravar_lista_por_letra, COMPRESSOES, DIRETORIO_PARTES
+from indice_busca import exportar_indice_busca
+from gravacao import Gravacao, status_gravacao
+from observador import observar_lista, MODOS_OBSERVACAO, INTERVALO_POLLING, ESPERA_AGRUPAMENTO
+from cache_escaneamento import carregar_cache, salvar_cache, escanear_pastas_com_cache
+
+# Configurar encoding UTF-8 para Windows (reconfigure no lugar de um novo
+# TextIOWrapper: os scripts são importados juntos por biblioteca.py)
 if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
-
-# Formatos de vídeo suportados (lista completa)
-FORMATOS_VIDEO = {
-    # Formatos MPEG
-    '.mp4', '.m4v', '.mpg', '.mpeg', '.m1v', '.m2v', '.mpv', '.mpv2', '.mp4v',
-    # Formatos AVI e DivX
-    '.avi', '.divx', '.xvid',
-    # Formatos Matroska
-    '.mkv', '.mk3d', '.mka',
-    # Formatos QuickTime/Apple
-    '.mov', '.qt',
-    # Formatos Windows Media
-    '.wmv', '.wmvhd', '.asf',
-    # Formatos Flash
-    '.flv', '.f4v', '.swf',
-    # Formatos Web
-    '.webm', '.ogv', '.ogm',
-    # Formatos RealMedia
-    '.rm', '.rmvb', '.ra', '.ram', '.rv',
-    # Formatos de transmissão/streaming
-    '.ts', '.m2ts', '.mts', '.trp', '.tp',
-    # Formatos de vídeo bruto
-    '.yuv', '.y4m', '.raw', '.ycbcr', '.rgb', '.rgba',
-    # Formatos de container
-    '.nut',
-    # Formatos de disco
-    '.vob', '.vro', '.dat', '.bik', '.smk',
-    # Formatos de gravação
-    '.dvr-ms', '.wtv', '.pvr',
-    # Formatos de celular
-    '.3gp', '.3g2', '.amv', '.dmv',
-    # Formatos de codec específicos
-    '.h264', '.h265', '.hevc', '.264', '.265', '.avc', '.vc1', '.vp8', '.vp9', '.av1',
-    # Formatos Microsoft
-    '.mxf', '.wv',
-    # Formatos diversos
-    '.nsv', '.roq', '.svi', '.uvu', '.viv', '.xesc', '.gifv'
-}
-
-
-def is_arquivo_video(arquivo):
-    """Verifica se o arquivo é um vídeo baseado na extensão."""
-    return Path(arquivo).suffix.lower() in FORMATOS_VIDEO
-
-
-def escanear_filmes(diretorio_base):
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+# Motor de PDF padrão: 'canvas' (pdf_rapido.py) ou 'platypus' (um Paragraph por linha)
+MOTOR_PDF_PADRAO = 'canvas'
+
+# Buffer de escrita dos arquivos TXT exportados
+TAMANHO_BUFFER_ESCRITA = 1024 * 1024
+
+
+def filtrar_videos(nomes):
+    """Os arquivos de vídeo entre os nomes de uma pasta, em ordem."""
+    return sorted(nome for nome in nomes if is_arquivo_video(nome))
+
+
+def iterar_filmes(diretorio_base, arquivo_cache='.cache_filmes.json', profundidade=0, excluir=()):
     """
-    Escaneia o diretório e retorna um dicionário com pastas e seus filmes.
+    Escaneia o diretório gerando cada pasta com seus filmes assim que ela é lida.
+    
+    Gera: tuplas (nome_pasta, [lista_arquivos_video]) na ordem do sistema de arquivos
+    
+    Usa um cache persistente (arquivo_cache) com o mtime de cada pasta: apenas
+    pastas novas ou alteradas desde a última execução são relidas. Passe
+    arquivo_cache=None para desativar o cache.
     
-    Retorna: dict {nome_pasta: [lista_arquivos_video]}
+    Com profundidade > 0 as subpastas (ex.: temporadas) também são lidas, até
+    esse nível, exceto as que casam com os globs de excluir; os arquivos delas
+    vêm com o caminho relativo à pasta (ver escaneamento.escanear_pasta).
     """
-    filmes_por_pasta = defaultdict(list)
     diretorio = Path(diretorio_base)
     
     if not diretorio.exists():
@@ -74,73 +60,208 @@ def escanear_filmes(diretorio_base):
     
     print(f"Escaneando diretório: {diretorio_base}")
     
-    # Percorre todas as pastas no diretório base
-    for item in diretorio.iterdir():
-        if item.is_dir():
-            nome_pasta = item.name
-            arquivos_video = []
-            
-            # Procura arquivos de vídeo na pasta
-            try:
-                for arquivo in item.iterdir():
-                    if arquivo.is_file() and is_arquivo_video(arquivo):
-                        arquivos_video.append(arquivo.name)
-                
-                # Se encontrou vídeos, adiciona à lista
-                if arquivos_video:
-                    filmes_por_pasta[nome_pasta] = sorted(arquivos_video)
-                    print(f"  [OK] {nome_pasta}: {len(arquivos_video)} arquivo(s) de video")
+    cache = carregar_cache(arquivo_cache, diretorio_base, profundidade, excluir)
+    novo_cache = {}
+    reaproveitadas = legendas = acessorios = 0
+    
+    # Percorre todas as pastas no diretório base (uma única leitura por diretório)
+    pastas = listar_pastas(diretorio)
+    resultados = escanear_pastas_com_cache(pastas, cache, novo_cache, profundidade=profundidade, excluir=excluir)
+    for item, nomes, excecao, do_cache in resultados:
+        nome_pasta = item.name
+        reaproveitadas += do_cache
+        
+        # Procura arquivos de vídeo na pasta
+        try:
+            if excecao is not None:
+                raise excecao
+            por_classe = separar_por_classe(nomes)
+            arquivos_video = sorted(por_classe[VIDEO])
             
-            except PermissionError:
-                print(f"  [ERRO] Erro de permissao ao acessar: {nome_pasta}")
-            except Exception as e:
-                print(f"  [ERRO] Erro ao processar {nome_pasta}: {e}")
+            # Se encontrou vídeos, adiciona à lista (legendas e .nfo são só contados, no console)
+            if arquivos_video:
+                legendas += len(por_classe[LEGENDA])
+                acessorios += len(por_classe[ACESSORIO])
+                print(f"  [OK] {nome_pasta}: {len(arquivos_video)} arquivo(s) de video{descrever_extras(por_classe)}")
+                yield nome_pasta, arquivos_video
+        
+        except PermissionError:
+            print(f"  [ERRO] Erro de permissao ao acessar: {nome_pasta}")
+        except Exception as e:
+            print(f"  [ERRO] Erro ao processar {nome_pasta}: {e}")
+    
+    print(f"  [OK] {legendas} legenda(s) e {acessorios} acessório(s) (.nfo) junto dos vídeos")
+    if arquivo_cache:
+        salvar_cache(arquivo_cache, diretorio_base, novo_cache, profundidade, excluir)
+        print(f"  [CACHE] {reaproveitadas} pasta(s) reaproveitada(s), {len(pastas) - reaproveitadas} relida(s)")
+
+
+def escanear_filmes(diretorio_base, arquivo_cache='.cache_filmes.json', profundidade=0, excluir=()):
+    """
+    Escaneia o diretório e retorna o catálogo das pastas com seus filmes.
     
-    return dict(sorted(filmes_por_pasta.items()))
+    Retorna: Catalogo com as pastas em ordem de nome, usado como um dict
+    {nome_pasta: [lista_arquivos_video]} (ver catalogo.py)
+    
+    Usa um cache persistente (arquivo_cache) com o mtime de cada pasta: apenas
+    pastas novas ou alteradas desde a última execução são relidas. Passe
+    arquivo_cache=None para desativar o cache.
+    """
+    catalogo = Catalogo(diretorio_base)
+    for nome, arquivos in sorted(iterar_filmes(diretorio_base, arquivo_cache, profundidade, excluir)):
+        catalogo.adicionar_pasta(nome, arquivos)
+    return catalogo
+
+
+def escanear_pasta_filmes(diretorio_base, nome_pasta):
+    """
+    Relê uma única pasta de filme (modo --observar), com o mesmo filtro de iterar_filmes.
+    
+    Retorna: lista ordenada dos arquivos de vídeo, ou None se a pasta não
+    existe mais ou não tem vídeos
+    """
+    try:
+        arquivos, _ = escanear_pasta(os.path.join(diretorio_base, nome_pasta))
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except PermissionError:
+        print(f"  [ERRO] Erro de permissao ao acessar: {nome_pasta}")
+        return None
+    return filtrar_videos(nome for _, nome, _, _ in arquivos) or None
+
+
+def _itens(filmes_por_pasta):
+    """Tuplas (nome_pasta, arquivos) de um dict/Catalogo ou de uma coleção ordenada."""
+    return filmes_por_pasta.items() if hasattr(filmes_por_pasta, 'items') else filmes_por_pasta
+
+
+def formatar_bloco_txt(indice, nome_pasta, arquivos):
+    """Formata a entrada de um filme no TXT (uma única string por pasta)."""
+    linhas = [f"{indice}. {nome_pasta}", "-" * 80]
+    linhas.extend(f"   • {arquivo}" for arquivo in arquivos)
+    return "\n".join(linhas) + "\n\n"
+
+
+def escanear_filmes_streaming(diretorio_base, arquivo_parcial, arquivo_cache=None, profundidade=0,
+                              excluir=()):
+    """
+    Escaneia o diretório sem manter a lista inteira em memória.
+    
+    Cada pasta é gravada no arquivo_parcial (na ordem do escaneamento) assim
+    que é lida, de modo que uma execução interrompida ainda deixa uma lista
+    utilizável, e é enviada para uma ordenação externa em disco.
+    
+    O cache de escaneamento fica desligado por padrão: ele guarda a lista de
+    arquivos de todas as pastas até o fim, justamente o que este modo evita.
+    
+    Retorna: OrdenacaoExterna com tuplas (nome_pasta, arquivos) em ordem de
+    nome; o chamador deve chamar fechar() para remover os temporários.
+    """
+    filmes_por_pasta = OrdenacaoExterna(chave=itemgetter(0))
+    try:
+        with open(arquivo_parcial, 'w', encoding='utf-8') as parcial:
+            pastas = iterar_filmes(diretorio_base, arquivo_cache, profundidade, excluir)
+            for indice, (nome_pasta, arquivos) in enumerate(pastas, 1):
+                filmes_por_pasta.adicionar((nome_pasta, arquivos))
+                parcial.write(formatar_bloco_txt(indice, nome_pasta, arquivos))
+                parcial.flush()
+    except BaseException:
+        filmes_por_pasta.fechar()
+        raise
+    return filmes_por_pasta
 
 
 def exportar_txt(filmes_por_pasta, arquivo_saida='lista_filmes.txt'):
-    """Exporta a lista de filmes para um arquivo TXT."""
+    """
+    Exporta a lista de filmes para um arquivo TXT.
+    
+    filmes_por_pasta pode ser o Catalogo de escanear_filmes ou qualquer coleção
+    com len() que gere tuplas (nome_pasta, arquivos) em ordem, como a
+    OrdenacaoExterna usada no modo --streaming.
+    """
     print(f"\nGerando arquivo TXT: {arquivo_saida}")
     
-    with open(arquivo_saida, 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
-        f.write("LISTA DE FILMES\n")
-        f.write("=" * 80 + "\n")
-        f.write(f"Data de geração: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
-        f.write(f"Total de filmes: {len(filmes_por_pasta)}\n")
-        f.write("=" * 80 + "\n\n")
+    with Gravacao(arquivo_saida) as gravacao, \
+            gravacao.abrir('w', encoding='utf-8', buffering=TAMANHO_BUFFER_ESCRITA) as f:
+        f.write("\n".join([
+            "=" * 80,
+            "LISTA DE FILMES",
+            "=" * 80,
+            f"Total de filmes: {len(filmes_por_pasta)}",
+            "=" * 80,
+            "", "",
+        ]))
         
-        for indice, (nome_pasta, arquivos) in enumerate(filmes_por_pasta.items(), 1):
-            f.write(f"{indice}. {nome_pasta}\n")
-            f.write("-" * 80 + "\n")
-            
-            for arquivo in arquivos:
-                f.write(f"   • {arquivo}\n")
-            
-            f.write("\n")
+        for indice, (nome_pasta, arquivos) in enumerate(_itens(filmes_por_pasta), 1):
+            f.write(formatar_bloco_txt(indice, nome_pasta, arquivos))
         
-        f.write("=" * 80 + "\n")
-        f.write(f"Total: {len(filmes_por_pasta)} filme(s) listado(s)\n")
-        f.write("=" * 80 + "\n")
+        f.write("\n".join([
+            "=" * 80,
+            f"Total: {len(filmes_por_pasta)} filme(s) listado(s)",
+            "=" * 80,
+            "",
+        ]))
     
-    print(f"  [OK] Arquivo TXT criado com sucesso!")
+    print(f"  [OK] Arquivo TXT {gravacao.status()}")
 
 
-def exportar_pdf(filmes_por_pasta, arquivo_saida='lista_filmes.pdf'):
-    """Exporta a lista de filmes para um arquivo PDF compacto."""
+def exportar_json(filmes_por_pasta, arquivo_saida='lista_filmes.json', compressoes=()):
+    """
+    Exporta a lista de filmes em JSON para o site: o manifesto em arquivo_saida e
+    uma parte por letra inicial na pasta dados/ ao lado dele (ver exportacao_json.py).
+    
+    Aceita as mesmas coleções de exportar_txt. compressoes pode incluir 'gzip'
+    e 'brotli' para gravar também as cópias .json.gz/.json.br.
+    """
+    print(f"\nGerando arquivo JSON: {arquivo_saida}")
+    metadados = {
+        'total': len(filmes_por_pasta),
+    }
+    resumo = gravar_lista_por_letra(arquivo_saida, metadados, 'filmes', _itens(filmes_por_pasta), compressoes)
+    print(f"  [OK] Arquivo JSON {status_gravacao(resumo['mudou'])} ({', '.join(resumo['arquivos'])})")
+    print(f"  [OK] {resumo['partes']} parte(s) em {DIRETORIO_PARTES}/: {resumo['novas']} nova(s), "
+          f"{resumo['removidas']} antiga(s) removida(s)")
+
+
+def exportar_pdf(filmes_por_pasta, arquivo_saida='lista_filmes.pdf', motor=MOTOR_PDF_PADRAO, colunas=1):
+    """
+    Exporta a lista de filmes para um arquivo PDF compacto (aceita as mesmas coleções que exportar_txt).
+    
+    motor='canvas' desenha as linhas direto no canvas (pdf_rapido.py), bem
+    mais rápido em listas grandes e com suporte a várias colunas por página;
+    motor='platypus' usa um Paragraph do reportlab por linha.
+    """
     try:
+        print(f"\nGerando arquivo PDF: {arquivo_saida}")
+        
+        info_text = f"Total: {len(filmes_por_pasta)} filme(s)"
+        
+        if motor == 'canvas':
+            from pdf_rapido import gerar_pdf_lista
+            
+            entradas = (
+                (f"{indice}. {nome_pasta}", [f"• {arquivo}" for arquivo in arquivos])
+                for indice, (nome_pasta, arquivos) in enumerate(_itens(filmes_por_pasta), 1)
+            )
+            with Gravacao(arquivo_saida) as gravacao:
+                paginas = gerar_pdf_lista(gravacao.temporario, "LISTA DE FILMES", info_text, entradas, colunas)
+            print(f"  [OK] Arquivo PDF {gravacao.status()} ({paginas} página(s))")
+            return
+        
+        # platypus só é carregado quando é o motor escolhido
         from reportlab.lib.pagesizes import A4
         from reportlab.lib.units import cm
         from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
         from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT
-        
-        print(f"\nGerando arquivo PDF: {arquivo_saida}")
+        from reportlab.lib.enums import TA_CENTER
         
         # Criar documento PDF com margens reduzidas
+        # invariant: sem data de criação nem ID aleatório, o mesmo conteúdo gera o mesmo PDF
+        # (o SimpleDocTemplate só abre o temporário no build, dentro do with abaixo)
+        gravacao = Gravacao(arquivo_saida)
         doc = SimpleDocTemplate(
-            arquivo_saida,
+            gravacao.temporario,
+            invariant=1,
             pagesize=A4,
             rightMargin=1*cm,
             leftMargin=1*cm,
@@ -195,12 +316,11 @@ def exportar_pdf(filmes_por_pasta, arquivo_saida='lista_filmes.pdf'):
         story.append(Paragraph("LISTA DE FILMES", title_style))
         
         # Informações compactas
-        info_text = f"{datetime.now().strftime('%d/%m/%Y %H:%M')} | Total: {len(filmes_por_pasta)} filme(s)"
         story.append(Paragraph(info_text, info_style))
         story.append(Spacer(1, 0.2*cm))
         
         # Lista de filmes compacta
-        for indice, (nome_pasta, arquivos) in enumerate(filmes_por_pasta.items(), 1):
+        for indice, (nome_pasta, arquivos) in enumerate(_itens(filmes_por_pasta), 1):
             # Nome do filme (pasta) - compacto
             filme_text = f"{indice}. {nome_pasta}"
             story.append(Paragraph(filme_text, heading_style))
@@ -211,8 +331,9 @@ def exportar_pdf(filmes_por_pasta, arquivo_saida='lista_filmes.pdf'):
                 story.append(Paragraph(arquivo_text, normal_style))
         
         # Gerar PDF
-        doc.build(story)
-        print(f"  [OK] Arquivo PDF criado com sucesso!")
+        with gravacao:
+            doc.build(story)
+        print(f"  [OK] Arquivo PDF {gravacao.status()}")
         
     except ImportError:
         print("  [ERRO] Erro: Biblioteca 'reportlab' nao instalada.")
@@ -220,17 +341,83 @@ def exportar_pdf(filmes_por_pasta, arquivo_saida='lista_filmes.pdf'):
         raise
 
 
+def exportar_saidas(filmes_por_pasta, compressoes_json=(), motor_pdf=MOTOR_PDF_PADRAO, colunas_pdf=1):
+    """Gera todas as saídas da lista: TXT, JSON e índice de busca do site, e PDF."""
+    # Exportar para TXT
+    exportar_txt(filmes_por_pasta, 'lista_filmes.txt')
+    
+    # Exportar para JSON e o índice de busca (usados pelo site)
+    exportar_json(filmes_por_pasta, 'lista_filmes.json', compressoes_json)
+    exportar_indice_busca(_itens(filmes_por_pasta), 'busca_filmes.json', compressoes_json)
+    
+    # Exportar para PDF
+    try:
+        exportar_pdf(filmes_por_pasta, motor=motor_pdf, colunas=colunas_pdf)
+    except ImportError:
+        print("\n[AVISO] PDF nao foi gerado. Instale reportlab para gerar PDFs.")
+
+
 def main():
     """Função principal."""
+    parser = argparse.ArgumentParser(description="Lista os filmes e exporta para TXT e PDF")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Grava a lista enquanto escaneia e ordena em disco, sem manter tudo em memória "
+                             "(o cache de escaneamento fica desligado neste modo)")
+    parser.add_argument('--motor-pdf', choices=['canvas', 'platypus'], default=MOTOR_PDF_PADRAO,
+                        help="Gerador do PDF (padrão: canvas, bem mais rápido em listas grandes)")
+    parser.add_argument('--colunas-pdf', type=int, default=1, help="Colunas por página no PDF (motor canvas)")
+    parser.add_argument('--catalogo', default=ARQUIVO_CATALOGO,
+                        help=f"Banco SQLite do catálogo, atualizado a cada escaneamento (padrão: {ARQUIVO_CATALOGO})")
+    parser.add_argument('--do-catalogo', action='store_true',
+                        help="Não escanear: exportar a lista a partir do catálogo")
+    parser.add_argument('--compressao-json', nargs='+', choices=COMPRESSOES, default=[],
+                        help="Também gravar o JSON do site pré-comprimido (gzip: .json.gz, brotli: .json.br)")
+    parser.add_argument('--profundidade', type=int, default=0,
+                        help="Níveis de subpastas lidos dentro de cada pasta (padrão: 0; ex.: 1 para Série/Temporada 1/)")
+    parser.add_argument('--excluir', nargs='*', default=list(EXCLUSOES_PADRAO), metavar='GLOB',
+                        help="Subpastas ignoradas com --profundidade (globs, sem diferenciar maiúsculas; "
+                             "padrão: Extras, Sample, Featurettes, ...)")
+    parser.add_argument('--observar', action='store_true',
+                        help="Depois de exportar, continuar rodando e atualizar as saídas quando as pastas mudarem")
+    parser.add_argument('--modo-observacao', choices=MODOS_OBSERVACAO, default='auto',
+                        help="Como observar as mudanças (padrão: auto, inotify no Linux e polling em "
+                             "compartilhamentos de rede e no Windows)")
+    parser.add_argument('--intervalo-polling', type=float, default=INTERVALO_POLLING,
+                        help=f"Segundos entre verificações no modo polling (padrão: {INTERVALO_POLLING})")
+    parser.add_argument('--espera', type=float, default=ESPERA_AGRUPAMENTO,
+                        help=f"Segundos sem mudanças antes de atualizar as saídas (padrão: {ESPERA_AGRUPAMENTO})")
+    args = parser.parse_args()
+    if args.observar and (args.streaming or args.do_catalogo):
+        parser.error("--observar não pode ser usado com --streaming nem com --do-catalogo")
+    if args.observar and args.profundidade > 0:
+        parser.error("--observar acompanha só o primeiro nível de pastas e não pode ser usado com --profundidade")
+    if args.profundidade < 0:
+        parser.error("--profundidade deve ser 0 ou mais")
+    
     diretorio_filmes = r"Y:\Mídia\Filmes"
+    arquivo_txt = 'lista_filmes.txt'
+    arquivo_parcial = arquivo_txt + '.parcial'
     
     print("=" * 80)
     print("LISTADOR DE FILMES")
     print("=" * 80)
     
+    filmes_por_pasta = None
+    banco = BancoCatalogo(args.catalogo)
     try:
         # Escanear filmes
-        filmes_por_pasta = escanear_filmes(diretorio_filmes)
+        if args.do_catalogo:
+            print(f"\nLendo filmes do catálogo: {args.catalogo}")
+            filmes_por_pasta = banco.pastas('filmes')
+        elif args.streaming:
+            # No modo streaming a lista não fica em memória, então não vai para o catálogo
+            filmes_por_pasta = escanear_filmes_streaming(
+                diretorio_filmes, arquivo_parcial,
+                profundidade=args.profundidade, excluir=args.excluir
+            )
+        else:
+            filmes_por_pasta = escanear_filmes(diretorio_filmes, profundidade=args.profundidade, excluir=args.excluir)
+            banco.gravar_catalogo('filmes', filmes_por_pasta)
         
         if not filmes_por_pasta:
             print("\n[AVISO] Nenhum filme encontrado no diretorio especificado.")
@@ -238,14 +425,21 @@ def main():
         
         print(f"\n[OK] Total de filmes encontrados: {len(filmes_por_pasta)}")
         
-        # Exportar para TXT
-        exportar_txt(filmes_por_pasta)
+        exportar_saidas(filmes_por_pasta, args.compressao_json, args.motor_pdf, args.colunas_pdf)
         
-        # Exportar para PDF
-        try:
-            exportar_pdf(filmes_por_pasta)
-        except ImportError:
-            print("\n[AVISO] PDF nao foi gerado. Instale reportlab para gerar PDFs.")
+        # A lista parcial só serve se a execução for interrompida
+        if args.streaming:
+            os.remove(arquivo_parcial)
+        
+        # Modo --observar: relê só as pastas alteradas e atualiza catálogo e saídas
+        if args.observar:
+            def atualizar(catalogo, alteracoes):
+                banco.atualizar_pastas('filmes', alteracoes)
+                exportar_saidas(catalogo, args.compressao_json, args.motor_pdf, args.colunas_pdf)
+            
+            observar_lista(diretorio_filmes, dict(filmes_por_pasta.items()),
+                           lambda nome: escanear_pasta_filmes(diretorio_filmes, nome), atualizar,
+                           modo=args.modo_observacao, intervalo=args.intervalo_polling, espera=args.espera)
         
         print("\n" + "=" * 80)
         print("Processo concluído!")
@@ -257,6 +451,10 @@ def main():
         print(f"\n[ERRO] Erro inesperado: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        if args.streaming and filmes_por_pasta is not None:
+            filmes_por_pasta.fechar()
+        banco.fechar()
 
 
 if __name__ == "__main__":
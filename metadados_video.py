@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Metadados dos vídeos (duração, resolução e codecs) lidos só do cabeçalho do
+contêiner, em Python puro, para ajudar a escolher qual cópia de um duplicado
+manter (`WEB 720p` ou `BluRay 1080p`?) sem abrir cada arquivo.
+
+Formatos:
+
+- MKV/WebM (EBML): Segment > Info (escala e duração) e Tracks (codec de cada
+  faixa e tamanho do vídeo). Os Clusters com o conteúdo são pulados com
+  seek; se Info ou Tracks vierem depois deles, a posição vem do SeekHead;
+- MP4/MOV (átomos): o moov é procurado pulando os outros átomos de topo
+  (inclusive o mdat, que pode vir antes dele) e, dentro dele, só mvhd, tkhd,
+  hdlr e stsd são lidos; as tabelas de amostras (stts, stsz, ...) são puladas;
+- AVI (RIFF): a lista hdrl, no começo do arquivo (avih, strh e strf de
+  cada stream). A lista movi é ignorada.
+
+A leitura passa por um buffer de TAMANHO_BUFFER_LEITURA bytes, então um
+arquivo custa alguns KB mesmo pela rede; ler_metadados informa os bytes
+lidos. Outros formatos (TS, WMV, ...) devolvem None.
+
+Os resultados ficam num cache SQLite (CacheMetadados) por caminho, tamanho e
+mtime, como o cache de hashes: numa nova execução só os arquivos novos ou
+alterados são abertos.
+"""
+
+import io
+import os
+import json
+import struct
+import sqlite3
+import threading
+
+ARQUIVO_CACHE_METADADOS = '.cache_metadados.sqlite3'
+
+# Tamanho do buffer de leitura (cada seek para fora do buffer lê até isso)
+TAMANHO_BUFFER_LEITURA = 16 * 1024
+
+# Maior elemento/átomo de cabeçalho lido inteiro (Tracks, stsd, hdrl...)
+LIMITE_ELEMENTO = 1024 * 1024
+
+# Quantidade de gravações acumuladas antes de um commit
+GRAVACOES_POR_COMMIT = 50
+
+# Nomes curtos dos codecs, pelo identificador de cada contêiner
+CODECS_MKV = {
+    'V_MPEG4/ISO/AVC': 'h264', 'V_MPEGH/ISO/HEVC': 'hevc', 'V_MPEG4/ISO': 'mpeg4',
+    'V_MPEG4/MS/V3': 'msmpeg4', 'V_MPEG2': 'mpeg2', 'V_MPEG1': 'mpeg1',
+    'V_VP8': 'vp8', 'V_VP9': 'vp9', 'V_AV1': 'av1', 'V_THEORA': 'theora',
+    'V_REAL': 'realvideo', 'V_MS/VFW/FOURCC': 'vfw',
+    'A_AAC': 'aac', 'A_AC3': 'ac3', 'A_EAC3': 'eac3', 'A_DTS': 'dts', 'A_TRUEHD': 'truehd',
+    'A_FLAC': 'flac', 'A_OPUS': 'opus', 'A_VORBIS': 'vorbis', 'A_MPEG/L3': 'mp3',
+    'A_MPEG/L2': 'mp2', 'A_PCM': 'pcm', 'A_REAL': 'realaudio', 'A_ALAC': 'alac',
+}
+CODECS_MP4 = {
+    'avc1': 'h264', 'avc3': 'h264', 'hvc1': 'hevc', 'hev1': 'hevc', 'mp4v': 'mpeg4',
+    'av01': 'av1', 'vp09': 'vp9', 'jpeg': 'mjpeg', 'mjpa': 'mjpeg',
+    'apcn': 'prores', 'apch': 'prores', 'apcs': 'prores', 'apco': 'prores', 'ap4h': 'prores',
+    'mp4a': 'aac', 'ac-3': 'ac3', 'ec-3': 'eac3', 'opus': 'opus', 'flac': 'flac',
+    '.mp3': 'mp3', 'alac': 'alac', 'lpcm': 'pcm', 'sowt': 'pcm', 'twos': 'pcm',
+}
+CODECS_AVI_VIDEO = {
+    'xvid': 'mpeg4', 'divx': 'mpeg4', 'dx50': 'mpeg4', 'fmp4': 'mpeg4', 'mp4v': 'mpeg4',
+    'div3': 'msmpeg4', 'mp43': 'msmpeg4', 'h264': 'h264', 'x264': 'h264', 'avc1': 'h264',
+    'hevc': 'hevc', 'h265': 'hevc', 'mjpg': 'mjpeg', 'wmv3': 'wmv3', 'mpg2': 'mpeg2',
+}
+CODECS_AVI_AUDIO = {
+    0x0001: 'pcm', 0x0050: 'mp2', 0x0055: 'mp3', 0x00FF: 'aac', 0x1610: 'aac',
+    0x2000: 'ac3', 0x2001: 'dts', 0x0161: 'wma', 0x0162: 'wma',
+}
+
+# IDs EBML (Matroska)
+_EBML = 0x1A45DFA3
+_SEGMENT = 0x18538067
+_SEEKHEAD, _SEEK, _SEEK_ID, _SEEK_POSICAO = 0x114D9B74, 0x4DBB, 0x53AB, 0x53AC
+_INFO, _ESCALA_TEMPO, _DURACAO = 0x1549A966, 0x2AD7B1, 0x4489
+_TRACKS, _TRACK_ENTRY, _TRACK_TIPO, _CODEC_ID = 0x1654AE6B, 0xAE, 0x83, 0x86
+_VIDEO, _LARGURA, _ALTURA = 0xE0, 0xB0, 0xBA
+_CLUSTER = 0x1F43B675
+
+# Átomos MP4 que só agrupam outros átomos
+_CONTEINERES_MP4 = {b'trak', b'mdia', b'minf', b'stbl'}
+
+
+class _ArquivoContado(io.RawIOBase):
+    """Arquivo sem buffer que conta os bytes lidos (o BufferedReader fica por cima)."""
+
+    def __init__(self, caminho):
+        self.arquivo = open(caminho, 'rb', buffering=0)
+        self.lidos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, destino):
+        lidos = self.arquivo.readinto(destino)
+        self.lidos += lidos or 0
+        return lidos
+
+    def seek(self, posicao, referencia=io.SEEK_SET):
+        return self.arquivo.seek(posicao, referencia)
+
+    def tell(self):
+        return self.arquivo.tell()
+
+    def close(self):
+        self.arquivo.close()
+        super().close()
+
+
+def _ler(f, tamanho):
+    dados = f.read(tamanho)
+    if len(dados) < tamanho:
+        raise EOFError("Fim do arquivo no meio do cabeçalho")
+    return dados
+
+
+# MKV / WebM
+
+def _vint(f, marcador=False):
+    """
+    Lê um inteiro de tamanho variável EBML.
+
+    Returns:
+        (valor, desconhecido): com marcador=True (IDs) o bit de tamanho é
+        mantido; desconhecido indica o tamanho reservado "até o fim"
+    """
+    primeiro = _ler(f, 1)[0]
+    tamanho, mascara = 1, 0x80
+    while tamanho <= 8 and not primeiro & mascara:
+        tamanho += 1
+        mascara >>= 1
+    if tamanho > 8:
+        raise ValueError("Inteiro EBML inválido")
+    valor = primeiro if marcador else primeiro & (mascara - 1)
+    for byte in _ler(f, tamanho - 1):
+        valor = (valor << 8) | byte
+    return valor, not marcador and valor == (1 << (7 * tamanho)) - 1
+
+
+def _elemento(f):
+    """Lê o cabeçalho de um elemento: (id, tamanho, tamanho_desconhecido)."""
+    id_elemento, _ = _vint(f, marcador=True)
+    tamanho, desconhecido = _vint(f)
+    return id_elemento, tamanho, desconhecido
+
+
+def _filhos(dados):
+    """Elementos (id, conteúdo) dentro do conteúdo de um elemento mestre."""
+    f = io.BytesIO(dados)
+    while f.tell() < len(dados):
+        try:
+            id_elemento, tamanho, desconhecido = _elemento(f)
+        except (EOFError, ValueError):
+            return
+        if desconhecido:
+            return
+        yield id_elemento, f.read(tamanho)
+
+
+def _uint(dados):
+    return int.from_bytes(dados, 'big')
+
+
+def _float(dados):
+    if len(dados) == 4:
+        return struct.unpack('>f', dados)[0]
+    if len(dados) == 8:
+        return struct.unpack('>d', dados)[0]
+    return None
+
+
+def _codec(tabela, identificador):
+    """Nome curto do codec: o maior prefixo conhecido, ou o próprio identificador."""
+    for tamanho in range(len(identificador), 0, -1):
+        nome = tabela.get(identificador[:tamanho])
+        if nome is not None:
+            return nome
+    return identificador.lower()
+
+
+def _mkv_info(dados, metadados):
+    escala, duracao = 1000000, None
+    for id_elemento, conteudo in _filhos(dados):
+        if id_elemento == _ESCALA_TEMPO:
+            escala = _uint(conteudo)
+        elif id_elemento == _DURACAO:
+            duracao = _float(conteudo)
+    if duracao:
+        metadados['duracao'] = duracao * escala / 1e9
+
+
+def _mkv_faixas(dados, metadados):
+    for id_elemento, entrada in _filhos(dados):
+        if id_elemento != _TRACK_ENTRY:
+            continue
+        tipo, codec, largura, altura = None, '', None, None
+        for id_campo, conteudo in _filhos(entrada):
+            if id_campo == _TRACK_TIPO:
+                tipo = _uint(conteudo)
+            elif id_campo == _CODEC_ID:
+                codec = conteudo.rstrip(b'\0').decode('ascii', 'replace')
+            elif id_campo == _VIDEO:
+                for id_video, valor in _filhos(conteudo):
+                    if id_video == _LARGURA:
+                        largura = _uint(valor)
+                    elif id_video == _ALTURA:
+                        altura = _uint(valor)
+        if tipo == 1 and metadados['codec_video'] is None:
+            metadados['codec_video'] = _codec(CODECS_MKV, codec)
+            metadados['largura'], metadados['altura'] = largura, altura
+        elif tipo == 2:
+            metadados['codecs_audio'].append(_codec(CODECS_MKV, codec))
+
+
+def _mkv_seekhead(dados):
+    posicoes = {}
+    for id_elemento, seek in _filhos(dados):
+        if id_elemento != _SEEK:
+            continue
+        campos = dict(_filhos(seek))
+        if _SEEK_ID in campos and _SEEK_POSICAO in campos:
+            posicoes.setdefault(_uint(campos[_SEEK_ID]), _uint(campos[_SEEK_POSICAO]))
+    return posicoes
+
+
+def _ler_mkv(f, tamanho_arquivo, metadados):
+    id_elemento, tamanho, _ = _elemento(f)
+    if id_elemento != _EBML:
+        return False
+    f.seek(tamanho, io.SEEK_CUR)
+    id_elemento, tamanho, desconhecido = _elemento(f)
+    if id_elemento != _SEGMENT:
+        return False
+    metadados['container'] = 'mkv'
+    inicio_segmento = f.tell()
+    fim_segmento = tamanho_arquivo if desconhecido else min(tamanho_arquivo, inicio_segmento + tamanho)
+
+    leitores = {_INFO: _mkv_info, _TRACKS: _mkv_faixas}
+    faltando = set(leitores)
+    posicoes = {}
+    posicao = inicio_segmento
+    while faltando and posicao < fim_segmento:
+        f.seek(posicao)
+        id_elemento, tamanho, desconhecido = _elemento(f)
+        if id_elemento == _CLUSTER or desconhecido:
+            break
+        inicio_conteudo = f.tell()
+        if id_elemento in faltando and tamanho <= LIMITE_ELEMENTO:
+            leitores[id_elemento](_ler(f, tamanho), metadados)
+            faltando.discard(id_elemento)
+        elif id_elemento == _SEEKHEAD and tamanho <= LIMITE_ELEMENTO:
+            posicoes.update(_mkv_seekhead(_ler(f, tamanho)))
+        posicao = inicio_conteudo + tamanho
+
+    # Info ou Tracks depois dos Clusters: vão pela posição do SeekHead
+    for id_elemento in sorted(faltando):
+        if id_elemento in posicoes:
+            f.seek(inicio_segmento + posicoes[id_elemento])
+            id_lido, tamanho, _ = _elemento(f)
+            if id_lido == id_elemento and tamanho <= LIMITE_ELEMENTO:
+                leitores[id_elemento](_ler(f, tamanho), metadados)
+    return True
+
+
+# MP4 / MOV
+
+def _atomos(f, inicio, fim):
+    """Átomos (tipo, inicio_conteudo, fim_atomo) entre inicio e fim, lendo só os cabeçalhos."""
+    posicao = inicio
+    while posicao + 8 <= fim:
+        f.seek(posicao)
+        tamanho, tipo = struct.unpack('>I4s', _ler(f, 8))
+        cabecalho = 8
+        if tamanho == 1:
+            tamanho = struct.unpack('>Q', _ler(f, 8))[0]
+            cabecalho = 16
+        elif tamanho == 0:
+            tamanho = fim - posicao
+        if tamanho < cabecalho:
+            return
+        yield tipo, posicao + cabecalho, min(posicao + tamanho, fim)
+        posicao += tamanho
+
+
+def _mp4_faixa(f, inicio, fim, metadados):
+    faixa = {}
+    pendentes = [(inicio, fim)]
+    while pendentes:
+        for tipo, inicio_conteudo, fim_atomo in _atomos(f, *pendentes.pop()):
+            tamanho = fim_atomo - inicio_conteudo
+            if tipo in _CONTEINERES_MP4:
+                pendentes.append((inicio_conteudo, fim_atomo))
+            elif tipo in (b'tkhd', b'hdlr', b'stsd') and tamanho <= LIMITE_ELEMENTO:
+                f.seek(inicio_conteudo)
+                faixa[tipo] = _ler(f, tamanho)
+
+    tipo_faixa = faixa.get(b'hdlr', b'')[8:12]
+    stsd = faixa.get(b'stsd', b'')
+    codec = stsd[12:16].decode('latin-1').strip() if len(stsd) >= 16 else ''
+    if tipo_faixa == b'vide' and metadados['codec_video'] is None:
+        metadados['codec_video'] = _codec(CODECS_MP4, codec.lower()) if codec else None
+        largura = altura = 0
+        if len(stsd) >= 44:
+            largura, altura = struct.unpack('>HH', stsd[40:44])
+        if not (largura and altura) and len(faixa.get(b'tkhd', b'')) >= 8:
+            largura, altura = (valor >> 16 for valor in struct.unpack('>II', faixa[b'tkhd'][-8:]))
+        metadados['largura'], metadados['altura'] = largura or None, altura or None
+    elif tipo_faixa == b'soun' and codec:
+        metadados['codecs_audio'].append(_codec(CODECS_MP4, codec.lower()))
+
+
+def _ler_mp4(f, tamanho_arquivo, metadados):
+    tamanho, tipo = struct.unpack('>I4s', _ler(f, 8))
+    if tipo not in (b'ftyp', b'moov', b'mdat', b'free', b'skip', b'wide', b'pnot'):
+        return False
+    metadados['container'] = 'mp4'
+    for tipo, inicio, fim in _atomos(f, 0, tamanho_arquivo):
+        if tipo == b'ftyp':
+            f.seek(inicio)
+            if _ler(f, 4) == b'qt  ':
+                metadados['container'] = 'mov'
+        if tipo != b'moov':
+            continue
+        for tipo_filho, inicio_filho, fim_filho in list(_atomos(f, inicio, fim)):
+            if tipo_filho == b'mvhd':
+                f.seek(inicio_filho)
+                mvhd = _ler(f, max(0, min(fim_filho - inicio_filho, 32)))
+                # mvhd truncado (ou vazio) fica sem duração em vez de derrubar a leitura
+                if len(mvhd) >= 32 and mvhd[0] == 1:
+                    escala, duracao = struct.unpack('>IQ', mvhd[20:32])
+                elif len(mvhd) >= 20 and mvhd[0] != 1:
+                    escala, duracao = struct.unpack('>II', mvhd[12:20])
+                else:
+                    escala = duracao = 0
+                if escala:
+                    metadados['duracao'] = duracao / escala
+            elif tipo_filho == b'trak':
+                _mp4_faixa(f, inicio_filho, fim_filho, metadados)
+        break
+    return True
+
+
+# AVI
+
+def _chunks(dados):
+    """Chunks RIFF (id, conteúdo) de um trecho já lido; LISTs vêm com o tipo no id ('LIST:strl')."""
+    posicao = 0
+    while posicao + 8 <= len(dados):
+        id_chunk, tamanho = struct.unpack('<4sI', dados[posicao:posicao + 8])
+        conteudo = dados[posicao + 8:posicao + 8 + tamanho]
+        if id_chunk == b'LIST' and len(conteudo) >= 4:
+            yield b'LIST:' + conteudo[:4], conteudo[4:]
+        else:
+            yield id_chunk, conteudo
+        posicao += 8 + tamanho + (tamanho & 1)
+
+
+def _ler_avi(f, tamanho_arquivo, metadados):
+    riff, _, formato = struct.unpack('<4sI4s', _ler(f, 12))
+    if riff != b'RIFF' or formato != b'AVI ':
+        return False
+    metadados['container'] = 'avi'
+    id_lista, tamanho, tipo_lista = struct.unpack('<4sI4s', _ler(f, 12))
+    if id_lista != b'LIST' or tipo_lista != b'hdrl':
+        return True
+    hdrl = _ler(f, min(tamanho - 4, LIMITE_ELEMENTO))
+
+    duracao_video = None
+    for id_chunk, conteudo in _chunks(hdrl):
+        if id_chunk == b'avih' and len(conteudo) >= 40:
+            micro_por_quadro, = struct.unpack('<I', conteudo[0:4])
+            quadros, = struct.unpack('<I', conteudo[16:20])
+            metadados['largura'], metadados['altura'] = struct.unpack('<II', conteudo[32:40])
+            if micro_por_quadro and quadros:
+                metadados['duracao'] = quadros * micro_por_quadro / 1e6
+        elif id_chunk == b'LIST:strl':
+            stream = dict(_chunks(conteudo))
+            strh, strf = stream.get(b'strh', b''), stream.get(b'strf', b'')
+            if len(strh) < 36:
+                continue
+            tipo, manipulador = strh[0:4], strh[4:8]
+            escala, taxa = struct.unpack('<II', strh[20:28])
+            comprimento, = struct.unpack('<I', strh[32:36])
+            if tipo == b'vids' and metadados['codec_video'] is None:
+                fourcc = strf[16:20] if len(strf) >= 20 else manipulador
+                fourcc = fourcc.decode('latin-1').strip('\0 ').lower()
+                metadados['codec_video'] = CODECS_AVI_VIDEO.get(fourcc, fourcc or None)
+                if taxa and comprimento:
+                    duracao_video = comprimento * escala / taxa
+            elif tipo == b'auds' and len(strf) >= 2:
+                formato_audio, = struct.unpack('<H', strf[0:2])
+                metadados['codecs_audio'].append(CODECS_AVI_AUDIO.get(formato_audio, f"0x{formato_audio:04x}"))
+    # O avih conta só os quadros do primeiro RIFF (AVIs OpenDML > 1 GB); o strh conta todos
+    if duracao_video:
+        metadados['duracao'] = duracao_video
+    return True
+
+
+def ler_metadados(caminho):
+    """
+    Lê duração, resolução e codecs do cabeçalho de um vídeo MKV/WebM, MP4/MOV ou AVI.
+
+    Returns:
+        (metadados, bytes_lidos): metadados é um dict com 'container',
+        'duracao' (segundos), 'largura', 'altura', 'codec_video' e
+        'codecs_audio' (os campos que o arquivo não informa ficam None), ou
+        None se o formato não for reconhecido ou o cabeçalho estiver corrompido
+    """
+    bruto = _ArquivoContado(caminho)
+    try:
+        with io.BufferedReader(bruto, TAMANHO_BUFFER_LEITURA) as f:
+            tamanho_arquivo = os.fstat(bruto.arquivo.fileno()).st_size
+            inicio = f.peek(12)[:12]
+            metadados = {'container': None, 'duracao': None, 'largura': None, 'altura': None,
+                         'codec_video': None, 'codecs_audio': []}
+            if inicio[:4] == b'\x1a\x45\xdf\xa3':
+                leitor = _ler_mkv
+            elif inicio[4:8] in (b'ftyp', b'moov', b'mdat', b'free', b'skip', b'wide', b'pnot'):
+                leitor = _ler_mp4
+            elif inicio[:4] == b'RIFF' and inicio[8:12] == b'AVI ':
+                leitor = _ler_avi
+            else:
+                return None, bruto.lidos
+            try:
+                reconhecido = leitor(f, tamanho_arquivo, metadados)
+            except (EOFError, ValueError, struct.error):
+                reconhecido = metadados['container'] is not None
+            return (metadados if reconhecido else None), bruto.lidos
+    finally:
+        bruto.close()
+
+
+def rotulo_resolucao(largura, altura):
+    """Classe da resolução ('2160p', '1080p', '720p', ...), considerando filmes com tarjas (1920x800 é 1080p)."""
+    if not largura or not altura:
+        return None
+    linhas = max(altura, largura * 9 // 16)
+    for minimo, rotulo in ((1800, '2160p'), (1300, '1440p'), (900, '1080p'), (650, '720p'),
+                           (540, '576p'), (440, '480p')):
+        if linhas >= minimo:
+            return rotulo
+    return f"{altura}p"
+
+
+def formatar_duracao(segundos):
+    if segundos is None:
+        return None
+    minutos = int(round(segundos / 60))
+    return f"{minutos // 60}h{minutos % 60:02d}min" if minutos >= 60 else f"{minutos}min"
+
+
+def descrever_metadados(metadados):
+    """Resumo de uma linha: '1920x1080 (1080p) | h264 | ac3, aac | 1h42min'."""
+    if not metadados:
+        return "metadados indisponíveis"
+    partes = []
+    if metadados.get('largura') and metadados.get('altura'):
+        partes.append(f"{metadados['largura']}x{metadados['altura']} "
+                      f"({rotulo_resolucao(metadados['largura'], metadados['altura'])})")
+    if metadados.get('codec_video'):
+        partes.append(metadados['codec_video'])
+    if metadados.get('codecs_audio'):
+        partes.append(', '.join(metadados['codecs_audio']))
+    if metadados.get('duracao'):
+        partes.append(formatar_duracao(metadados['duracao']))
+    return ' | '.join(partes) or metadados.get('container') or "metadados indisponíveis"
+
+
+class CacheMetadados:
+    """
+    Cache dos metadados em SQLite, indexado pelo caminho e validado pelo
+    tamanho e pelo mtime (como cache_hashes.CacheHashes). Pode ser usado por
+    várias threads: o banco fica atrás de um lock e a leitura dos arquivos
+    acontece fora dele.
+    """
+
+    def __init__(self, arquivo_cache=ARQUIVO_CACHE_METADADOS):
+        self.arquivo_cache = arquivo_cache
+        self.conexao = sqlite3.connect(arquivo_cache, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conexao.execute("""
+            CREATE TABLE IF NOT EXISTS metadados (
+                caminho TEXT PRIMARY KEY,
+                tamanho INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                dados TEXT
+            )
+        """)
+        self.conexao.commit()
+        self.gravacoes_pendentes = 0
+        self.reaproveitados = 0
+        self.lidos = 0
+        self.bytes_lidos = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+    def fechar(self):
+        """Grava as alterações pendentes e fecha o banco."""
+        with self.lock:
+            if self.conexao is None:
+                return
+            self.conexao.commit()
+            self.conexao.close()
+            self.conexao = None
+
+    def metadados(self, caminho, tamanho=None, mtime_ns=None):
+        """
+        Igual a ler_metadados(caminho)[0], reaproveitando o cache se o arquivo não mudou.
+
+        Tamanho e mtime (em nanossegundos) vindos do escaneamento dispensam o
+        os.stat; sem eles (ou com -1, dado não lido) o arquivo é consultado.
+        """
+        if tamanho is None or mtime_ns is None or tamanho < 0 or mtime_ns < 0:
+            info = os.stat(caminho)
+            tamanho, mtime_ns = info.st_size, info.st_mtime_ns
+        with self.lock:
+            linha = self.conexao.execute(
+                "SELECT dados FROM metadados WHERE caminho = ? AND tamanho = ? AND mtime_ns = ?",
+                (caminho, tamanho, mtime_ns)
+            ).fetchone()
+        if linha is not None:
+            with self.lock:
+                self.reaproveitados += 1
+            return json.loads(linha[0]) if linha[0] is not None else None
+
+        metadados, bytes_lidos = ler_metadados(caminho)
+        with self.lock:
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO metadados (caminho, tamanho, mtime_ns, dados) VALUES (?, ?, ?, ?)",
+                (caminho, tamanho, mtime_ns,
+                 json.dumps(metadados, ensure_ascii=False) if metadados is not None else None)
+            )
+            self.lidos += 1
+            self.bytes_lidos += bytes_lidos
+            self.gravacoes_pendentes += 1
+            if self.gravacoes_pendentes >= GRAVACOES_POR_COMMIT:
+                self.conexao.commit()
+                self.gravacoes_pendentes = 0
+        return metadados
+
+
+def ler_metadados_arquivos(caminhos, arquivo_cache=ARQUIVO_CACHE_METADADOS, workers=4, assinaturas=None):
+    """
+    Lê os metadados de vários arquivos, com threads (pela rede quase todo o
+    tempo é espera) e com o cache. Um arquivo que não pode ser lido (ou cujo
+    cabeçalho derruba o leitor) fica com None, sem interromper os demais.
+
+    Args:
+        caminhos: Caminhos dos vídeos
+        arquivo_cache: Banco do cache (None = sem cache)
+        workers: Arquivos lidos ao mesmo tempo
+        assinaturas: {caminho: (tamanho, mtime_ns)} do escaneamento, para
+            validar o cache sem um os.stat por arquivo (opcional)
+
+    Returns:
+        dict {caminho: metadados ou None}
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    caminhos = sorted(set(caminhos))
+    print(f"  Lendo metadados de {len(caminhos)} arquivo(s)...")
+    cache = CacheMetadados(arquivo_cache if arquivo_cache else ':memory:')
+    resultados = {}
+    assinaturas = assinaturas or {}
+
+    def ler(caminho):
+        try:
+            return cache.metadados(caminho, *assinaturas.get(caminho, (None, None)))
+        except Exception as e:
+            print(f"  [ERRO] Não foi possível ler {caminho}: {e}")
+            return None
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for indice, (caminho, metadados) in enumerate(zip(caminhos, executor.map(ler, caminhos)), 1):
+                resultados[caminho] = metadados
+                if indice % 10 == 0 or indice == len(caminhos):
+                    print(f"    Metadados: {indice}/{len(caminhos)}", end='\r')
+    finally:
+        cache.fechar()
+    print(f"\n  [OK] {cache.lidos} arquivo(s) lido(s) ({cache.bytes_lidos / 1024:.0f} KB), "
+          f"{cache.reaproveitados} do cache")
+    return resultados
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modo --observar dos listadores: em vez de reescanear a biblioteca de tempos
+em tempos, o processo fica rodando e observa o diretório base, relendo só as
+pastas de título que mudaram e regravando as saídas.
+
+Dois observadores, com a mesma interface (esperar / fechar):
+
+- ObservadorInotify (Linux): inotify pela libc via ctypes, sem dependências.
+  Observa o diretório base (pastas criadas, removidas e renomeadas) e cada
+  pasta de título (arquivos criados, removidos e renomeados). Não enxerga
+  mudanças feitas por outras máquinas num compartilhamento de rede;
+- ObservadorPolling (Windows, compartilhamentos de rede e fallback): a cada
+  intervalo lista o diretório base e compara o mtime de cada pasta de título,
+  que muda sempre que uma entrada é criada, removida ou renomeada nela (a
+  mesma ideia do cache_escaneamento.py).
+
+Rajadas de mudanças (uma temporada sendo copiada, por exemplo) são agrupadas
+por agrupar_mudancas: depois da primeira mudança, espera `espera` segundos
+sem mudanças novas (no máximo ESPERA_MAXIMA) antes de regravar as saídas.
+
+Como os listadores só usam os nomes dos arquivos, criar, remover ou renomear
+é o que importa; gravações dentro de um arquivo (IN_MODIFY) são ignoradas.
+"""
+
+import os
+import sys
+import time
+import struct
+import select
+from datetime import datetime
+
+from catalogo import Catalogo
+from escaneamento import listar_pastas
+
+# Segundos entre duas verificações do ObservadorPolling
+INTERVALO_POLLING = 30
+
+# Segundos sem mudanças novas antes de regravar as saídas
+ESPERA_AGRUPAMENTO = 5
+
+# Limite da espera numa rajada de mudanças que não para
+ESPERA_MAXIMA = 60
+
+MODOS_OBSERVACAO = ('auto', 'inotify', 'polling')
+
+# Tipos de sistema de arquivos (/proc/self/mounts) em que o inotify não vê
+# as mudanças feitas por outras máquinas
+SISTEMAS_DE_ARQUIVOS_REDE = {
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', '9p', 'afs', 'ceph', 'davfs',
+    'fuse.sshfs', 'fuse.rclone', 'fuse.smbnetfs',
+}
+
+# Constantes de <sys/inotify.h>
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+
+MASCARA_PASTA = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+MASCARA_RAIZ = MASCARA_PASTA | IN_DELETE_SELF | IN_MOVE_SELF
+
+_EVENTO = struct.Struct('iIII')
+TAMANHO_LEITURA_EVENTOS = 64 * 1024
+
+
+def _libc_inotify():
+    """libc com as funções de inotify, ou None se não houver (fora do Linux)."""
+    if not sys.platform.startswith('linux'):
+        return None
+    import ctypes
+    import ctypes.util
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+def sistema_de_arquivos(caminho):
+    """Tipo do sistema de arquivos de um caminho (Linux), ou None se não der para saber."""
+    caminho = os.path.realpath(caminho)
+    melhor, tipo = '', None
+    try:
+        with open('/proc/self/mounts', 'r', encoding='utf-8', errors='replace') as f:
+            for linha in f:
+                campos = linha.split()
+                if len(campos) < 3:
+                    continue
+                ponto = campos[1].replace('\\040', ' ')
+                dentro = caminho == ponto or caminho.startswith(ponto.rstrip('/') + '/')
+                if dentro and len(ponto) >= len(melhor):
+                    melhor, tipo = ponto, campos[2]
+    except OSError:
+        return None
+    return tipo
+
+
+def _mtimes_pastas(diretorio_base):
+    """{nome_pasta: mtime_ns} das pastas de título."""
+    mtimes = {}
+    for pasta in listar_pastas(diretorio_base):
+        try:
+            mtimes[pasta.name] = pasta.stat().st_mtime_ns
+        except OSError:
+            continue
+    return mtimes
+
+
+class ObservadorPolling:
+    """Compara o mtime das pastas de título a cada intervalo."""
+
+    def __init__(self, diretorio_base, intervalo=INTERVALO_POLLING):
+        self.diretorio_base = str(diretorio_base)
+        self.intervalo = intervalo
+        self.descricao = f"polling a cada {intervalo}s"
+        self.mtimes = _mtimes_pastas(self.diretorio_base)
+
+    def _comparar(self):
+        try:
+            atuais = _mtimes_pastas(self.diretorio_base)
+        except OSError as e:
+            # Compartilhamento fora do ar: tenta de novo na próxima verificação
+            print(f"  [AVISO] Não foi possível listar {self.diretorio_base}: {e}")
+            return set()
+        anteriores, self.mtimes = self.mtimes, atuais
+        return {
+            nome for nome in anteriores.keys() | atuais.keys()
+            if anteriores.get(nome) != atuais.get(nome)
+        }
+
+    def esperar(self, timeout=None):
+        """
+        Espera mudanças.
+
+        Args:
+            timeout: Segundos até a próxima verificação; None espera (verificando
+                     a cada intervalo) até aparecer alguma mudança
+
+        Returns:
+            Conjunto com os nomes das pastas de título que mudaram (pode ser vazio)
+        """
+        while True:
+            time.sleep(self.intervalo if timeout is None else timeout)
+            mudancas = self._comparar()
+            if mudancas or timeout is not None:
+                return mudancas
+
+    def fechar(self):
+        pass
+
+
+class ObservadorInotify:
+    """Observa o diretório base e cada pasta de título com inotify (Linux)."""
+
+    def __init__(self, diretorio_base):
+        self.libc = _libc_inotify()
+        if self.libc is None:
+            raise OSError("inotify não disponível neste sistema")
+        self.diretorio_base = str(diretorio_base)
+        self.descricao = "inotify"
+        self.fd = self.libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise self._erro(self.diretorio_base)
+        self.pastas = {}
+        self.wds = {}
+        try:
+            self.wd_raiz = self._observar(self.diretorio_base, MASCARA_RAIZ)
+            self._sincronizar()
+        except OSError:
+            self.fechar()
+            raise
+
+    def _erro(self, caminho):
+        import ctypes
+        numero = ctypes.get_errno()
+        return OSError(numero, os.strerror(numero), caminho)
+
+    def _observar(self, caminho, mascara):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(caminho), mascara)
+        if wd < 0:
+            raise self._erro(caminho)
+        return wd
+
+    def _observar_pasta(self, nome):
+        try:
+            wd = self._observar(os.path.join(self.diretorio_base, nome), MASCARA_PASTA)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            return
+        antigo = self.wds.pop(nome, None)
+        if antigo is not None and antigo != wd:
+            self.pastas.pop(antigo, None)
+        self.pastas[wd] = nome
+        self.wds[nome] = wd
+
+    def _esquecer_pasta(self, nome):
+        wd = self.wds.pop(nome, None)
+        if wd is not None:
+            self.pastas.pop(wd, None)
+            # A pasta renomeada para fora continua sendo observada se o watch não for removido
+            self.libc.inotify_rm_watch(self.fd, wd)
+
+    def _sincronizar(self):
+        """Observa as pastas de título atuais. Retorna os nomes conhecidos antes e depois."""
+        nomes = {pasta.name for pasta in listar_pastas(self.diretorio_base)}
+        antigos = set(self.wds)
+        for nome in antigos - nomes:
+            self._esquecer_pasta(nome)
+        for nome in nomes:
+            self._observar_pasta(nome)
+        return antigos | nomes
+
+    def _ler_eventos(self):
+        dados = os.read(self.fd, TAMANHO_LEITURA_EVENTOS)
+        posicao = 0
+        while posicao < len(dados):
+            wd, mascara, _, tamanho = _EVENTO.unpack_from(dados, posicao)
+            posicao += _EVENTO.size
+            nome = os.fsdecode(dados[posicao:posicao + tamanho].rstrip(b'\0'))
+            posicao += tamanho
+            yield wd, mascara, nome
+
+    def esperar(self, timeout=None):
+        """
+        Espera mudanças (mesma interface de ObservadorPolling.esperar).
+
+        Returns:
+            Conjunto com os nomes das pastas de título que mudaram (pode ser vazio)
+        """
+        mudancas = set()
+        prontos, _, _ = select.select([self.fd], [], [], timeout)
+        if not prontos:
+            return mudancas
+        for wd, mascara, nome in self._ler_eventos():
+            if mascara & IN_Q_OVERFLOW:
+                # Eventos perdidos: relê a lista de pastas e trata todas como alteradas
+                mudancas |= self._sincronizar()
+            elif wd == self.wd_raiz:
+                if mascara & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    raise FileNotFoundError(f"Diretório observado removido: {self.diretorio_base}")
+                if not nome:
+                    continue
+                mudancas.add(nome)
+                if mascara & IN_ISDIR and mascara & (IN_CREATE | IN_MOVED_TO):
+                    self._observar_pasta(nome)
+                elif mascara & (IN_DELETE | IN_MOVED_FROM):
+                    self._esquecer_pasta(nome)
+            elif wd in self.pastas:
+                if mascara & IN_IGNORED:
+                    # Watch removido pelo kernel (pasta apagada)
+                    self.wds.pop(self.pastas.pop(wd), None)
+                    continue
+                mudancas.add(self.pastas[wd])
+        return mudancas
+
+    def fechar(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def criar_observador(diretorio_base, modo='auto', intervalo=INTERVALO_POLLING):
+    """
+    Cria o observador de um diretório base.
+
+    Args:
+        diretorio_base: Diretório com as pastas de título
+        modo: 'inotify', 'polling' ou 'auto' (inotify no Linux, exceto em
+              compartilhamentos de rede, e polling nos demais casos)
+        intervalo: Segundos entre verificações do polling
+    """
+    if modo == 'polling':
+        return ObservadorPolling(diretorio_base, intervalo)
+    if modo == 'auto':
+        if _libc_inotify() is None:
+            return ObservadorPolling(diretorio_base, intervalo)
+        tipo = sistema_de_arquivos(diretorio_base)
+        if tipo in SISTEMAS_DE_ARQUIVOS_REDE:
+            print(f"  [INFO] {diretorio_base} está num compartilhamento de rede ({tipo}): usando polling")
+            return ObservadorPolling(diretorio_base, intervalo)
+    try:
+        return ObservadorInotify(diretorio_base)
+    except OSError as e:
+        if modo == 'inotify':
+            raise
+        # Ex.: limite de watches (fs.inotify.max_user_watches) atingido
+        print(f"  [AVISO] inotify indisponível ({e}): usando polling")
+        return ObservadorPolling(diretorio_base, intervalo)
+
+
+def agrupar_mudancas(observador, espera=ESPERA_AGRUPAMENTO, espera_maxima=ESPERA_MAXIMA):
+    """
+    Espera a primeira mudança e junta as seguintes até passar `espera`
+    segundos sem mudança nova (ou `espera_maxima` desde a primeira).
+
+    Returns:
+        Conjunto com os nomes das pastas de título que mudaram
+    """
+    mudancas = set(observador.esperar())
+    inicio = time.monotonic()
+    while True:
+        restante = espera_maxima - (time.monotonic() - inicio)
+        if restante <= 0:
+            return mudancas
+        novas = observador.esperar(min(espera, restante))
+        if not novas:
+            return mudancas
+        mudancas |= novas
+
+
+def catalogo_ordenado(diretorio_base, pastas):
+    """Catalogo em ordem de nome a partir do dict {nome_pasta: [arquivos]}."""
+    catalogo = Catalogo(diretorio_base)
+    for nome in sorted(pastas):
+        catalogo.adicionar_pasta(nome, pastas[nome])
+    return catalogo
+
+
+def observar_lista(diretorio_base, pastas, ler_pasta, exportar, modo='auto',
+                   intervalo=INTERVALO_POLLING, espera=ESPERA_AGRUPAMENTO):
+    """
+    Mantém uma lista atualizada até o usuário interromper (Ctrl+C).
+
+    Args:
+        diretorio_base: Diretório com as pastas de título
+        pastas: dict {nome_pasta: [arquivos]} com a lista atual, atualizado no lugar
+        ler_pasta: Função que relê uma pasta pelo nome e retorna os seus
+                   arquivos em ordem, ou None se ela não existe mais ou não
+                   tem arquivos para a lista
+        exportar: Função chamada a cada lote de mudanças com o Catalogo
+                  ordenado e o dict {nome_pasta: [arquivos] ou None} das
+                  pastas alteradas
+        modo, intervalo: Ver criar_observador
+        espera: Segundos sem mudanças antes de regravar (ver agrupar_mudancas)
+    """
+    observador = criar_observador(diretorio_base, modo, intervalo)
+    print(f"\nObservando {diretorio_base} ({observador.descricao}). Pressione Ctrl+C para sair.")
+    try:
+        while True:
+            alteracoes = {}
+            for nome in sorted(agrupar_mudancas(observador, espera)):
+                arquivos = ler_pasta(nome)
+                if arquivos == pastas.get(nome):
+                    continue
+                alteracoes[nome] = arquivos
+                if arquivos is None:
+                    pastas.pop(nome, None)
+                else:
+                    pastas[nome] = arquivos
+            if not alteracoes:
+                continue
+
+            print(f"\n[{datetime.now().strftime('%H:%M:%S')}] {len(alteracoes)} pasta(s) alterada(s):")
+            for nome, arquivos in alteracoes.items():
+                print(f"  {'[-]' if arquivos is None else '[~]'} {nome}")
+            exportar(catalogo_ordenado(diretorio_base, pastas), alteracoes)
+    except KeyboardInterrupt:
+        print("\n[OK] Observação encerrada.")
+    finally:
+        observador.fechar()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ordenação externa (merge sort em disco) para o modo streaming dos listadores.
+
+Os itens chegam do escaneamento um a um e são acumulados em lotes de tamanho
+fixo; cada lote cheio é ordenado e gravado num arquivo temporário. Na leitura,
+os lotes são intercalados com heapq.merge, de modo que a memória usada
+depende apenas do tamanho do lote, e não do tamanho da biblioteca.
+"""
+
+import os
+import heapq
+import pickle
+import tempfile
+
+# Itens mantidos em memória antes de gravar um lote ordenado em disco
+ITENS_POR_LOTE = 5000
+
+
+class OrdenacaoExterna:
+    """
+    Coleção ordenada construída incrementalmente e lida (quantas vezes for
+    preciso) em ordem, sem manter todos os itens em memória.
+
+    Uso:
+        with OrdenacaoExterna() as ordenados:
+            for item in gerador:
+                ordenados.adicionar(item)
+            for item in ordenados:
+                ...
+    """
+
+    def __init__(self, chave=None, itens_por_lote=ITENS_POR_LOTE, diretorio_temporario=None):
+        self.chave = chave
+        self.itens_por_lote = itens_por_lote
+        self.diretorio_temporario = diretorio_temporario
+        self.lote = []
+        self.arquivos_lotes = []
+        self.total = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+    def __len__(self):
+        return self.total
+
+    def adicionar(self, item):
+        """Adiciona um item; grava o lote em disco quando ele enche."""
+        self.lote.append(item)
+        self.total += 1
+        if len(self.lote) >= self.itens_por_lote:
+            self._gravar_lote()
+
+    def _gravar_lote(self):
+        self.lote.sort(key=self.chave)
+        descritor, caminho = tempfile.mkstemp(prefix='lote_', suffix='.pkl', dir=self.diretorio_temporario)
+        with os.fdopen(descritor, 'wb', buffering=1024 * 1024) as f:
+            for item in self.lote:
+                pickle.dump(item, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arquivos_lotes.append(caminho)
+        self.lote = []
+
+    @staticmethod
+    def _ler_lote(caminho):
+        with open(caminho, 'rb', buffering=1024 * 1024) as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def __iter__(self):
+        """Percorre todos os itens em ordem (intercalando os lotes em disco)."""
+        self.lote.sort(key=self.chave)
+        fontes = [self._ler_lote(caminho) for caminho in self.arquivos_lotes]
+        fontes.append(iter(self.lote))
+        return heapq.merge(*fontes, key=self.chave)
+
+    def fechar(self):
+        """Remove os arquivos temporários dos lotes."""
+        for caminho in self.arquivos_lotes:
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+        self.arquivos_lotes = []
+        self.lote = []
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Geração de PDFs grandes em partes paralelas, usada pelo relatório completo de
+duplicados (find_duplicados.py --pdf-completo).
+
+O conteúdo é dividido em seções (duplicados por nome, por conteúdo, por
+título) e cada seção em partes de BLOCOS_POR_PARTE grupos. Cada parte começa
+numa página nova e é desenhada com pdf_rapido.DocumentoCanvas num processo
+separado, então o tempo de geração cresce com (grupos / processos) e não
+com o total de grupos.
+
+Com o pacote `pypdf` instalado (requirements.txt) e mais de um processo, as
+partes são gravadas em arquivos temporários e concatenadas depois da capa, e
+os marcadores (outline) são adicionados pelo pypdf. Sem o pypdf não há como
+juntar partes desenhadas em outros processos, então tudo roda em série no
+processo principal: a paginação (necessária para o índice) e o desenho de uma
+vez, com os marcadores nativos do reportlab. Despachar só a paginação para
+outros processos custava mais (cópia das partes para os processos) do que
+ganhava. O layout final é o mesmo nos dois casos.
+
+A capa traz o título, a linha de informações e, opcionalmente, um índice com
+a página de início de cada seção e de cada faixa de grupos.
+"""
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from reportlab.lib.units import cm
+
+from pdf_rapido import DocumentoCanvas, ESTILOS
+
+try:
+    from pypdf import PdfWriter
+    from pypdf.generic import Fit
+except ImportError:
+    PdfWriter = None
+
+# Grupos desenhados por cada processo de uma vez
+BLOCOS_POR_PARTE = 500
+
+
+def dividir_em_partes(secoes, blocos_por_parte=BLOCOS_POR_PARTE):
+    """
+    Divide as seções em partes independentes.
+
+    Args:
+        secoes: Lista de (titulo_secao, blocos, mensagem_vazia), onde blocos é
+                uma lista de (cabecalho, [linhas])
+        blocos_por_parte: Máximo de blocos por parte
+
+    Returns:
+        Lista de dicts com as chaves 'secao' (título, só na primeira parte da
+        seção), 'primeiro' (número do primeiro bloco na seção, a partir de 1),
+        'blocos' e 'vazio' (mensagem exibida se a seção não tem blocos)
+    """
+    partes = []
+    for titulo_secao, blocos, mensagem_vazia in secoes:
+        if not blocos:
+            partes.append({'secao': titulo_secao, 'primeiro': 1, 'blocos': [], 'vazio': mensagem_vazia})
+            continue
+        for inicio in range(0, len(blocos), blocos_por_parte):
+            partes.append({
+                'secao': titulo_secao if inicio == 0 else None,
+                'primeiro': inicio + 1,
+                'blocos': blocos[inicio:inicio + blocos_por_parte],
+                'vazio': None,
+            })
+    return partes
+
+
+def _desenhar_parte(documento, parte):
+    if parte['secao']:
+        documento.adicionar(parte['secao'], ESTILOS['cabecalho'], marcador=(parte['secao'], 0))
+    if parte['vazio']:
+        documento.adicionar(parte['vazio'], ESTILOS['item'])
+    for cabecalho, linhas in parte['blocos']:
+        documento.adicionar(cabecalho, ESTILOS['cabecalho'], marcador=(cabecalho, 1))
+        for linha in linhas:
+            documento.adicionar(linha, ESTILOS['item'])
+
+
+def _renderizar_parte(parte, arquivo_saida):
+    """
+    Desenha uma parte num PDF próprio (ou só calcula a paginação, se
+    arquivo_saida for None). Executada nos processos de trabalho.
+
+    Returns:
+        Tupla (paginas, marcadores) com os marcadores de pdf_rapido.DocumentoCanvas
+    """
+    documento = DocumentoCanvas(arquivo_saida)
+    _desenhar_parte(documento, parte)
+    documento.salvar()
+    return documento.paginas, documento.marcadores
+
+
+def _entradas_indice(partes, paginas_iniciais):
+    """Linhas do índice: (texto, nivel, pagina) para cada seção e faixa de grupos."""
+    entradas = []
+    for parte, pagina in zip(partes, paginas_iniciais):
+        if parte['secao']:
+            entradas.append((parte['secao'], 0, pagina))
+        if parte['blocos']:
+            ultimo = parte['primeiro'] + len(parte['blocos']) - 1
+            entradas.append((f"Grupos {parte['primeiro']} a {ultimo}", 1, pagina))
+    return entradas
+
+
+def _desenhar_capa(documento, titulo, info, entradas_indice):
+    documento.adicionar(titulo, ESTILOS['titulo'], centralizado=True, largura_total=True)
+    documento.adicionar(info, ESTILOS['info'], centralizado=True, largura_total=True)
+    documento.adicionar_espaco(0.2 * cm, largura_total=True)
+    if entradas_indice:
+        documento.adicionar("ÍNDICE", ESTILOS['cabecalho'], marcador=("Índice", 0))
+        for texto, nivel, pagina in entradas_indice:
+            estilo = ESTILOS['cabecalho'] if nivel == 0 else ESTILOS['item']
+            documento.adicionar(texto, estilo, texto_direita=str(pagina + 1))
+
+
+def _paginar_capa(titulo, info, partes, paginas_partes, com_indice):
+    """
+    Calcula a página inicial (a partir de 0) de cada parte e as linhas do índice.
+
+    O número de páginas da capa depende do índice, e o índice depende do número
+    de páginas da capa; repete até estabilizar (na prática, uma ou duas vezes).
+    """
+    paginas_capa = 1
+    while True:
+        paginas_iniciais = []
+        pagina = paginas_capa
+        for paginas in paginas_partes:
+            paginas_iniciais.append(pagina)
+            pagina += paginas
+        entradas = _entradas_indice(partes, paginas_iniciais) if com_indice else []
+
+        documento = DocumentoCanvas(None)
+        _desenhar_capa(documento, titulo, info, entradas)
+        if documento.paginas == paginas_capa:
+            return paginas_iniciais, entradas
+        paginas_capa = documento.paginas
+
+
+def _executar_partes(partes, caminhos, processos):
+    if processos == 1 or len(partes) == 1:
+        return [_renderizar_parte(parte, caminho) for parte, caminho in zip(partes, caminhos)]
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return list(executor.map(_renderizar_parte, partes, caminhos))
+
+
+def gerar_pdf_paralelo(arquivo_saida, titulo, info, secoes, processos=None,
+                       blocos_por_parte=BLOCOS_POR_PARTE, com_indice=True):
+    """
+    Gera um PDF completo (sem limite de grupos) renderizando as partes em paralelo.
+
+    Args:
+        arquivo_saida: Caminho do PDF
+        titulo: Título da capa
+        info: Linha de informações da capa
+        secoes: Lista de (titulo_secao, [(cabecalho, [linhas])], mensagem_vazia)
+        processos: Processos de trabalho (padrão: os.cpu_count())
+        blocos_por_parte: Grupos por parte (cada parte começa numa página nova)
+        com_indice: Inclui o índice na capa
+
+    Returns:
+        Quantidade de páginas do PDF
+    """
+    processos = processos or os.cpu_count() or 1
+    partes = dividir_em_partes(secoes, blocos_por_parte)
+
+    if PdfWriter is None or processos == 1:
+        # Sem pypdf (ou sem paralelismo, quando concatenar só custaria tempo):
+        # renderização serial, com a paginação das partes para o índice e o
+        # desenho num único canvas, ambos neste processo
+        resultados = _executar_partes(partes, [None] * len(partes), 1) if com_indice else []
+        paginas_partes = [paginas for paginas, _ in resultados]
+        _, entradas = _paginar_capa(titulo, info, partes, paginas_partes, com_indice)
+
+        documento = DocumentoCanvas(arquivo_saida, marcadores_nativos=True)
+        _desenhar_capa(documento, titulo, info, entradas)
+        for parte in partes:
+            documento.nova_pagina()
+            _desenhar_parte(documento, parte)
+        documento.salvar()
+        return documento.paginas
+
+    with tempfile.TemporaryDirectory(prefix='pdf_partes_') as temporario:
+        caminhos = [os.path.join(temporario, f"parte_{i:05d}.pdf") for i in range(len(partes))]
+        resultados = _executar_partes(partes, caminhos, processos)
+        paginas_partes = [paginas for paginas, _ in resultados]
+        paginas_iniciais, entradas = _paginar_capa(titulo, info, partes, paginas_partes, com_indice)
+
+        caminho_capa = os.path.join(temporario, "capa.pdf")
+        capa = DocumentoCanvas(caminho_capa)
+        _desenhar_capa(capa, titulo, info, entradas)
+        capa.salvar()
+
+        escritor = PdfWriter()
+        escritor.append(caminho_capa, import_outline=False)
+        for caminho in caminhos:
+            escritor.append(caminho, import_outline=False)
+
+        for titulo_marcador, _, pagina, y in capa.marcadores:
+            escritor.add_outline_item(titulo_marcador, pagina, fit=Fit.xyz(top=y))
+        secao_atual = None
+        for (_, marcadores), pagina_inicial in zip(resultados, paginas_iniciais):
+            for titulo_marcador, nivel, pagina, y in marcadores:
+                item = escritor.add_outline_item(
+                    titulo_marcador, pagina_inicial + pagina,
+                    parent=secao_atual if nivel > 0 else None, fit=Fit.xyz(top=y)
+                )
+                if nivel == 0:
+                    secao_atual = item
+
+        with open(arquivo_saida, 'wb') as f:
+            escritor.write(f)
+        return len(escritor.pages)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gerador de PDF rápido para as listas de filmes e séries.
+
+O exportar_pdf original monta um Paragraph do reportlab (platypus) para cada
+arquivo, e o layout de milhares de flowables é a etapa mais lenta da
+execução. Aqui as linhas já formatadas são desenhadas direto no canvas:
+
+- a largura de cada caractere é calculada uma única vez por fonte/tamanho
+  (MetricasFonte) e reaproveitada para quebrar as linhas longas;
+- a paginação é feita à mão, linha a linha, com um objeto de texto por
+  página (em vez de um drawString por linha);
+- opcionalmente o conteúdo é distribuído em várias colunas por página.
+
+Fontes, tamanhos, cores, entrelinhas e espaçamentos são os mesmos dos estilos
+usados no caminho com Paragraph, para que o resultado seja visualmente
+equivalente. O reportlab continua sendo necessário (ImportError se ausente).
+"""
+
+from reportlab.lib.colors import HexColor
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen.canvas import Canvas
+
+MARGEM = 1 * cm
+
+# Espaçamento interno do Frame do SimpleDocTemplate (mantido para equivalência)
+ESPACAMENTO_FRAME = 6
+
+# Distância entre colunas no layout com várias colunas
+ESPACO_ENTRE_COLUNAS = 0.5 * cm
+
+# Mesmos valores dos ParagraphStyle usados em exportar_pdf (a entrelinha vem do
+# estilo pai: 22 para Heading1 e 12 para Normal)
+ESTILOS = {
+    'titulo': {'fonte': 'Helvetica-Bold', 'tamanho': 12, 'entrelinha': 22, 'cor': '#1a1a1a',
+               'antes': 0, 'depois': 8, 'recuo': 0},
+    'info': {'fonte': 'Helvetica', 'tamanho': 7, 'entrelinha': 12, 'cor': '#7f8c8d',
+             'antes': 0, 'depois': 6, 'recuo': 0},
+    'cabecalho': {'fonte': 'Helvetica-Bold', 'tamanho': 9, 'entrelinha': 12, 'cor': '#2c3e50',
+                  'antes': 4, 'depois': 2, 'recuo': 0},
+    'item': {'fonte': 'Helvetica', 'tamanho': 7, 'entrelinha': 12, 'cor': '#34495e',
+             'antes': 0, 'depois': 1, 'recuo': 10},
+}
+
+
+class MetricasFonte:
+    """Larguras de caracteres de uma fonte/tamanho, calculadas uma vez e reaproveitadas."""
+
+    def __init__(self, fonte, tamanho):
+        self.fonte = fonte
+        self.tamanho = tamanho
+        self.larguras = {}
+        self.largura_espaco = self.largura_caractere(' ')
+
+    def largura_caractere(self, caractere):
+        largura = self.larguras.get(caractere)
+        if largura is None:
+            largura = self.larguras[caractere] = stringWidth(caractere, self.fonte, self.tamanho)
+        return largura
+
+    def largura(self, texto):
+        larguras = self.larguras
+        total = 0.0
+        for caractere in texto:
+            largura = larguras.get(caractere)
+            if largura is None:
+                largura = self.largura_caractere(caractere)
+            total += largura
+        return total
+
+    def quebrar(self, texto, largura_maxima):
+        """Quebra o texto em linhas de até largura_maxima (por palavras, como o Paragraph)."""
+        if self.largura(texto) <= largura_maxima:
+            return [texto]
+
+        linhas = []
+        atual, largura_atual = [], 0.0
+        for palavra in texto.split():
+            largura_palavra = self.largura(palavra)
+
+            # Palavra maior que a linha inteira: corta por caracteres
+            while largura_palavra > largura_maxima:
+                if atual:
+                    linhas.append(' '.join(atual))
+                    atual, largura_atual = [], 0.0
+                corte, largura_corte = 0, 0.0
+                for caractere in palavra:
+                    largura_caractere = self.largura_caractere(caractere)
+                    if largura_corte + largura_caractere > largura_maxima and corte:
+                        break
+                    corte += 1
+                    largura_corte += largura_caractere
+                linhas.append(palavra[:corte])
+                palavra = palavra[corte:]
+                largura_palavra = self.largura(palavra)
+
+            if not palavra:
+                continue
+            necessario = largura_palavra + (self.largura_espaco if atual else 0)
+            if atual and largura_atual + necessario > largura_maxima:
+                linhas.append(' '.join(atual))
+                atual, largura_atual = [palavra], largura_palavra
+            else:
+                atual.append(palavra)
+                largura_atual += necessario
+        if atual:
+            linhas.append(' '.join(atual))
+        return linhas
+
+
+class _TextoNulo:
+    """Substitui o objeto de texto do canvas quando só a paginação interessa."""
+
+    def setFont(self, *args):
+        pass
+
+    setFillColor = setTextOrigin = textOut = setFont
+
+
+class DocumentoCanvas:
+    """
+    Página A4 com margens de 1 cm, preenchida linha a linha e coluna a coluna.
+
+    O espaçamento entre blocos segue a regra do platypus: entre dois blocos
+    vale o maior entre o espaço depois do anterior e o espaço antes do
+    próximo, e o espaço antes é ignorado no topo de uma coluna.
+
+    Com arquivo_saida=None nada é desenhado: o documento só calcula a
+    paginação (páginas e marcadores), o que é bem mais barato.
+
+    Cada bloco adicionado com `marcador` registra em self.marcadores uma
+    tupla (titulo, nivel, pagina, y) com a página (a partir de 0) e a altura
+    da sua primeira linha; com marcadores_nativos=True o marcador também vira
+    um item da árvore de marcadores (outline) do próprio PDF.
+    """
+
+    def __init__(self, arquivo_saida, colunas=1, tamanho_pagina=A4, marcadores_nativos=False):
+        # invariant: sem data de criação nem ID aleatório, o mesmo conteúdo gera o mesmo PDF
+        self.canvas = Canvas(arquivo_saida, pagesize=tamanho_pagina, invariant=1) if arquivo_saida else None
+        self.marcadores_nativos = marcadores_nativos and self.canvas is not None
+        self.marcadores = []
+        self.largura_pagina, self.altura_pagina = tamanho_pagina
+        self.colunas = max(1, colunas)
+
+        self.x_inicial = MARGEM + ESPACAMENTO_FRAME
+        self.largura_util = self.largura_pagina - 2 * (MARGEM + ESPACAMENTO_FRAME)
+        self.largura_coluna = (
+            (self.largura_util - ESPACO_ENTRE_COLUNAS * (self.colunas - 1)) / self.colunas
+        )
+        self.topo = self.altura_pagina - MARGEM - ESPACAMENTO_FRAME
+        self.base = MARGEM + ESPACAMENTO_FRAME
+
+        self.metricas = {}
+        self.paginas = 1
+        self._iniciar_pagina()
+
+    def _iniciar_pagina(self):
+        self.texto = self.canvas.beginText() if self.canvas is not None else _TextoNulo()
+        self.fonte_atual = None
+        self.cor_atual = None
+        self.coluna = 0
+        self.topo_colunas = self.topo
+        self.y = self.topo
+        self.no_topo = True
+        self.espaco_pendente = 0
+
+    def _finalizar_pagina(self):
+        if self.canvas is not None:
+            self.canvas.drawText(self.texto)
+
+    def nova_pagina(self):
+        """Encerra a página atual (se tiver conteúdo) e começa outra."""
+        if self.no_topo and self.coluna == 0:
+            return
+        self._finalizar_pagina()
+        if self.canvas is not None:
+            self.canvas.showPage()
+        self.paginas += 1
+        self._iniciar_pagina()
+
+    def _proxima_coluna(self):
+        if self.coluna + 1 < self.colunas:
+            self.coluna += 1
+        else:
+            self.nova_pagina()
+            return
+        self.y = self.topo_colunas
+        self.no_topo = True
+        self.espaco_pendente = 0
+
+    def _obter_metricas(self, estilo):
+        chave = (estilo['fonte'], estilo['tamanho'])
+        metricas = self.metricas.get(chave)
+        if metricas is None:
+            metricas = self.metricas[chave] = MetricasFonte(*chave)
+        return metricas
+
+    def _aplicar_estilo(self, estilo):
+        fonte = (estilo['fonte'], estilo['tamanho'])
+        if fonte != self.fonte_atual:
+            self.texto.setFont(estilo['fonte'], estilo['tamanho'])
+            self.fonte_atual = fonte
+        if estilo['cor'] != self.cor_atual:
+            self.texto.setFillColor(HexColor(estilo['cor']))
+            self.cor_atual = estilo['cor']
+
+    def _marcar(self, titulo, nivel):
+        pagina = self.paginas - 1
+        self.marcadores.append((titulo, nivel, pagina, self.y))
+        if self.marcadores_nativos:
+            chave = f"m{len(self.marcadores)}"
+            self.canvas.bookmarkPage(chave, fit='XYZ', top=self.y)
+            self.canvas.addOutlineEntry(titulo, chave, level=nivel)
+
+    def adicionar(self, texto, estilo, centralizado=False, largura_total=False, marcador=None, texto_direita=None):
+        """
+        Adiciona um bloco de texto (quebrado em linhas se necessário).
+
+        Args:
+            texto: Texto já formatado
+            estilo: Um dos dicionários de ESTILOS
+            centralizado: Centraliza cada linha na largura disponível
+            largura_total: Ocupa a largura da página toda, ignorando as
+                           colunas (usado no título, antes da primeira linha)
+            marcador: Tupla (titulo, nivel) registrada na primeira linha do bloco
+            texto_direita: Texto alinhado à direita na primeira linha (ex.: número
+                           de página de um índice)
+        """
+        metricas = self._obter_metricas(estilo)
+        recuo = estilo['recuo']
+        largura = self.largura_util if largura_total else self.largura_coluna
+        largura_direita = metricas.largura(texto_direita) + metricas.largura_espaco * 2 if texto_direita else 0
+        linhas = metricas.quebrar(texto, largura - recuo - largura_direita)
+
+        if not self.no_topo:
+            self.y -= max(estilo['antes'], self.espaco_pendente)
+
+        x_coluna = self.x_inicial + self.coluna * (self.largura_coluna + ESPACO_ENTRE_COLUNAS)
+        if largura_total:
+            x_coluna = self.x_inicial
+        entrelinha = estilo['entrelinha']
+        tamanho = estilo['tamanho']
+        self._aplicar_estilo(estilo)
+
+        for linha in linhas:
+            if self.y - entrelinha < self.base - 1e-6 and not self.no_topo:
+                self._proxima_coluna()
+                self._aplicar_estilo(estilo)
+                x_coluna = self.x_inicial + self.coluna * (self.largura_coluna + ESPACO_ENTRE_COLUNAS)
+            x = x_coluna + recuo
+            if centralizado:
+                x += (largura - recuo - metricas.largura(linha)) / 2
+            if marcador is not None:
+                self._marcar(*marcador)
+                marcador = None
+            self.texto.setTextOrigin(x, self.y - tamanho)
+            self.texto.textOut(linha)
+            if texto_direita:
+                self.texto.setTextOrigin(x_coluna + largura - metricas.largura(texto_direita), self.y - tamanho)
+                self.texto.textOut(texto_direita)
+                texto_direita = None
+            self.y -= entrelinha
+            self.no_topo = False
+
+        self.espaco_pendente = estilo['depois']
+        if largura_total:
+            # Blocos de largura total (título/cabeçalho) empurram o topo das colunas
+            self.topo_colunas = self.y
+
+    def adicionar_espaco(self, altura, largura_total=False):
+        """Espaço vertical fixo (equivalente ao Spacer)."""
+        if not self.no_topo:
+            self.y -= self.espaco_pendente + altura
+            self.espaco_pendente = 0
+            if largura_total:
+                self.topo_colunas = self.y
+
+    def salvar(self):
+        self._finalizar_pagina()
+        if self.canvas is not None:
+            self.canvas.save()
+
+
+def gerar_pdf_lista(arquivo_saida, titulo, info, entradas, colunas=1):
+    """
+    Gera o PDF de uma lista (filmes ou séries) desenhando direto no canvas.
+
+    Args:
+        arquivo_saida: Caminho do PDF
+        titulo: Título da primeira página
+        info: Linha de informações abaixo do título
+        entradas: Iterável de (cabecalho, [linhas]); cada linha vira um item
+        colunas: Quantidade de colunas por página
+
+    Returns:
+        Quantidade de páginas geradas
+    """
+    documento = DocumentoCanvas(arquivo_saida, colunas=colunas)
+    documento.adicionar(titulo, ESTILOS['titulo'], centralizado=True, largura_total=True)
+    documento.adicionar(info, ESTILOS['info'], centralizado=True, largura_total=True)
+    documento.adicionar_espaco(0.2 * cm, largura_total=True)
+
+    for cabecalho, linhas in entradas:
+        documento.adicionar(cabecalho, ESTILOS['cabecalho'])
+        for linha in linhas:
+            documento.adicionar(linha, ESTILOS['item'])
+
+    documento.salvar()
+    return documento.paginas
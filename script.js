@@ -1,7 +1,145 @@
 /**
- * Funções para carregar e processar arquivos TXT de filmes e séries
+ * Funções para carregar e exibir as listas de filmes e séries
+ *
+ * Os dados vêm de lista_filmes.json / lista_series.json, gerados pelos
+ * scripts Python (exportar_json), e são lidos com um único JSON.parse.
+ * O parser do TXT fica apenas como alternativa enquanto o JSON ainda não
+ * foi publicado.
  */
 
+/**
+ * Ler a cópia pré-comprimida .json.gz (gerada com --compressao-json gzip)
+ * em vez do .json, nos navegadores com DecompressionStream
+ */
+const USAR_JSON_GZ = false;
+
+/**
+ * Itens criados por lote na renderização incremental. O primeiro lote é
+ * inserido de imediato (o suficiente para encher a tela) e os demais em
+ * segundo plano, então o tempo até o primeiro conteúdo não cresce com a
+ * biblioteca.
+ */
+const ITENS_POR_LOTE = 50;
+
+// Renderização em andamento de cada container (uma nova cancela a anterior)
+const renderizacoes = new WeakMap();
+
+const agendarLote = typeof requestIdleCallback === 'function'
+    ? callback => requestIdleCallback(callback, { timeout: 200 })
+    : callback => requestAnimationFrame(callback);
+
+/**
+ * Insere os itens no container em lotes de ITENS_POR_LOTE, cada lote montado
+ * num DocumentFragment. onConcluido é chamado depois do último lote.
+ */
+function renderChunked(container, itens, createElement, onConcluido) {
+    const renderizacao = {};
+    renderizacoes.set(container, renderizacao);
+    container.innerHTML = '';
+    appendChunked(container, renderizacao, itens, 0, itens.length, createElement, onConcluido);
+}
+
+/**
+ * Acrescenta itens[inicio..fim) ao container em lotes, numerados a partir de
+ * inicio + 1, dentro da renderização `renderizacao`. Para assim que outra
+ * renderização do container começar (uma busca, por exemplo).
+ */
+function appendChunked(container, renderizacao, itens, inicio, fim, createElement, onConcluido) {
+    let proximo = inicio;
+    function renderizarLote() {
+        if (renderizacoes.get(container) !== renderizacao) {
+            return;
+        }
+        const fragment = document.createDocumentFragment();
+        const fimLote = Math.min(proximo + ITENS_POR_LOTE, fim);
+        for (; proximo < fimLote; proximo++) {
+            fragment.appendChild(createElement(itens[proximo], proximo + 1));
+        }
+        container.appendChild(fragment);
+
+        if (proximo < fim) {
+            agendarLote(renderizarLote);
+        } else if (onConcluido) {
+            onConcluido();
+        }
+    }
+    renderizarLote();
+}
+
+/**
+ * Carrega um JSON gerado pelos scripts (nomeBase sem extensão).
+ * Retorna null se o arquivo não existir.
+ */
+async function fetchJson(nomeBase) {
+    if (USAR_JSON_GZ && typeof DecompressionStream !== 'undefined') {
+        try {
+            const response = await fetch(`${nomeBase}.json.gz`);
+            if (response.ok) {
+                const stream = response.body.pipeThrough(new DecompressionStream('gzip'));
+                return await new Response(stream).json();
+            }
+        } catch (err) {
+            // Servidor que já entrega o .gz descomprimido, por exemplo: usar o .json
+            console.warn(`Falha ao ler ${nomeBase}.json.gz, usando ${nomeBase}.json:`, err);
+        }
+    }
+
+    const response = await fetch(`${nomeBase}.json`);
+    if (!response.ok) {
+        return null;
+    }
+    return response.json();
+}
+
+/**
+ * Carrega um TXT gerado pelos scripts (formato antigo, usado se não houver JSON)
+ */
+async function fetchTxt(arquivo) {
+    const response = await fetch(arquivo);
+    if (!response.ok) {
+        throw new Error('Arquivo não encontrado');
+    }
+    return response.text();
+}
+
+/**
+ * Baixa em paralelo as partes da lista de filmes (uma por letra inicial, na
+ * ordem da lista) e exibe cada uma no container assim que ela chega, na ordem
+ * das letras: a primeira parte aparece sem esperar pelas outras.
+ * aoExibirPrimeira é chamada quando a primeira parte entra na página.
+ * Devolve a lista completa.
+ */
+async function loadPartesFilmes(partes, container, aoExibirPrimeira) {
+    const pendentes = partes.map(({ parte }) => fetchJson(parte));
+    // Uma parte que falha antes da sua vez é tratada quando chegar nela
+    pendentes.forEach(pendente => pendente.catch(() => {}));
+
+    const renderizacao = {};
+    renderizacoes.set(container, renderizacao);
+    container.innerHTML = '';
+
+    const filmes = [];
+    let exibicao = Promise.resolve();
+    for (let i = 0; i < partes.length; i++) {
+        const bloco = await pendentes[i];
+        if (!bloco) {
+            throw new Error(`Parte não encontrada: ${partes[i].parte}`);
+        }
+        const inicio = filmes.length;
+        for (const [nome, arquivos] of bloco) {
+            filmes.push({ nome, arquivos });
+        }
+        const fim = filmes.length;
+        // Os lotes desta parte entram depois dos da anterior
+        exibicao = exibicao.then(() => new Promise(resolve =>
+            appendChunked(container, renderizacao, filmes, inicio, fim, createFilmeElement, resolve)));
+        if (i === 0) {
+            aoExibirPrimeira();
+        }
+    }
+    return filmes;
+}
+
 /**
  * Carrega e exibe a lista de filmes
  */
@@ -13,14 +151,12 @@ async function loadFilmes() {
     const totalFilmes = document.getElementById('total-filmes');
 
     try {
-        // Carregar arquivo TXT
-        const response = await fetch('lista_filmes.txt');
-        if (!response.ok) {
-            throw new Error('Arquivo não encontrado');
-        }
-
-        const text = await response.text();
-        const filmes = parseFilmesTxt(text);
+        // Carregar o JSON (ou o TXT, se o JSON ainda não foi publicado)
+        const dados = await fetchJson('lista_filmes');
+        // Do JSON, cada parte é exibida (em lotes) assim que chega
+        const filmes = dados
+            ? await loadPartesFilmes(dados.partes, container, () => { loading.style.display = 'none'; })
+            : parseFilmesTxt(await fetchTxt('lista_filmes.txt'));
 
         // Esconder loading
         loading.style.display = 'none';
@@ -31,12 +167,13 @@ async function loadFilmes() {
             return;
         }
 
-        // Exibir filmes
-        container.innerHTML = '';
-        filmes.forEach((filme, index) => {
-            const filmeDiv = createFilmeElement(filme, index + 1);
-            container.appendChild(filmeDiv);
-        });
+        // Exibir filmes do TXT (em lotes, sem travar a página)
+        if (!dados) {
+            renderChunked(container, filmes, createFilmeElement);
+        }
+        // A busca só é liberada com a lista completa
+        setupSearch('busca_filmes', filmes, filme => [filme.nome, ...filme.arquivos],
+            container, createFilmeElement);
 
         // Atualizar estatísticas
         totalFilmes.textContent = filmes.length;
@@ -61,14 +198,13 @@ async function loadSeries() {
     const totalEpisodios = document.getElementById('total-episodios');
 
     try {
-        // Carregar arquivo TXT
-        const response = await fetch('lista_series.txt');
-        if (!response.ok) {
-            throw new Error('Arquivo não encontrado');
-        }
-
-        const text = await response.text();
-        const series = parseSeriesTxt(text);
+        // Carregar o JSON (ou o TXT, se o JSON ainda não foi publicado)
+        const dados = await fetchJson('lista_series');
+        // Do JSON vêm só nome e total de cada série; os episódios são
+        // baixados quando a série é aberta (showEpisodios)
+        const series = dados
+            ? dados.series.map(([nome, total, parte]) => ({ nome, total, parte, episodios: null }))
+            : parseSeriesTxt(await fetchTxt('lista_series.txt'));
 
         // Esconder loading
         loading.style.display = 'none';
@@ -79,14 +215,13 @@ async function loadSeries() {
             return;
         }
 
-        // Exibir séries
-        container.innerHTML = '';
-        let totalEps = 0;
-        series.forEach((serie, index) => {
-            const serieDiv = createSerieElement(serie, index + 1);
-            container.appendChild(serieDiv);
-            totalEps += serie.episodios.length;
-        });
+        // Exibir séries (em lotes, sem travar a página)
+        renderChunked(container, series, createSerieElement);
+        setupSearch('busca_series', series, serie => [serie.nome, ...(serie.episodios || [])],
+            container, createSerieElement, serie => serie.episodios !== null);
+        const totalEps = dados
+            ? dados.total_episodios
+            : series.reduce((total, serie) => total + serie.episodios.length, 0);
 
         // Atualizar estatísticas
         totalSeries.textContent = series.length;
@@ -101,7 +236,215 @@ async function loadSeries() {
 }
 
 /**
- * Parse do arquivo TXT de filmes
+ * Busca enquanto o usuário digita, com o índice gerado pelos scripts
+ * (indice_busca.py: busca_filmes.json / busca_series.json).
+ *
+ * O texto é normalizado como em titulos.normalizar_texto (sem acentos,
+ * minúsculas, pontuação trocada por espaços). Termos com menos de 3
+ * caracteres são buscados como início de palavra, numa busca binária na
+ * lista ordenada de palavras; os demais como substring, pela interseção dos
+ * documentos dos seus trigramas, confirmada no texto só dos candidatos.
+ * Todos os termos precisam aparecer na entrada. Sem o índice publicado, a
+ * mesma busca é feita percorrendo as entradas.
+ */
+const TAMANHO_TRIGRAMA = 3;
+
+// Espera depois da última tecla antes de buscar
+const ATRASO_BUSCA_MS = 80;
+
+function normalizarTexto(texto) {
+    return texto.normalize('NFKD')
+        .replace(/\p{M}/gu, '')
+        .toLowerCase()
+        .replace(/ß/g, 'ss')
+        .replace(/[^0-9a-z]+/g, ' ')
+        .trim();
+}
+
+/**
+ * Carrega o índice de busca; null se ele não foi publicado
+ */
+async function carregarIndiceBusca(nomeBase) {
+    try {
+        const dados = await fetchJson(nomeBase);
+        return dados ? { dados, documentos: new Map() } : null;
+    } catch (err) {
+        console.warn(`Índice de busca ${nomeBase} indisponível:`, err);
+        return null;
+    }
+}
+
+/**
+ * Documentos de uma lista do índice (gravada como diferenças), decodificada uma vez
+ */
+function documentosDoIndice(indice, chave, diferencas) {
+    let documentos = indice.documentos.get(chave);
+    if (!documentos) {
+        let atual = 0;
+        documentos = diferencas.map(diferenca => (atual += diferenca));
+        indice.documentos.set(chave, documentos);
+    }
+    return documentos;
+}
+
+function intersectar(a, b) {
+    const resultado = [];
+    let i = 0;
+    let j = 0;
+    while (i < a.length && j < b.length) {
+        if (a[i] === b[j]) {
+            resultado.push(a[i]);
+            i++;
+            j++;
+        } else if (a[i] < b[j]) {
+            i++;
+        } else {
+            j++;
+        }
+    }
+    return resultado;
+}
+
+/**
+ * Documentos com alguma palavra começando pelo termo
+ */
+function documentosPrefixo(indice, termo) {
+    const palavras = indice.dados.palavras;
+    let inicio = 0;
+    let fim = palavras.length;
+    while (inicio < fim) {
+        const meio = (inicio + fim) >> 1;
+        if (palavras[meio] < termo) {
+            inicio = meio + 1;
+        } else {
+            fim = meio;
+        }
+    }
+
+    const encontrados = new Set();
+    for (let i = inicio; i < palavras.length && palavras[i].startsWith(termo); i++) {
+        const diferencas = indice.dados.documentos_palavras[i];
+        documentosDoIndice(indice, `p:${palavras[i]}`, diferencas).forEach(doc => encontrados.add(doc));
+    }
+    return [...encontrados].sort((a, b) => a - b);
+}
+
+/**
+ * Candidatos a conter o termo: documentos com todos os trigramas dele
+ */
+function documentosTrigramas(indice, termo) {
+    const listas = [];
+    for (let i = 0; i + TAMANHO_TRIGRAMA <= termo.length; i++) {
+        const trigrama = termo.slice(i, i + TAMANHO_TRIGRAMA);
+        const diferencas = indice.dados.trigramas[trigrama];
+        if (!diferencas) {
+            return [];
+        }
+        listas.push(documentosDoIndice(indice, `t:${trigrama}`, diferencas));
+    }
+    listas.sort((a, b) => a.length - b.length);
+    return listas.reduce(intersectar);
+}
+
+function contemTermo(texto, termo) {
+    return termo.length < TAMANHO_TRIGRAMA ? ` ${texto}`.includes(` ${termo}`) : texto.includes(termo);
+}
+
+/**
+ * Posições (em ordem) das entradas que contêm todos os termos da consulta,
+ * ou null se a consulta está vazia
+ */
+function searchIndex(indice, consulta, textoNormalizado, total, itemCompleto = () => true) {
+    const termos = [...new Set(normalizarTexto(consulta).split(' ').filter(Boolean))];
+    if (termos.length === 0) {
+        return null;
+    }
+    // Termos mais longos primeiro: costumam ter menos documentos
+    termos.sort((a, b) => b.length - a.length);
+
+    let resultado = null;
+    for (const termo of termos) {
+        let documentos;
+        if (!indice) {
+            documentos = resultado || Array.from({ length: total }, (_, doc) => doc);
+        } else {
+            documentos = termo.length < TAMANHO_TRIGRAMA
+                ? documentosPrefixo(indice, termo)
+                : documentosTrigramas(indice, termo);
+            if (resultado) {
+                documentos = intersectar(resultado, documentos);
+            }
+        }
+        if (!indice || termo.length >= TAMANHO_TRIGRAMA) {
+            // Itens ainda sem os arquivos carregados (episódios das séries)
+            // ficam com o resultado do índice, que foi montado com tudo
+            documentos = documentos.filter(doc =>
+                contemTermo(textoNormalizado(doc), termo) || (indice !== null && !itemCompleto(doc)));
+        }
+        resultado = documentos;
+        if (resultado.length === 0) {
+            break;
+        }
+    }
+    return resultado;
+}
+
+/**
+ * Liga o campo de busca (#busca) à lista já exibida. textosDoItem devolve os
+ * textos pesquisáveis de um item (nome e arquivos). O índice só é baixado na
+ * primeira busca.
+ */
+function setupSearch(nomeIndice, itens, textosDoItem, container, createElement, itemCompleto = () => true) {
+    const input = document.getElementById('busca');
+    const info = document.getElementById('busca-info');
+    if (!input) {
+        return;
+    }
+
+    let indice = null;
+    const textos = [];
+    const textoNormalizado = doc => {
+        if (textos[doc] !== undefined) {
+            return textos[doc];
+        }
+        const texto = normalizarTexto(textosDoItem(itens[doc]).join(' '));
+        // Só guarda o texto do item completo: o de uma série fechada muda
+        // quando os episódios chegam
+        if (itemCompleto(itens[doc])) {
+            textos[doc] = texto;
+        }
+        return texto;
+    };
+
+    let espera;
+    let ultimaConsulta = 0;
+    input.addEventListener('input', () => {
+        clearTimeout(espera);
+        espera = setTimeout(async () => {
+            const consulta = ++ultimaConsulta;
+            if (!indice) {
+                indice = carregarIndiceBusca(nomeIndice);
+            }
+            const resultado = searchIndex(await indice, input.value, textoNormalizado, itens.length,
+                doc => itemCompleto(itens[doc]));
+            if (consulta !== ultimaConsulta) {
+                return;
+            }
+
+            if (resultado === null) {
+                info.textContent = '';
+                renderChunked(container, itens, createElement);
+            } else {
+                info.textContent = `${resultado.length} resultado(s)`;
+                renderChunked(container, resultado, doc => createElement(itens[doc], doc + 1));
+            }
+        }, ATRASO_BUSCA_MS);
+    });
+    input.disabled = false;
+}
+
+/**
+ * Parse do arquivo TXT de filmes (formato antigo, sem JSON)
  */
 function parseFilmesTxt(text) {
     const filmes = [];
@@ -154,7 +497,7 @@ function parseFilmesTxt(text) {
 }
 
 /**
- * Parse do arquivo TXT de séries
+ * Parse do arquivo TXT de séries (formato antigo, sem JSON)
  */
 function parseSeriesTxt(text) {
     const series = [];
@@ -241,9 +584,12 @@ function createFilmeElement(filme, numero) {
  * Cria elemento HTML para uma série
  */
 function createSerieElement(serie, numero) {
-    const div = document.createElement('div');
-    div.className = 'serie-item';
+    // <details>: os episódios só são montados (e, vindo do JSON, baixados)
+    // quando a série é aberta
+    const details = document.createElement('details');
+    details.className = 'serie-item';
 
+    const summary = document.createElement('summary');
     const h3 = document.createElement('h3');
     const numeroSpan = document.createElement('span');
     numeroSpan.className = 'numero';
@@ -256,22 +602,52 @@ function createSerieElement(serie, numero) {
 
     const countSpan = document.createElement('span');
     countSpan.className = 'episodios-count';
-    countSpan.textContent = `${serie.episodios.length} episódio(s)`;
+    const total = serie.episodios ? serie.episodios.length : serie.total;
+    countSpan.textContent = `${total} episódio(s)`;
     h3.appendChild(countSpan);
 
-    div.appendChild(h3);
+    summary.appendChild(h3);
+    details.appendChild(summary);
 
-    if (serie.episodios.length > 0) {
-        const ul = document.createElement('ul');
-        ul.className = 'arquivos-lista';
-        serie.episodios.forEach(episodio => {
-            const li = document.createElement('li');
-            li.textContent = episodio;
-            ul.appendChild(li);
-        });
-        div.appendChild(ul);
+    details.addEventListener('toggle', () => {
+        if (details.open && !details.dataset.carregado) {
+            details.dataset.carregado = 'true';
+            showEpisodios(details, serie);
+        }
+    });
+
+    return details;
+}
+
+async function showEpisodios(details, serie) {
+    const ul = document.createElement('ul');
+    ul.className = 'arquivos-lista';
+    details.appendChild(ul);
+
+    if (!serie.episodios) {
+        const carregando = document.createElement('li');
+        carregando.textContent = 'Carregando episódios...';
+        ul.appendChild(carregando);
+        try {
+            const episodios = await fetchJson(serie.parte);
+            if (!episodios) {
+                throw new Error(`Parte não encontrada: ${serie.parte}`);
+            }
+            serie.episodios = episodios;
+        } catch (err) {
+            console.error('Erro ao carregar episódios:', err);
+            carregando.textContent = 'Erro ao carregar os episódios.';
+            delete details.dataset.carregado;
+            details.addEventListener('toggle', () => ul.remove(), { once: true });
+            return;
+        }
+        ul.removeChild(carregando);
     }
 
-    return div;
+    serie.episodios.forEach(episodio => {
+        const li = document.createElement('li');
+        li.textContent = episodio;
+        ul.appendChild(li);
+    });
 }
 
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Normalização de títulos e busca de títulos semelhantes, usada por
+find_duplicados.py para encontrar o mesmo filme guardado em pastas com
+convenções de nome diferentes, como `Finis Hominis (1971)` e
+`1971 - Finis Hominis`.
+
+extrair_titulo_ano entende os formatos de pasta usados na biblioteca
+(`Título (1971)`, `1971 - Título`, `Título - 1971`, `Título 1971`) e nomes de
+arquivo no estilo de release
+(`This.Night.Ill.Possess.Your.Corpse.1967.1080p.BluRay.x264...`).
+
+agrupar_titulos_semelhantes compara os títulos sem fazer todas as n² comparações:
+os títulos são separados em blocos por ano e, dentro de cada bloco, um índice
+invertido de trigramas seleciona apenas os candidatos que compartilham
+trigramas com o título consultado. O custo fica próximo de linear no número
+de títulos.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+
+# Similaridade mínima (coeficiente de Dice sobre trigramas) para considerar dois títulos iguais
+LIMIAR_SIMILARIDADE = 0.8
+
+# Trigramas presentes em mais títulos do que isto (no mesmo bloco) não são
+# usados para gerar candidatos: são comuns demais para diferenciar títulos
+MAX_TITULOS_POR_TRIGRAMA = 200
+
+_RE_EXTENSAO = re.compile(r'\.[A-Za-z0-9-]{2,6}$')
+_RE_ANO_ENTRE_PARENTESES = re.compile(r'[\(\[]\s*((?:19|20)\d{2})\s*[\)\]]')
+_RE_ANO_INICIAL = re.compile(r'^\s*((?:19|20)\d{2})\s*-\s*')
+_RE_ANO = re.compile(r'(?<![0-9])((?:19|20)\d{2})(?![0-9])')
+_RE_COLCHETES = re.compile(r'\[[^\]]*\]')
+_RE_SEPARADORES_RELEASE = re.compile(r'[._]+')
+_RE_NAO_ALFANUMERICO = re.compile(r'[^0-9a-z]+')
+_RE_RESOLUCAO = re.compile(r'\d{3,4}[pi]$')
+
+# Numeração de continuações: "Chapter I" e "Chapter II" não são o mesmo filme
+_NUMERAIS = {'i', 'ii', 'iii', 'iv', 'v', 'vi', 'vii', 'viii', 'ix', 'x'}
+
+# Marcadores que indicam o início da parte técnica de um nome de release
+_MARCADORES_RELEASE = {
+    '480p', '576p', '720p', '1080p', '1080i', '2160p', '4k', 'uhd', 'hd', 'sd',
+    'bluray', 'bdrip', 'brrip', 'dvdrip', 'dvd', 'webrip', 'web', 'webdl', 'hdtv', 'hdrip',
+    'x264', 'x265', 'h264', 'h265', 'hevc', 'xvid', 'divx', 'aac', 'ac3', 'dts', 'dd5',
+    'remastered', 'uncensored', 'extended', 'unrated', 'dual', 'dublado', 'legendado',
+}
+
+
+def normalizar_texto(texto):
+    """Remove acentos, converte para minúsculas e troca pontuação por espaços."""
+    decomposto = unicodedata.normalize('NFKD', texto)
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(_RE_NAO_ALFANUMERICO.sub(' ', sem_acentos.casefold()).split())
+
+
+def _cortar_marcadores(texto):
+    """Corta o texto no primeiro marcador técnico de release (1080p, BluRay, x264...)."""
+    palavras = texto.split()
+    for i, palavra in enumerate(palavras):
+        marcador = normalizar_texto(palavra).replace(' ', '')
+        if i > 0 and (marcador in _MARCADORES_RELEASE or _RE_RESOLUCAO.search(marcador)):
+            return ' '.join(palavras[:i])
+    return texto
+
+
+def extrair_titulo_ano(nome, arquivo=False):
+    """
+    Extrai o título normalizado e o ano de um nome de pasta ou de arquivo.
+
+    Args:
+        nome: Nome da pasta ou do arquivo
+        arquivo: Se True, remove a extensão antes de analisar
+
+    Returns:
+        Tupla (titulo_normalizado, ano), onde ano é int ou None
+    """
+    texto = nome
+    if arquivo:
+        texto = _RE_EXTENSAO.sub('', texto)
+    texto = _RE_COLCHETES.sub(' ', texto)
+
+    # "Título (1971)"
+    encontrado = _RE_ANO_ENTRE_PARENTESES.search(texto)
+    if encontrado and encontrado.start() > 0:
+        return normalizar_texto(_cortar_marcadores(texto[:encontrado.start()])), int(encontrado.group(1))
+
+    # "1971 - Título"
+    encontrado = _RE_ANO_INICIAL.match(texto)
+    if encontrado:
+        return normalizar_texto(_cortar_marcadores(texto[encontrado.end():])), int(encontrado.group(1))
+
+    # Estilo release ("Titulo.Do.Filme.1967.1080p...") e "Título - 1971" / "Título 1971":
+    # o ano é o primeiro que aparece depois de algum texto
+    texto = _RE_SEPARADORES_RELEASE.sub(' ', texto)
+    for encontrado in _RE_ANO.finditer(texto):
+        if normalizar_texto(texto[:encontrado.start()]):
+            return normalizar_texto(_cortar_marcadores(texto[:encontrado.start()])), int(encontrado.group(1))
+
+    return normalizar_texto(_cortar_marcadores(texto)), None
+
+
+def trigramas(titulo):
+    """Conjunto de trigramas do título normalizado (com espaços nas pontas)."""
+    texto = f"  {titulo} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def numeracao(titulo):
+    """Números e numerais romanos do título (identificam continuações)."""
+    return {palavra for palavra in titulo.split() if palavra.isdigit() or palavra in _NUMERAIS}
+
+
+def similaridade(trigramas_a, trigramas_b):
+    """Coeficiente de Dice entre dois conjuntos de trigramas (0 a 1)."""
+    if not trigramas_a or not trigramas_b:
+        return 0.0
+    return 2 * len(trigramas_a & trigramas_b) / (len(trigramas_a) + len(trigramas_b))
+
+
+def agrupar_titulos_semelhantes(itens, limiar=LIMIAR_SIMILARIDADE):
+    """
+    Agrupa itens cujos títulos são iguais ou semelhantes e têm o mesmo ano.
+
+    Títulos semelhantes com numeração diferente (`Chapter I` / `Chapter II`)
+    são considerados filmes diferentes.
+
+    Args:
+        itens: Lista de (titulo_normalizado, ano)
+        limiar: Similaridade mínima entre dois títulos do mesmo ano
+
+    Returns:
+        Lista de grupos (listas de índices em `itens`, em ordem crescente) com
+        2 ou mais itens, ordenada pelo primeiro índice de cada grupo
+    """
+    pais = list(range(len(itens)))
+
+    def raiz(i):
+        while pais[i] != i:
+            pais[i] = pais[pais[i]]
+            i = pais[i]
+        return i
+
+    def unir(i, j):
+        raiz_i, raiz_j = raiz(i), raiz(j)
+        if raiz_i != raiz_j:
+            pais[max(raiz_i, raiz_j)] = min(raiz_i, raiz_j)
+
+    # Bloqueio por ano: títulos de anos diferentes nunca são comparados
+    blocos = defaultdict(list)
+    for i, (titulo, ano) in enumerate(itens):
+        if titulo:
+            blocos[ano].append(i)
+
+    conjuntos = {}
+    for indices in blocos.values():
+        indice_invertido = defaultdict(list)
+        for i in indices:
+            conjuntos[i] = trigramas(itens[i][0])
+            for trigrama in conjuntos[i]:
+                indice_invertido[trigrama].append(i)
+
+        for i in indices:
+            # Candidatos: apenas os títulos que compartilham algum trigrama pelo índice
+            candidatos = set()
+            for trigrama in conjuntos[i]:
+                postagens = indice_invertido[trigrama]
+                if len(postagens) <= MAX_TITULOS_POR_TRIGRAMA:
+                    candidatos.update(j for j in postagens if j > i)
+
+            tamanho_i = len(conjuntos[i])
+            for j in candidatos:
+                # Limite superior do Dice: descarta sem calcular a interseção completa
+                if 2 * min(tamanho_i, len(conjuntos[j])) / (tamanho_i + len(conjuntos[j])) < limiar:
+                    continue
+                if itens[i][0] == itens[j][0]:
+                    unir(i, j)
+                elif (similaridade(conjuntos[i], conjuntos[j]) >= limiar
+                        and numeracao(itens[i][0]) == numeracao(itens[j][0])):
+                    unir(i, j)
+
+    grupos = defaultdict(list)
+    for i in range(len(itens)):
+        grupos[raiz(i)].append(i)
+    return sorted((grupo for grupo in grupos.values() if len(grupo) > 1), key=lambda grupo: grupo[0])
@@ -2,6 +2,9 @@
 REM Script para atualizar o site no GitHub com os arquivos gerados
 REM Execute este script após rodar list_filmes.py e list_series.py
 
+REM Dados do site (listas em JSON, indices de busca e copias comprimidas opcionais)
+set ARQUIVOS_JSON=lista_filmes.json lista_series.json busca_filmes.json busca_series.json lista_filmes.json.gz lista_series.json.gz busca_filmes.json.gz busca_series.json.gz lista_filmes.json.br lista_series.json.br busca_filmes.json.br busca_series.json.br
+
 echo ========================================
 echo Atualizando site no GitHub
 echo ========================================
@@ -27,13 +30,15 @@ if exist "lista_filmes.txt" echo   [OK] lista_filmes.txt
 if exist "lista_series.txt" echo   [OK] lista_series.txt
 if exist "lista_filmes.pdf" echo   [OK] lista_filmes.pdf
 if exist "lista_series.pdf" echo   [OK] lista_series.pdf
+for %%f in (%ARQUIVOS_JSON%) do if exist "%%f" echo   [OK] %%f
+if exist "dados" echo   [OK] dados\
 echo.
 
-REM Adicionar apenas os arquivos gerados
+REM Adicionar apenas os arquivos gerados que mudaram: os scripts nao regravam
+REM saidas iguais, entao um arquivo sem mudancas nem e lido pelo git add
+REM (-A registra as remocoes em dados\)
 echo Adicionando arquivos ao git...
-git add lista_filmes.txt lista_series.txt
-if exist "lista_filmes.pdf" git add lista_filmes.pdf
-if exist "lista_series.pdf" git add lista_series.pdf
+for %%f in (lista_filmes.txt lista_series.txt lista_filmes.pdf lista_series.pdf %ARQUIVOS_JSON% geracao.json dados) do if exist "%%f" call :adicionar "%%f"
 
 REM Verificar se há mudanças
 git diff --cached --quiet
@@ -59,4 +64,15 @@ echo Atualizacao concluida!
 echo ========================================
 echo O site sera atualizado automaticamente no GitHub Pages.
 pause
+exit /b 0
+
+:adicionar
+git status --porcelain -- %1 | findstr . >nul
+if %errorlevel% == 0 (
+    git add -A -- %1
+    echo   [+] %~1
+) else (
+    echo   [=] %~1 ^(sem mudancas^)
+)
+exit /b 0
 
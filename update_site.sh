@@ -2,6 +2,22 @@
 # Script para atualizar o site no GitHub com os arquivos gerados
 # Execute este script após rodar list_filmes.py e list_series.py
 
+# Dados do site (listas em JSON, índices de busca e cópias comprimidas opcionais)
+ARQUIVOS_JSON="lista_filmes.json lista_series.json busca_filmes.json busca_series.json
+lista_filmes.json.gz lista_series.json.gz busca_filmes.json.gz busca_series.json.gz
+lista_filmes.json.br lista_series.json.br busca_filmes.json.br busca_series.json.br"
+
+# Adiciona ao git só o que mudou: os scripts não regravam saídas iguais, então
+# um arquivo sem mudanças nem é lido pelo git add (-A registra as remoções em dados/)
+adicionar() {
+    if [ -n "$(git status --porcelain -- "$1")" ]; then
+        git add -A -- "$1"
+        echo "  [+] $1"
+    else
+        echo "  [=] $1 (sem mudanças)"
+    fi
+}
+
 echo "========================================"
 echo "Atualizando site no GitHub"
 echo "========================================"
@@ -25,13 +41,17 @@ echo "Arquivos encontrados:"
 [ -f "lista_series.txt" ] && echo "  [OK] lista_series.txt"
 [ -f "lista_filmes.pdf" ] && echo "  [OK] lista_filmes.pdf"
 [ -f "lista_series.pdf" ] && echo "  [OK] lista_series.pdf"
+for f in $ARQUIVOS_JSON; do
+    [ -f "$f" ] && echo "  [OK] $f"
+done
+[ -d "dados" ] && echo "  [OK] dados/ ($(ls dados | wc -l) arquivo(s))"
 echo ""
 
-# Adicionar apenas os arquivos gerados
+# Adicionar apenas os arquivos gerados que mudaram
 echo "Adicionando arquivos ao git..."
-git add lista_filmes.txt lista_series.txt
-[ -f "lista_filmes.pdf" ] && git add lista_filmes.pdf
-[ -f "lista_series.pdf" ] && git add lista_series.pdf
+for f in lista_filmes.txt lista_series.txt lista_filmes.pdf lista_series.pdf $ARQUIVOS_JSON geracao.json dados; do
+    [ -e "$f" ] && adicionar "$f"
+done
 
 # Verificar se há mudanças
 if git diff --cached --quiet; then